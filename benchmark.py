@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+#
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Callable
+
+# no display needed, must be set before Qt is loaded
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QApplication
+
+from render import paintScene
+from utilities.gcodereader import GCodeReader
+from utilities.toolpath import Toolpath
+from widgets.toolpathscene import ToolpathScene
+
+# inserting this file into sys.path to allow absolute imports in project
+sys.path.insert(0, os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..')))
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+# relative weights of the commands in the generated programs
+DEFAULT_MIX = {'G0': 1, 'G1': 6, 'G2': 2, 'G3': 2}
+_app = None
+
+
+def generateGCode(filename: str, lines: int, mix: Dict[str, float]=None,
+                  relative: float=0.2, radiusArcs: float=0.3,
+                  seed: int=0) -> None:
+    """
+    Writes a random program of about `lines` lines staying on the material.
+    `relative` is the share of lines in G91 blocks, `radiusArcs` the share
+    of arcs given with R instead of I and J.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    width = ToolpathScene.MaterialRect.width()
+    height = ToolpathScene.MaterialRect.height()
+    x, y = 10.0, 10.0
+    isRelative = False
+    steps = ['G28 ;home', 'G21', 'G90', 'F1000', 'G0 X%f Y%f' % (x, y)]
+    with open(filename, 'w') as f:
+        written = len(steps)
+        while written + len(steps) < lines:
+            if rng.random() < 0.01:
+                # blocks of about 50 lines, switching modes takes two lines
+                isRelative = rng.random() < relative / max(1 - relative,
+                                                           0.01)
+                steps.append('G91' if isRelative else 'G90')
+            kind = rng.choices(kinds, weights)[0]
+            if kind in ('G0', 'G1'):
+                newX = min(max(x + rng.uniform(-10, 10), 0), width)
+                newY = min(max(y + rng.uniform(-10, 10), 0), height)
+                words = ''
+            else:
+                radius = rng.uniform(0.5, 10)
+                if rng.random() < radiusArcs:
+                    chord = rng.uniform(0.1, 2 * radius)
+                    angle = rng.uniform(0, 2 * math.pi)
+                    newX = x + chord * math.cos(angle)
+                    newY = y + chord * math.sin(angle)
+                    words = ' R%f' % radius
+                else:
+                    start = rng.uniform(0, 2 * math.pi)
+                    end = start + rng.uniform(-math.pi, math.pi)
+                    cx = x - radius * math.cos(start)
+                    cy = y - radius * math.sin(start)
+                    newX = cx + radius * math.cos(end)
+                    newY = cy + radius * math.sin(end)
+                    words = ' I%f J%f' % (cx - x, cy - y)
+                # pull arcs leaving the material back towards the middle
+                if not 0 <= newX <= width or not 0 <= newY <= height:
+                    kind = 'G1'
+                    newX = (x + width / 2) / 2
+                    newY = (y + height / 2) / 2
+                    words = ''
+            if isRelative:
+                steps.append('%s X%f Y%f%s' % (kind, newX - x, newY - y,
+                                               words))
+            else:
+                steps.append('%s X%f Y%f%s' % (kind, newX, newY, words))
+            x, y = newX, newY
+            if len(steps) >= 65536:
+                f.write('\n'.join(steps) + '\n')
+                written += len(steps)
+                steps = []
+        f.write('\n'.join(steps) + '\n')
+
+
+def _bestOf(repeat: int, function: Callable[[], None]) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _paint(scene: ToolpathScene, image: QImage) -> None:
+    image.fill(Qt.lightGray)
+    painter = QPainter(image)
+    paintScene(scene, painter, image.width(), image.height(), False)
+    painter.end()
+
+
+def _peakRss() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB everywhere else
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def benchmarkFile(filename: str, repeat: int=1, textParser: bool=True,
+                  perItem: bool=True) -> Dict[str, object]:
+    """
+    Times the pipeline stages on one file: reading in this process and with
+    the worker pool, arc geometry, building and painting the scene per
+    render mode and restyling with the precision setter. Run it in a fresh
+    process for a meaningful peak RSS.
+    """
+    global _app
+    if _app is None:
+        _app = QApplication([sys.argv[0]])
+    stages = {}
+    toolpath = None
+
+    def read():
+        nonlocal toolpath
+        toolpath = GCodeReader(filename, workers=1).read()
+
+    stages['read'] = _bestOf(repeat, read)
+    stages['readParallel'] = _bestOf(repeat, lambda: GCodeReader(
+        filename).read())
+    if textParser:
+        stages['readText'] = _bestOf(repeat, lambda: Toolpath.fromFile(
+            filename))
+    stages['arcGeometry'] = _bestOf(repeat, lambda: Toolpath(
+        toolpath.columns()).arcGeometry())
+    toolpath.arcGeometry()
+
+    image = QImage(1160, 800, QImage.Format_ARGB32)
+    modes = [('Batched', ToolpathScene.Batched)]
+    if perItem:
+        modes.append(('PerItem', ToolpathScene.PerItem))
+    for name, mode in modes:
+        scene = None
+
+        def build():
+            nonlocal scene
+            scene = ToolpathScene()
+            scene.renderMode = mode
+            scene.expectSegments(len(toolpath))
+            scene.addToolpath(toolpath)
+
+        stages['scene' + name] = _bestOf(repeat, build)
+        stages['paint' + name] = _bestOf(repeat, lambda: _paint(scene, image))
+
+        def restyle():
+            scene.precision = scene.precision + 0.1
+            _paint(scene, image)
+
+        stages['precision' + name] = _bestOf(repeat, restyle)
+        scene.clear()
+        del scene
+    return {'segments': len(toolpath), 'stages': stages,
+            'peakRss': _peakRss()}
+
+
+def _revision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(args: argparse.Namespace) -> int:
+    mix = dict(DEFAULT_MIX)
+    for word in args.mix or []:
+        kind, _, weight = word.partition('=')
+        mix[kind.upper()] = float(weight)
+    results = {'revision': _revision(),
+               'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'mix': mix, 'relative': args.relative,
+               'radiusArcs': args.radius_arcs, 'results': {}}
+    # spawned workers so every size starts with an untouched heap
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        for lines in args.sizes:
+            filename = os.path.join(directory, '%d.gcode' % lines)
+            print('%d lines: generating' % lines, file=sys.stderr)
+            generateGCode(filename, lines, mix, args.relative,
+                          args.radius_arcs, args.seed)
+            print('%d lines: measuring' % lines, file=sys.stderr)
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(
+                    benchmarkFile, filename, args.repeat,
+                    lines <= args.max_text_lines,
+                    lines <= args.max_item_lines).result()
+            result['bytes'] = os.path.getsize(filename)
+            os.remove(filename)
+            results['results'][str(lines)] = result
+            for stage, seconds in result['stages'].items():
+                print('    %-18s %10.3f s' % (stage, seconds),
+                      file=sys.stderr)
+            print('    %-18s %10.1f MiB' % (
+                'peakRss', result['peakRss'] / 2 ** 20), file=sys.stderr)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print('Results written to %s' % args.output, file=sys.stderr)
+    return 0
+
+
+# run in a fresh interpreter per start, prints the seconds per stage
+_STARTUP_SCRIPT = '''
+import json, resource, sys, time
+started = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+qt = time.perf_counter()
+from widgets.mainwindow import MainWindow
+imported = time.perf_counter()
+window = MainWindow()
+created = time.perf_counter()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({'qt': qt - started, 'imports': imported - qt,
+                  'window': created - imported, 'show': shown - created,
+                  'peakRss': resource.getrusage(
+                      resource.RUSAGE_SELF).ru_maxrss}))
+'''
+
+
+def startup(args: argparse.Namespace) -> int:
+    """
+    Times launching the GUI until its window is shown, as the best of
+    several fresh processes.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    stages = {}  # type: Dict[str, float]
+    peakRss = 0
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        output = subprocess.check_output(
+            [sys.executable, '-c', _STARTUP_SCRIPT], cwd=directory,
+            stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - started
+        result = json.loads(output.decode().splitlines()[-1])
+        peakRss = max(peakRss, result.pop('peakRss') * (
+            1 if sys.platform == 'darwin' else 1024))
+        result['process'] = elapsed
+        for stage, seconds in result.items():
+            stages[stage] = min(stages.get(stage, math.inf), seconds)
+    for stage, seconds in stages.items():
+        print('    %-18s %10.3f s' % (stage, seconds), file=sys.stderr)
+    results = {'revision': _revision(),
+               'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'python': platform.python_version(),
+               'platform': platform.platform(),
+               'results': {'startup': {'stages': stages,
+                                       'peakRss': peakRss}}}
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print('Results written to %s' % args.output, file=sys.stderr)
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """
+    Prints new / old time per stage and size, returns 1 if any stage got
+    slower than the tolerance allows.
+    """
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print('%s -> %s' % (old.get('revision') or args.old,
+                        new.get('revision') or args.new))
+    regressions = 0
+    for lines, result in new['results'].items():
+        oldResult = old['results'].get(lines)
+        if oldResult is None:
+            continue
+        print('%s lines' % lines if lines.isdigit() else lines)
+        rows = [(stage, oldResult['stages'].get(stage), seconds)
+                for stage, seconds in result['stages'].items()]
+        rows.append(('peakRss', oldResult['peakRss'], result['peakRss']))
+        for stage, before, after in rows:
+            if before is None:
+                continue
+            ratio = after / before if before else math.inf
+            slower = ratio > 1 + args.tolerance
+            regressions += slower
+            print('    %-18s %12.4g %12.4g %7.2fx%s' % (
+                stage, before, after, ratio, '  REGRESSION' if slower
+                else ''))
+    return 1 if regressions else 0
+
+
+def main(argv: List[str]=None) -> int:
+    if not argv:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(argv[0]),
+        description='Measures the G Code pipeline on synthetic programs.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    runParser = commands.add_parser('run', help='run the benchmarks')
+    runParser.add_argument('-s', '--sizes', type=int, nargs='+',
+                           default=list(DEFAULT_SIZES), metavar='LINES',
+                           help='program sizes, up to 10 million lines')
+    runParser.add_argument('-m', '--mix', nargs='+', metavar='GN=WEIGHT',
+                           help='relative weight of G0 to G3, default %s' %
+                                ' '.join('%s=%g' % item
+                                         for item in DEFAULT_MIX.items()))
+    runParser.add_argument('--relative', type=float, default=0.2,
+                           help='share of lines in G91 blocks')
+    runParser.add_argument('--radius-arcs', type=float, default=0.3,
+                           help='share of arcs given with R')
+    runParser.add_argument('--seed', type=int, default=0)
+    runParser.add_argument('-r', '--repeat', type=int, default=1,
+                           help='best of this many runs per stage')
+    runParser.add_argument('--max-text-lines', type=int, default=1000000,
+                           help='skip the text parser above this size')
+    runParser.add_argument('--max-item-lines', type=int, default=1000000,
+                           help='skip the per item scene above this size')
+    runParser.add_argument('-o', '--output', default='benchmark.json')
+    runParser.set_defaults(function=run)
+
+    startupParser = commands.add_parser(
+        'startup', help='time launching the GUI')
+    startupParser.add_argument('-r', '--repeat', type=int, default=5,
+                               help='best of this many launches')
+    startupParser.add_argument('-o', '--output', default='startup.json')
+    startupParser.set_defaults(function=startup)
+
+    compareParser = commands.add_parser(
+        'compare', help='compare two result files')
+    compareParser.add_argument('old')
+    compareParser.add_argument('new')
+    compareParser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                               help='allowed slowdown before a stage counts '
+                                    'as regression, default 0.1 = 10%%')
+    compareParser.set_defaults(function=compare)
+
+    args = parser.parse_args(argv[1:])
+    return args.function(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+#
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import json
+import os
+import sys
+
+from utilities.gcodereader import GCodeReader
+from utilities.toolpathstatistics import DEFAULT_RAPID_RATE,\
+    toolpathStatistics, formatStatistics
+
+# inserting this file into sys.path to allow absolute imports in project
+sys.path.insert(0, os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..')))
+
+
+def main(argv=None):
+    if not argv:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(argv[0]),
+        description='Prints path lengths and the estimated machining time '
+                    'of G Code files.')
+    parser.add_argument('files', nargs='+', metavar='FILE')
+    parser.add_argument('-r', '--rapid-rate', type=float,
+                        default=DEFAULT_RAPID_RATE,
+                        help='G0 speed in mm/min, default %g' %
+                             DEFAULT_RAPID_RATE)
+    parser.add_argument('--json', action='store_true',
+                        help='print one JSON object per file')
+    args = parser.parse_args(argv[1:])
+
+    for filename in args.files:
+        statistics = toolpathStatistics(GCodeReader(filename).read(),
+                                        args.rapid_rate)
+        if args.json:
+            print(json.dumps(dict(statistics._asdict(), file=filename)))
+        else:
+            print(filename)
+            print(formatStatistics(statistics))
+            print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+#
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import argparse
+import os
+import sys
+import time
+
+from utilities.toolpathoptimizer import optimizeProgram
+from utilities.toolpathstatistics import DEFAULT_RAPID_RATE,\
+    toolpathStatistics, formatDuration
+
+# inserting this file into sys.path to allow absolute imports in project
+sys.path.insert(0, os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..')))
+
+
+def main(argv=None):
+    if not argv:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(argv[0]),
+        description='Reorders the cuts of a G Code file for less rapid '
+                    'travel and reports the rapids before and after.')
+    parser.add_argument('file', metavar='FILE')
+    parser.add_argument('-o', '--output',
+                        help='where to write the result, default '
+                             'FILE.optimized.gcode')
+    parser.add_argument('--no-reverse', action='store_true',
+                        help='cut every contour in its original direction')
+    parser.add_argument('--reorder-last', action='store_true',
+                        help='move the last contour too, by default it is '
+                             'the frame and stays last')
+    parser.add_argument('-r', '--rapid-rate', type=float,
+                        default=DEFAULT_RAPID_RATE,
+                        help='G0 speed in mm/min, default %g' %
+                             DEFAULT_RAPID_RATE)
+    args = parser.parse_args(argv[1:])
+    output = args.output or '%s.optimized.gcode' % \
+        os.path.splitext(args.file)[0]
+
+    started = time.perf_counter()
+    with open(args.file) as f:
+        try:
+            program, before, after = optimizeProgram(
+                f, not args.no_reverse, not args.reorder_last)
+        except ValueError as e:
+            print('%s: cannot reorder, %s' % (args.file, e), file=sys.stderr)
+            return 1
+    elapsed = time.perf_counter() - started
+    with open(output, 'w') as gcode:
+        gcode.write('\n'.join(program) + '\n')
+
+    old = toolpathStatistics(before, args.rapid_rate)
+    new = toolpathStatistics(after, args.rapid_rate)
+    saved = old.rapidLength - new.rapidLength
+    print('%s -> %s in %.2f s' % (args.file, output, elapsed))
+    print('Rapid length:   %.1f mm -> %.1f mm (%.1f%% less)' % (
+        old.rapidLength, new.rapidLength,
+        saved / old.rapidLength * 100 if old.rapidLength else 0))
+    print('Rapid time:     %s -> %s' % (formatDuration(old.rapidTime),
+                                        formatDuration(new.rapidTime)))
+    print('Estimated time: %s -> %s' % (formatDuration(old.totalTime),
+                                        formatDuration(new.totalTime)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
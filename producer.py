@@ -24,69 +24,190 @@
 # SOFTWARE.
 
 
+import argparse
 import os
 import math
+import sys
+from array import array
+from typing import Iterator, List, Tuple
+
+import numpy as np
 
 from utilities import getResourcesPath
+from utilities.gcodeparser import parseGCode
+from utilities.toolpath import Toolpath, ToolpathBuilder, G0, G1, G2, G3
 from utilities.types import number
 
 
 gcodeDir = os.path.join(getResourcesPath(), 'gcode')
-steps = []
-
-
-def move(x: number, y: number) -> None:
-    steps.append('G0 X%f Y%f' % (x, y))
-
-
-def cut(x: number, y: number) -> None:
-    steps.append('G1 X%f Y%f' % (x, y))
-
-
-def comment(cmt: str) -> None:
-    steps.append('; ' + cmt)
-
-
-def arc(x: number, y: number, i: number, j: number,
-        clockwise: bool=True) -> None:
-    if clockwise:
-        cmd = 'G2'
-    else:
-        cmd = 'G3'
-    steps.append(cmd + ' X%f Y%f I%f J%f' % (x, y, i, j))
-
-
-def arc_radius(x: number, y: number, r: number, clockwise=True) -> None:
-    if clockwise:
-        cmd = 'G2'
-    else:
-        cmd = 'G3'
-    steps.append(cmd + ' X%f Y%f R%f' % (x, y, r))
-
-
-def relative() -> None:
-    steps.append('G91')
 
-
-def absolute() -> None:
-    steps.append('G90')
-
-
-def header() -> None:
-    steps.append(';header')
-    steps.append('G28 ;home')
-    steps.append('G21 ;units in mm')
-    steps.append('G90 ;abs coords')
-    steps.append('M649 L1 P5 S100')
-    steps.append('F1000 ;20mm/s')
-    steps.append('M649 S100')
-
-
-def footer() -> None:
-    steps.append('; footer')
-    steps.append('G90 ;abs coords')
-    steps.append('G0 X0 Y230 ;pre-home')
-    steps.append('M2')
+# opcodes of the commands in a program and the arguments each one takes
+MOVE = 0
+CUT = 1
+ARC_CW = 2
+ARC_CCW = 3
+ARC_RADIUS_CW = 4
+ARC_RADIUS_CCW = 5
+RELATIVE = 6
+ABSOLUTE = 7
+TEXT = 8
+TEMPLATES = ('G0 X%f Y%f', 'G1 X%f Y%f',
+             'G2 X%f Y%f I%f J%f', 'G3 X%f Y%f I%f J%f',
+             'G2 X%f Y%f R%f', 'G3 X%f Y%f R%f', 'G91', 'G90', None)
+ARGUMENTS = (2, 2, 4, 4, 3, 3, 0, 0, 0)
+# toolpath opcode of the commands drawing a segment, indexed by opcode
+SEGMENTS = np.array((G0, G1, G2, G3, G2, G3), dtype=np.int8)
+
+
+class Program(object):
+    """
+    A G Code program kept as opcodes and numbers in typed arrays, lines of
+    text (comments and anything without an opcode) are kept aside. Only
+    write formats it, a chunk of lines with a single % at a time.
+    """
+    def __init__(self) -> None:
+        self.ops = array('b')
+        self.args = array('d')
+        self.texts = []  # type: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def move(self, x: number, y: number) -> None:
+        self.ops.append(MOVE)
+        self.args.extend((x, y))
+
+    def cut(self, x: number, y: number) -> None:
+        self.ops.append(CUT)
+        self.args.extend((x, y))
+
+    def comment(self, cmt: str) -> None:
+        self.text('; ' + cmt)
+
+    def text(self, line: str) -> None:
+        self.ops.append(TEXT)
+        self.texts.append(line)
+
+    def arc(self, x: number, y: number, i: number, j: number,
+            clockwise: bool=True) -> None:
+        self.ops.append(ARC_CW if clockwise else ARC_CCW)
+        self.args.extend((x, y, i, j))
+
+    def arc_radius(self, x: number, y: number, r: number,
+                   clockwise: bool=True) -> None:
+        self.ops.append(ARC_RADIUS_CW if clockwise else ARC_RADIUS_CCW)
+        self.args.extend((x, y, r))
+
+    def relative(self) -> None:
+        self.ops.append(RELATIVE)
+
+    def absolute(self) -> None:
+        self.ops.append(ABSOLUTE)
+
+    def header(self) -> None:
+        for line in (';header', 'G28 ;home', 'G21 ;units in mm',
+                     'G90 ;abs coords', 'M649 L1 P5 S100', 'F1000 ;20mm/s',
+                     'M649 S100'):
+            self.text(line)
+
+    def footer(self) -> None:
+        for line in ('; footer', 'G90 ;abs coords', 'G0 X0 Y230 ;pre-home',
+                     'M2'):
+            self.text(line)
+
+    def lines(self, chunk_size: int=65536) -> Iterator[str]:
+        """
+        Yields the program formatted in chunks of chunk_size lines joined
+        by newlines, without a newline at the end of a chunk.
+        """
+        ops = self.ops
+        args = self.args
+        texts = iter(self.texts)
+        position = 0
+        for start in range(0, len(ops), chunk_size):
+            chunk = ops[start:start + chunk_size]
+            # text goes into the format itself, so escape it
+            template = '\n'.join([
+                next(texts).replace('%', '%%') if op == TEXT
+                else TEMPLATES[op] for op in chunk])
+            count = sum([ARGUMENTS[op] for op in chunk])
+            yield template % tuple(args[position:position + count])
+            position += count
+
+    def write(self, filename: str, chunk_size: int=65536) -> None:
+        with open(filename, 'w', buffering=1 << 20) as gcode:
+            separator = ''
+            for chunk in self.lines(chunk_size):
+                gcode.write(separator)
+                gcode.write(chunk)
+                separator = '\n'
+
+    def toolpath(self) -> Toolpath:
+        """
+        Resolves the program into a toolpath as if its file was parsed,
+        but without rounding to the six decimals written. Runs of commands
+        between text and mode changes are resolved as a whole.
+        """
+        ops = np.frombuffer(self.ops, dtype=np.int8)
+        args = np.frombuffer(self.args, dtype=np.float64)
+        if not len(ops):
+            return Toolpath.empty()
+        offsets = np.zeros(len(ops) + 1, dtype=np.int64)
+        np.cumsum(np.array(ARGUMENTS, dtype=np.int64)[ops],
+                  out=offsets[1:])
+        # runs end before every command that changes modal state
+        breaks = np.flatnonzero(ops >= RELATIVE)
+        builder = ToolpathBuilder()
+        texts = iter(self.texts)
+        parts = []
+        start = 0
+        for stop in np.append(breaks, len(ops)):
+            if stop > start:
+                parts.append(self._resolve(builder, ops, args, offsets,
+                                           start, stop))
+            if stop == len(ops):
+                break
+            op = ops[stop]
+            if op == RELATIVE:
+                builder.relative = True
+            elif op == ABSOLUTE:
+                builder.relative = False
+            else:
+                for command in parseGCode([next(texts)]):
+                    builder.addCommand(command._replace(line=stop + 1))
+                parts.append(builder.build())
+            start = stop + 1
+        return Toolpath.concatenate([part for part in parts if len(part)])
+
+    @staticmethod
+    def _resolve(builder: ToolpathBuilder, ops: np.ndarray,
+                 args: np.ndarray, offsets: np.ndarray, start: int,
+                 stop: int) -> Toolpath:
+        run = ops[start:stop]
+        first = offsets[start:stop]
+        x = args[first]
+        y = args[first + 1]
+        if builder.relative:
+            x = builder.x + np.cumsum(x)
+            y = builder.y + np.cumsum(y)
+        x0 = np.concatenate(([builder.x], x[:-1]))
+        y0 = np.concatenate(([builder.y], y[:-1]))
+        count = len(run)
+        i = np.zeros(count)
+        j = np.zeros(count)
+        r = np.full(count, np.nan)
+        ij = (run == ARC_CW) | (run == ARC_CCW)
+        i[ij] = args[first[ij] + 2]
+        j[ij] = args[first[ij] + 3]
+        radius = (run == ARC_RADIUS_CW) | (run == ARC_RADIUS_CCW)
+        r[radius] = args[first[radius] + 2]
+        builder.x = float(x[-1])
+        builder.y = float(y[-1])
+        return Toolpath({
+            'op': SEGMENTS[run],
+            'x0': x0, 'y0': y0, 'x1': x, 'y1': y, 'i': i, 'j': j, 'r': r,
+            'f': np.full(count, builder.feed),
+            'line': np.arange(start + 1, stop + 1, dtype=np.int64)})
 
 
 class Raspi(object):
@@ -127,262 +248,295 @@ class MotorHole(object):
     screw_radius = 1
 
 
-def squares() -> None:
-    header()
-    comment('Start bottom left square')
-    move(0, 5)
-    arc(5, 0, 5, 0, clockwise=False)
-    cut(15, 0)
-    arc(20, 5, 0, 5, clockwise=False)
-    cut(20, 15)
-    arc(15, 20, -5, 0, clockwise=False)
-    cut(5, 20)
-    arc(0, 15, 0, -5, clockwise=False)
-    cut(0, 5)
-    comment('Start top right square')
-    move(20, 25)
-    cut(20, 35)
-    arc(25, 40, 5, 0)
-    cut(35, 40)
-    arc(40, 35, 0, -5)
-    cut(40, 25)
-    arc(35, 20, -5, 0)
-    cut(25, 20)
-    arc(20, 25, 0, 5)
-    comment('Start inner circle for bottom left')
-    move(5, 10)
-    arc(10, 5, 5, 0, clockwise=False)
-    arc(15, 10, 0, 5, clockwise=False)
-    arc(10, 15, -5, 0, clockwise=False)
-    arc(5, 10, 0, -5, clockwise=False)
-    comment('Start inner circle for top right')
-    move(25, 30)
-    arc(30, 35, 5, 0, clockwise=False)
-    arc(35, 30, 0, -5, clockwise=False)
-    arc(30, 25, -5, 0, clockwise=False)
-    arc(25, 30, 0, 5, clockwise=False)
-    footer()
-    with open(os.path.join(gcodeDir, 'squares.gcode'), 'w') as gcode:
-        gcode.write('\n'.join(steps))
-    del steps[:]
-
-
-def front() -> None:
+def squares() -> Program:
+    program = Program()
+    program.header()
+    program.comment('Start bottom left square')
+    program.move(0, 5)
+    program.arc(5, 0, 5, 0, clockwise=False)
+    program.cut(15, 0)
+    program.arc(20, 5, 0, 5, clockwise=False)
+    program.cut(20, 15)
+    program.arc(15, 20, -5, 0, clockwise=False)
+    program.cut(5, 20)
+    program.arc(0, 15, 0, -5, clockwise=False)
+    program.cut(0, 5)
+    program.comment('Start top right square')
+    program.move(20, 25)
+    program.cut(20, 35)
+    program.arc(25, 40, 5, 0)
+    program.cut(35, 40)
+    program.arc(40, 35, 0, -5)
+    program.cut(40, 25)
+    program.arc(35, 20, -5, 0)
+    program.cut(25, 20)
+    program.arc(20, 25, 0, 5)
+    program.comment('Start inner circle for bottom left')
+    program.move(5, 10)
+    program.arc(10, 5, 5, 0, clockwise=False)
+    program.arc(15, 10, 0, 5, clockwise=False)
+    program.arc(10, 15, -5, 0, clockwise=False)
+    program.arc(5, 10, 0, -5, clockwise=False)
+    program.comment('Start inner circle for top right')
+    program.move(25, 30)
+    program.arc(30, 35, 5, 0, clockwise=False)
+    program.arc(35, 30, 0, -5, clockwise=False)
+    program.arc(30, 25, -5, 0, clockwise=False)
+    program.arc(25, 30, 0, 5, clockwise=False)
+    program.footer()
+    return program
+
+
+def front() -> Program:
+    program = Program()
+
     def cut_bottom_hole() -> None:
         """
         Starts in bottom left corner, moves right & up
         """
-        cut(FrontBottomHole.width, 0)
-        cut(0, -FrontBottomHole.height)
-        cut(-FrontBottomHole.width, 0)
+        program.cut(FrontBottomHole.width, 0)
+        program.cut(0, -FrontBottomHole.height)
+        program.cut(-FrontBottomHole.width, 0)
 
     def cut_middle_hole() -> None:
         """
         Starts in bottom left corner, moves right & up
         """
-        cut(0, FrontMiddleHole.height)
-        cut(FrontMiddleHole.width, 0)
-        cut(0, -FrontMiddleHole.height)
-        cut(-FrontMiddleHole.width, 0)
+        program.cut(0, FrontMiddleHole.height)
+        program.cut(FrontMiddleHole.width, 0)
+        program.cut(0, -FrontMiddleHole.height)
+        program.cut(-FrontMiddleHole.width, 0)
 
     def cut_motor_hole() -> None:
         """
         Starts in bottom left corner, moves right & up
         """
-        move(-(MotorHole.edge_small_border / 2 - MotorHole.screw_radius / 2),
-             MotorHole.edge_long_border / 2)
-        arc(0, 0, -MotorHole.screw_radius, 0)
-        move(MotorHole.edge_small_border / 2 - MotorHole.screw_radius / 2,
-             -(MotorHole.edge_long_border / 2))
-        cut(0, MotorHole.height)
-        cut(MotorHole.width, 0)
-        cut(0, -MotorHole.height)
-        move(MotorHole.edge_small_border / 2 - MotorHole.screw_radius / 2,
-             MotorHole.edge_long_border / 2)
-        arc(0, 0, MotorHole.screw_radius, 0)
-        move(-(MotorHole.edge_small_border / 2 - MotorHole.screw_radius / 2),
-             -(MotorHole.edge_long_border / 2))
-        cut(-MotorHole.width, 0)
-
-    header()
-    move(0, 120)
+        offset = MotorHole.edge_small_border / 2 - MotorHole.screw_radius / 2
+        program.move(-offset, MotorHole.edge_long_border / 2)
+        program.arc(0, 0, -MotorHole.screw_radius, 0)
+        program.move(offset, -(MotorHole.edge_long_border / 2))
+        program.cut(0, MotorHole.height)
+        program.cut(MotorHole.width, 0)
+        program.cut(0, -MotorHole.height)
+        program.move(offset, MotorHole.edge_long_border / 2)
+        program.arc(0, 0, MotorHole.screw_radius, 0)
+        program.move(-offset, -(MotorHole.edge_long_border / 2))
+        program.cut(-MotorHole.width, 0)
+
+    program.header()
+    program.move(0, 120)
     # Start by cutting bottom holes @ 40% height start and 60% height stop
-    relative()
+    program.relative()
     cut_bottom_hole()
-    move(0, -30)
+    program.move(0, -30)
     cut_bottom_hole()
 
     # Move to start point for cutting middle holes
-    absolute()
+    program.absolute()
     # 15 padding left, place holes on middle line and move cursor to
     # bottom left
-    move(9, Material.height / 2 - FrontMiddleHole.height / 2)  # 15/98
-    relative()
+    program.move(9, Material.height / 2 - FrontMiddleHole.height / 2)  # 15/98
+    program.relative()
     for _ in range(6):
         # 290 width, 15 padding at each side -> 260 width,
         # that makes 6 segments of 20mm hole, 20mm whitespace and one last
         # hole (h-w-h-w-h-w-h-w-h-w-h-w-h)
         cut_middle_hole()
-        move(40, 0)
+        program.move(40, 0)
     # The last missing hole (...-h)
     cut_middle_hole()
     # Move cursor on right end of hole
-    move(20, 0)
+    program.move(20, 0)
     # Add final padding
-    move(15, 0)
+    program.move(15, 0)
 
     # Cut motor holes
-    absolute()
-    move(240, 30)
-    relative()
+    program.absolute()
+    program.move(240, 30)
+    program.relative()
     cut_motor_hole()
-    absolute()
-    move(240, 170 - MotorHole.height)
-    relative()
+    program.absolute()
+    program.move(240, 170 - MotorHole.height)
+    program.relative()
     cut_motor_hole()
 
     # Frame
-    absolute()
-    move(0, 0)
-    cut(290, 0)
-    cut(290, 200)
-    cut(0, 200)
-    cut(0, 0)
+    program.absolute()
+    program.move(0, 0)
+    program.cut(290, 0)
+    program.cut(290, 200)
+    program.cut(0, 200)
+    program.cut(0, 0)
 
     # Done, write
-    footer()
-    with open(os.path.join(gcodeDir, 'front.gcode'), 'w') as gcode:
-        gcode.write('\n'.join(steps))
-    del steps[:]
+    program.footer()
+    return program
+
 
+def back() -> Program:
+    program = Program()
 
-def back():
     def cut_hook():
-        cut(0, 3.8)
-        arc(4, 4, 4, 0, clockwise=True)
-        cut(13, 0)
-        arc(3, -3, 0, -3, clockwise=True)
-        arc(-1, -1, -1, 0, clockwise=True)
-        cut(-5, 0)
-        cut(0, -3.8)
-        cut(6, 0)
+        program.cut(0, 3.8)
+        program.arc(4, 4, 4, 0, clockwise=True)
+        program.cut(13, 0)
+        program.arc(3, -3, 0, -3, clockwise=True)
+        program.arc(-1, -1, -1, 0, clockwise=True)
+        program.cut(-5, 0)
+        program.cut(0, -3.8)
+        program.cut(6, 0)
 
     top_angle = math.atan(100 / 190)
     outer_top_angle = math.radians(90) - top_angle
 
-    header()
+    program.header()
 
     # Cut cable hole
-    absolute()
-    move(250, 170)
-    relative()
-    arc(0, 0, 5, 5, clockwise=True)
+    program.absolute()
+    program.move(250, 170)
+    program.relative()
+    program.arc(0, 0, 5, 5, clockwise=True)
 
-    absolute()
-    move(225, 135)
-    relative()
+    program.absolute()
+    program.move(225, 135)
+    program.relative()
 
     # calculate triangle for rotated raspi rectangle
     width_offset = Raspi.width * math.sin(math.radians(45))
     height_offset = Raspi.height * math.sin(math.radians(45))
 
     # Cut screw holes.
-    move(-width_offset, -width_offset)
-    move(0, Raspi.screw_edge_offste)
-    arc(0, 0, 0, Raspi.screw_radius)
-    move((width_offset / Raspi.width) * Raspi.screws_offset,
-         (width_offset / Raspi.width) * Raspi.screws_offset)
-    arc(0, 0, 0, Raspi.screw_radius)
-    move(0, -Raspi.screw_edge_offste)
-    move(-(width_offset / Raspi.width) * Raspi.screws_offset,
-         -(width_offset / Raspi.width) * Raspi.screws_offset)
-    move(-height_offset, height_offset)
-    move(Raspi.screw_edge_offste, 0)
-    arc(0, 0, Raspi.screw_radius, 0)
-    move((width_offset / Raspi.width) * Raspi.screws_offset,
-         (width_offset / Raspi.width) * Raspi.screws_offset)
-    arc(0, 0, Raspi.screw_radius, 0)
+    program.move(-width_offset, -width_offset)
+    program.move(0, Raspi.screw_edge_offste)
+    program.arc(0, 0, 0, Raspi.screw_radius)
+    program.move((width_offset / Raspi.width) * Raspi.screws_offset,
+                 (width_offset / Raspi.width) * Raspi.screws_offset)
+    program.arc(0, 0, 0, Raspi.screw_radius)
+    program.move(0, -Raspi.screw_edge_offste)
+    program.move(-(width_offset / Raspi.width) * Raspi.screws_offset,
+                 -(width_offset / Raspi.width) * Raspi.screws_offset)
+    program.move(-height_offset, height_offset)
+    program.move(Raspi.screw_edge_offste, 0)
+    program.arc(0, 0, Raspi.screw_radius, 0)
+    program.move((width_offset / Raspi.width) * Raspi.screws_offset,
+                 (width_offset / Raspi.width) * Raspi.screws_offset)
+    program.arc(0, 0, Raspi.screw_radius, 0)
 
     # Now cut half moon stand plate
-    absolute()
-    move(20, 10)
-    relative()
-    cut(50, 0)
-    cut(0, 5)
-    cut(-5, 0)
-    cut(0, Material.thickness)
-    cut(5, 0)
-    move(-50, -5 - Material.thickness)
-    cut(0, 5)
-    cut(5, 0)
-    cut(0, Material.thickness)
-    cut(-5, 0)
+    program.absolute()
+    program.move(20, 10)
+    program.relative()
+    program.cut(50, 0)
+    program.cut(0, 5)
+    program.cut(-5, 0)
+    program.cut(0, Material.thickness)
+    program.cut(5, 0)
+    program.move(-50, -5 - Material.thickness)
+    program.cut(0, 5)
+    program.cut(5, 0)
+    program.cut(0, Material.thickness)
+    program.cut(-5, 0)
     # Bottom vase done, cut middle T piece
-    move(10, 0)
-    cut(0, -Material.thickness)
-    cut(30, 0)
-    cut(0, Material.thickness)
-    cut(-(15 - Material.thickness / 2), 0)
-    cut(0, BackBottomHole.hole)
-    cut(-Material.thickness, 0)
-    cut(0, -BackBottomHole.hole)
-    cut(-(15 - Material.thickness / 2), 0)
+    program.move(10, 0)
+    program.cut(0, -Material.thickness)
+    program.cut(30, 0)
+    program.cut(0, Material.thickness)
+    program.cut(-(15 - Material.thickness / 2), 0)
+    program.cut(0, BackBottomHole.hole)
+    program.cut(-Material.thickness, 0)
+    program.cut(0, -BackBottomHole.hole)
+    program.cut(-(15 - Material.thickness / 2), 0)
     # cut hole at top
     _radius = BackBottomHole.hole + BackBottomHole.bumper + \
         BackBottomHole.floor_hole
-    move(15 - Material.thickness / 2, _radius)
-    cut(0, -BackBottomHole.floor_hole)
-    cut(Material.thickness, 0)
-    cut(0, BackBottomHole.floor_hole)
+    program.move(15 - Material.thickness / 2, _radius)
+    program.cut(0, -BackBottomHole.floor_hole)
+    program.cut(Material.thickness, 0)
+    program.cut(0, BackBottomHole.floor_hole)
     # cut the two circles
-    arc(_radius, -_radius, 0, -_radius)
-    move(-(_radius + Material.thickness), _radius)
-    arc(-_radius, -_radius, 0, -_radius, clockwise=False)
+    program.arc(_radius, -_radius, 0, -_radius)
+    program.move(-(_radius + Material.thickness), _radius)
+    program.arc(-_radius, -_radius, 0, -_radius, clockwise=False)
 
     # Now cut bump at bottom of back so it fits into half moon stand
-    absolute()
-    move(0, 190)
-    relative()
+    program.absolute()
+    program.move(0, 190)
+    program.relative()
     offset_x = math.sin(top_angle) * BackBottomHole.hole
     offset_y = math.sin(outer_top_angle) * BackBottomHole.hole
-    move(offset_x, -offset_y)
+    program.move(offset_x, -offset_y)
     offset_paper_x = math.cos(top_angle) * Material.thickness
     offset_paper_y = math.sin(top_angle) * Material.thickness
-    cut(offset_paper_x, offset_paper_y)
+    program.cut(offset_paper_x, offset_paper_y)
     offset_bumber_x = math.sin(top_angle) * BackBottomHole.bumper
     offset_bumper_y = math.sin(outer_top_angle) * BackBottomHole.bumper
-    cut(offset_bumber_x, -offset_bumper_y)
-    cut(-offset_paper_x, -offset_paper_y)
+    program.cut(offset_bumber_x, -offset_bumper_y)
+    program.cut(-offset_paper_x, -offset_paper_y)
 
     # Start frame
-    absolute()
-    move(0, 190)
-    relative()
+    program.absolute()
+    program.move(0, 190)
+    program.relative()
     # Cut to 15mm padding
-    cut(15, 0)
+    program.cut(15, 0)
     # Same as middle holes: 6x hook - 20mm, one time only hook
     for _ in range(6):
         cut_hook()
-        cut(20, 0)
+        program.cut(20, 0)
     # the "only hook"
     cut_hook()
     # 10mm to end of hook, 15mm padding, 10mm off the edge
-    cut(15, 0)
+    program.cut(15, 0)
     # cut outline to bottom
-    cut(-190, -190)
+    program.cut(-190, -190)
 
     # cut outline back to top
-    absolute()
-    cut(0, 190)
-    relative()
-
-    footer()
-    with open(os.path.join(gcodeDir, 'back.gcode'), 'w') as gcode:
-        gcode.write('\n'.join(steps))
-    del steps[:]
+    program.absolute()
+    program.cut(0, 190)
+    program.relative()
+
+    program.footer()
+    return program
+
+
+PARTS = {'squares': squares, 'front': front, 'back': back}
+
+
+def show(programs: List[Tuple[str, Program]]) -> int:
+    """
+    Opens a tab of the visualizer for each program, without a file.
+    """
+    from PyQt5.QtWidgets import QApplication
+    from widgets.mainwindow import MainWindow
+
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    for name, program in programs:
+        window.showToolpath(program.toolpath(), name)
+    window.show()
+    return app.exec_()
+
+
+def main(argv: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Generates the G Code of the parts into %s.' % gcodeDir)
+    parser.add_argument('parts', nargs='*', metavar='part',
+                        help='one of %s, all if none given' %
+                        ', '.join(sorted(PARTS)))
+    parser.add_argument('--show', action='store_true',
+                        help='show the parts in the visualizer instead')
+    args = parser.parse_args(argv)
+    names = args.parts or sorted(PARTS)
+    for name in names:
+        if name not in PARTS:
+            parser.error('unknown part %s' % name)
+    programs = [(name, PARTS[name]()) for name in names]
+    if args.show:
+        return show(programs)
+    for name, program in programs:
+        program.write(os.path.join(gcodeDir, name + '.gcode'))
+    return 0
 
 
 if __name__ == '__main__':
-    squares()
-    front()
-    back()
+    sys.exit(main())
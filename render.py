@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+#
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# no display needed, must be set before Qt is loaded
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QRectF, QSize, QMarginsF, Qt
+from PyQt5.QtGui import QImage, QPainter, QPdfWriter, QPageSize, QPageLayout
+from PyQt5.QtSvg import QSvgGenerator
+from PyQt5.QtWidgets import QApplication
+
+from utilities.gcodereader import GCodeReader
+from widgets.toolpathscene import ToolpathScene
+
+# inserting this file into sys.path to allow absolute imports in project
+sys.path.insert(0, os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..')))
+
+FORMATS = ('png', 'svg', 'pdf')
+_app = None
+
+
+def paintScene(scene: ToolpathScene, painter: QPainter, width: int,
+               height: int, antialiasing: bool) -> None:
+    # same view as the GUI: the material rect, y axis pointing up
+    painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+    painter.translate(0, height)
+    painter.scale(1, -1)
+    scene.render(painter, QRectF(0, 0, width, height),
+                 ToolpathScene.MaterialRect, Qt.KeepAspectRatio)
+
+
+def renderFile(filename: str, output: str, width: int, renderMode: int,
+               antialiasing: bool=False) -> str:
+    global _app
+    if _app is None:
+        _app = QApplication([sys.argv[0]])
+    material = ToolpathScene.MaterialRect
+    height = round(width * material.height() / material.width())
+    scene = ToolpathScene()
+    # only the level of detail fitting the output resolution gets painted
+    halfPixel = material.width() / width / 2
+    scene.DetailTolerances = tuple(
+        tolerance for tolerance in ToolpathScene.DetailTolerances
+        if tolerance <= halfPixel)[-1:]
+    scene.renderMode = renderMode
+    # files are already spread over the processes
+    toolpath = GCodeReader(filename, workers=1).read()
+    scene.expectSegments(len(toolpath))
+    scene.addToolpath(toolpath)
+    painter = QPainter()
+    extension = os.path.splitext(output)[1].lower()
+    if extension == '.svg':
+        device = QSvgGenerator()
+        device.setFileName(output)
+        device.setSize(QSize(width, height))
+        device.setViewBox(QRectF(0, 0, width, height))
+        device.setTitle(os.path.basename(filename))
+        painter.begin(device)
+        paintScene(scene, painter, width, height, antialiasing)
+        painter.end()
+    elif extension == '.pdf':
+        device = QPdfWriter(output)
+        device.setPageSize(QPageSize(material.size(), QPageSize.Millimeter))
+        device.setPageOrientation(QPageLayout.Portrait)
+        device.setPageMargins(QMarginsF(0, 0, 0, 0))
+        device.setTitle(os.path.basename(filename))
+        painter.begin(device)
+        paintScene(scene, painter, device.width(), device.height(),
+                   antialiasing)
+        painter.end()
+    else:
+        device = QImage(width, height, QImage.Format_ARGB32)
+        device.fill(Qt.lightGray)
+        painter.begin(device)
+        paintScene(scene, painter, width, height, antialiasing)
+        painter.end()
+        if not device.save(output):
+            raise OSError('Could not write %s' % output)
+    return output
+
+
+def main(argv=None):
+    if not argv:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(argv[0]),
+        description='Renders G Code files to images without a window.')
+    parser.add_argument('files', nargs='+', metavar='FILE')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='png')
+    parser.add_argument('-o', '--output-dir',
+                        help='directory for the output files, default is '
+                             'next to each input file')
+    parser.add_argument('-w', '--width', type=int, default=1160,
+                        help='width in pixels for png and svg')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes')
+    parser.add_argument('--per-item', action='store_true',
+                        help='render one graphics item per command instead '
+                             'of batched paths')
+    parser.add_argument('--antialias', action='store_true',
+                        help='smooth edges, much slower on large files')
+    args = parser.parse_args(argv[1:])
+
+    renderMode = ToolpathScene.PerItem if args.per_item else \
+        ToolpathScene.Batched
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    started = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {}
+        for filename in args.files:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            directory = args.output_dir or os.path.dirname(filename)
+            output = os.path.join(directory, name + '.' + args.format)
+            futures[pool.submit(renderFile, filename, output, args.width,
+                                renderMode, args.antialias)] = filename
+        for future in as_completed(futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                failed += 1
+                print('%s: %s' % (futures[future], e), file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    count = len(args.files) - failed
+    print('Rendered %d files in %.2f s (%.1f files/s)' % (
+        count, elapsed, count / elapsed), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+
+
+import argparse
+import os
+import sys
+import time
+
+from utilities.fakecontroller import FakeController
+from utilities.gcodesender import RX_BUFFER_SIZE, STATUS_INTERVAL,\
+    SOFT_RESET, GCodeSender, SerialPort, ControllerError
+
+# inserting this file into sys.path to allow absolute imports in project
+sys.path.insert(0, os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..')))
+
+# seconds between two progress lines
+REPORT_INTERVAL = 1.0
+
+
+def main(argv=None):
+    if not argv:
+        argv = sys.argv
+
+    parser = argparse.ArgumentParser(
+        prog=os.path.basename(argv[0]),
+        description='Streams a G Code file to a Grbl controller and reports '
+                    'the sustained lines per second.')
+    parser.add_argument('file', metavar='FILE')
+    parser.add_argument('port', metavar='PORT', nargs='?',
+                        help='serial device of the controller')
+    parser.add_argument('-b', '--baud-rate', type=int, default=115200)
+    parser.add_argument('--buffer', type=int, default=RX_BUFFER_SIZE,
+                        help='characters the controller buffers, default '
+                             '%d' % RX_BUFFER_SIZE)
+    parser.add_argument('--no-status', action='store_true',
+                        help='for controllers without status reports')
+    parser.add_argument('--fake', type=float, metavar='RATE',
+                        help='send to a fake controller on a pty instead, '
+                             'acknowledging RATE lines per second, 0 for '
+                             'as fast as possible')
+    args = parser.parse_args(argv[1:])
+    if args.port is None and args.fake is None:
+        parser.error('either PORT or --fake is required')
+
+    fake = None
+    device = args.port
+    if args.fake is not None:
+        fake = FakeController(args.fake or None, args.buffer)
+        fake.start()
+        device = fake.port
+    try:
+        port = SerialPort(device, args.baud_rate)
+    except (OSError, ValueError) as e:
+        print('%s: %s' % (device, e), file=sys.stderr)
+        if fake:
+            fake.stop()
+        return 1
+    reported = [time.perf_counter()]
+
+    def report(sender: GCodeSender) -> None:
+        if time.perf_counter() - reported[0] >= REPORT_INTERVAL:
+            reported[0] = time.perf_counter()
+            print('Line %d, %d acknowledged, %.0f lines/s' % (
+                sender.lineNumber, sender.acknowledged,
+                sender.linesPerSecond))
+
+    with open(args.file) as f:
+        sender = GCodeSender(
+            port, f, args.buffer,
+            None if args.no_status else STATUS_INTERVAL, report)
+        try:
+            sender.run()
+        except (ControllerError, ValueError) as e:
+            print('%s: %s' % (args.file, e), file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            # the machine halts and drops the lines it buffers
+            port.write(SOFT_RESET)
+            print('Stopped at line %d' % sender.lineNumber, file=sys.stderr)
+            return 1
+        finally:
+            port.close()
+            if fake:
+                fake.stop()
+    print('Sent %d lines in %.2f s, %.0f lines/s sustained' % (
+        sender.acknowledged, sender.finished - sender.started,
+        sender.linesPerSecond))
+    if fake and fake.overflows:
+        print('The controller buffer overflowed by %d characters' %
+              fake.overflows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,154 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import glob
+import math
+import os
+import unittest
+
+import numpy as np
+
+from utilities import getResourcesPath
+from utilities.arcgeometry import arcGeometry
+from utilities.toolpath import Toolpath, G2, G3
+
+
+def scalarArcGeometry(op, prevX, prevY, x, y, offsetX, offsetY, radius):
+    """
+    The per-command arc math arcGeometry replaced, kept as the reference.
+    """
+    if offsetX == 0 and offsetY == 0:
+        # only R given
+        dx = x - prevX
+        dy = y - prevY
+        dist = math.sqrt(dx ** 2 + dy ** 2)
+        h = math.sqrt((radius ** 2) - ((dist ** 2) / 4))
+        tmpx = dy * h / dist
+        tmpy = -dx * h / dist
+        ccw = (op == G3)
+        if (ccw and radius > 0) or ((not ccw) and radius < 0):
+            tmpx = -tmpx
+            tmpy = -tmpy
+        middleX = tmpx + (2 * x - dx) / 2
+        middleY = tmpy + (2 * y - dy) / 2
+    else:
+        radius = math.sqrt(offsetX ** 2 + offsetY ** 2)
+        middleX = prevX + offsetX
+        middleY = prevY + offsetY
+    alpha = math.degrees(math.atan2(prevY - middleY, prevX - middleX))
+    beta = math.degrees(math.atan2(y - middleY, x - middleX))
+    if op == G2:
+        if beta > alpha:
+            if beta >= 180:
+                beta -= 360
+            else:
+                alpha += 360
+    elif op == G3:
+        if beta < alpha:
+            if alpha > 180:
+                alpha -= 360
+            else:
+                beta += 360
+    delta = alpha - beta
+    if delta == 0:
+        delta = 360
+    return middleX, middleY, radius, alpha, delta
+
+
+# op, x0, y0, x1, y1, i, j, r
+SPECIAL_ARCS = [
+    # R form, both directions, under and over 180°
+    (G2, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, 8.0),
+    (G3, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, 8.0),
+    (G2, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, -8.0),
+    (G3, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, -8.0),
+    (G2, 5.0, 5.0, 5.0, -5.0, 0.0, 0.0, -7.5),
+    (G3, -3.0, 4.0, 4.0, 3.0, 0.0, 0.0, -5.0),
+    # half circle, R exactly half the distance
+    (G2, 0.0, 0.0, 10.0, 0.0, 0.0, 0.0, 5.0),
+    # full circles, start and end point equal
+    (G2, 10.0, 10.0, 10.0, 10.0, 5.0, 0.0, 0.0),
+    (G3, 10.0, 10.0, 10.0, 10.0, 0.0, -5.0, 0.0),
+    # start angles around ±180°
+    (G2, -5.0, 0.0, 0.0, 5.0, 5.0, 0.0, 0.0),
+    (G3, -5.0, 0.0, 0.0, -5.0, 5.0, 0.0, 0.0),
+    (G2, 0.0, -5.0, -5.0, 0.0, 0.0, 5.0, 0.0),
+]
+
+
+class ArcGeometryTest(unittest.TestCase):
+    """
+    The vectorized kernel against the scalar code it replaced.
+    """
+    def assertMatchesScalar(self, op, x0, y0, x1, y1, i, j, r):
+        kernel = arcGeometry(op == G2, x0, y0, x1, y1, i, j, r)
+        expected = np.array([
+            scalarArcGeometry(*row)
+            for row in zip(op.tolist(), x0.tolist(), y0.tolist(),
+                           x1.tolist(), y1.tolist(), i.tolist(), j.tolist(),
+                           r.tolist())]).reshape(-1, 5)
+        for name, actual, column in zip(kernel._fields, kernel,
+                                        expected.T):
+            np.testing.assert_allclose(actual, column, rtol=0, atol=1e-9,
+                                       err_msg=name)
+
+    def testSpecialArcs(self):
+        columns = [np.array(column) for column in zip(*SPECIAL_ARCS)]
+        columns[0] = columns[0].astype(np.int8)
+        self.assertMatchesScalar(*columns)
+
+    def testFullCircleSpan(self):
+        # start and end point equal, a span of 0 means a full turn
+        x0, y0, x1, y1, i, j, r = (np.array([value]) for value in
+                                   (10.0, 10.0, 10.0, 10.0, 5.0, 0.0, 0.0))
+        geometry = arcGeometry(np.array([True]), x0, y0, x1, y1, i, j, r)
+        self.assertEqual(geometry.spanAngle[0], 360)
+
+    def testNegativeRadius(self):
+        # over 180°, the center on the other side than with a positive R
+        clockwise = np.array([True, True])
+        geometry = arcGeometry(clockwise, np.zeros(2), np.zeros(2),
+                               np.full(2, 10.0), np.zeros(2), np.zeros(2),
+                               np.zeros(2), np.array([8.0, -8.0]))
+        self.assertAlmostEqual(geometry.cy[0], -geometry.cy[1])
+        self.assertLess(abs(geometry.spanAngle[0]), 180)
+        self.assertGreater(abs(geometry.spanAngle[1]), 180)
+
+    def testExampleFiles(self):
+        files = sorted(glob.glob(os.path.join(getResourcesPath(), 'gcode',
+                                              '*.gcode')))
+        self.assertTrue(files)
+        for filename in files:
+            with self.subTest(file=os.path.basename(filename)):
+                toolpath = Toolpath.fromFile(filename)
+                arcs = toolpath.op >= G2
+                self.assertTrue(arcs.any())
+                self.assertMatchesScalar(*(
+                    getattr(toolpath, name)[arcs] for name in
+                    ('op', 'x0', 'y0', 'x1', 'y1', 'i', 'j', 'r')))
+
+
+if __name__ == '__main__':
+    unittest.main()
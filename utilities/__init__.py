@@ -25,8 +25,11 @@
 
 import sys
 import os
+from functools import lru_cache
 
 
+# the answer does not change while running, probe the filesystem once
+@lru_cache(maxsize=None)
 def getResourcesPath():
     resPath = os.path.join(os.path.dirname(
         sys.executable), '..', 'Resources')
@@ -35,3 +38,12 @@ def getResourcesPath():
         resPath = os.path.join(os.path.dirname(
             os.path.abspath(__file__)), '..')
     return resPath
+
+
+def getCachePath(*parts: str) -> str:
+    """
+    Directory for data that can be recomputed any time, not created here.
+    """
+    base = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'QGVisualizer', *parts)
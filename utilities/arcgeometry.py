@@ -0,0 +1,106 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import NamedTuple
+
+import numpy as np
+
+# Centers, radii and angles (in degrees) of a batch of G2/G3 arcs.
+# startAngle is measured from the center to the start point, spanAngle is
+# positive for clockwise arcs. Both follow the y-up G Code coordinates, so
+# Qt (y-down) needs the start angle negated.
+ArcGeometry = NamedTuple('ArcGeometry', [('cx', np.ndarray),
+                                         ('cy', np.ndarray),
+                                         ('radius', np.ndarray),
+                                         ('startAngle', np.ndarray),
+                                         ('spanAngle', np.ndarray)])
+
+
+# noinspection PyPep8Naming
+def arcGeometry(clockwise: np.ndarray, x0: np.ndarray, y0: np.ndarray,
+                x1: np.ndarray, y1: np.ndarray, i: np.ndarray, j: np.ndarray,
+                r: np.ndarray) -> ArcGeometry:
+    """
+    Computes the geometry of many arcs at once. Arcs with I = J = 0 are in
+    R form, a span of 0 means a full circle.
+    """
+    clockwise = np.asarray(clockwise, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # only R given
+        dx = x1 - x0
+        dy = y1 - y0
+        dist = np.sqrt(dx ** 2 + dy ** 2)
+        h = np.sqrt((r ** 2) - ((dist ** 2) / 4))
+        tmpx = dy * h / dist
+        tmpy = -dx * h / dist
+        flip = (~clockwise & (r > 0)) | (clockwise & (r < 0))
+        tmpx = np.where(flip, -tmpx, tmpx)
+        tmpy = np.where(flip, -tmpy, tmpy)
+
+        rForm = (i == 0) & (j == 0)
+        cx = np.where(rForm, tmpx + (2 * x1 - dx) / 2, x0 + i)
+        cy = np.where(rForm, tmpy + (2 * y1 - dy) / 2, y0 + j)
+        radius = np.where(rForm, r, np.sqrt(i ** 2 + j ** 2))
+
+        alpha = np.degrees(np.arctan2(y0 - cy, x0 - cx))
+        beta = np.degrees(np.arctan2(y1 - cy, x1 - cx))
+    # clockwise arcs have to run from alpha down to beta and counterclockwise
+    # ones the other way round, move one of the angles by a full turn if not
+    wrapCw = clockwise & (beta > alpha)
+    wrapCcw = ~clockwise & (beta < alpha)
+    newAlpha = np.where(wrapCw & (beta < 180), alpha + 360, alpha)
+    newAlpha = np.where(wrapCcw & (alpha > 180), alpha - 360, newAlpha)
+    newBeta = np.where(wrapCw & (beta >= 180), beta - 360, beta)
+    newBeta = np.where(wrapCcw & (alpha <= 180), beta + 360, newBeta)
+    delta = newAlpha - newBeta
+    delta[delta == 0] = 360
+    return ArcGeometry(cx, cy, radius, newAlpha, delta)
+
+
+def sweeps(startAngle: np.ndarray, spanAngle: np.ndarray,
+           angle: np.ndarray) -> np.ndarray:
+    """
+    Whether the arcs pass the given angle (degrees, y-up) around their center.
+    """
+    # positive spans run clockwise from the start angle
+    swept = np.where(spanAngle > 0, startAngle - angle,
+                     angle - startAngle) % 360
+    return swept <= np.abs(spanAngle)
+
+
+def arcPoints(radius: float, startAngle: float, spanAngle: float,
+              tolerance: float) -> np.ndarray:
+    """
+    Flattens an arc around the origin into an (n, 2) polyline whose chords
+    are at most tolerance away from the arc. Angles as in ArcGeometry.
+    """
+    if radius > tolerance:
+        step = 2 * np.arccos(1 - tolerance / radius)
+    else:
+        # smaller than the tolerance, a square will do
+        step = np.pi / 2
+    count = max(int(np.ceil(np.radians(abs(spanAngle)) / step)), 1)
+    angles = np.radians(startAngle - np.linspace(0, spanAngle, count + 1))
+    return np.column_stack((radius * np.cos(angles),
+                            radius * np.sin(angles)))
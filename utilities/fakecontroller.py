@@ -0,0 +1,127 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import os
+import re
+import select
+import threading
+import time
+import tty
+from typing import Optional
+
+from utilities.gcodesender import RX_BUFFER_SIZE, STATUS_REQUEST, SOFT_RESET
+
+_WORD = re.compile(r'([GXY])\s*([-+0-9.]+)')
+
+
+class FakeController(object):
+    """
+    Stands in for a Grbl controller on a pty, for trying senders without a
+    machine. Answers every line with ok, at most `rate` lines per second
+    (None for as fast as possible), and status requests with the position
+    of the last line. Characters beyond the receive buffer are counted as
+    overflows, a real controller would lose them.
+    """
+    def __init__(self, rate: Optional[float]=None,
+                 bufferSize: int=RX_BUFFER_SIZE) -> None:
+        self.rate = rate
+        self.bufferSize = bufferSize
+        self.received = 0
+        self.overflows = 0
+        self.x = self.y = 0.0
+        self._relative = False
+        self._buffer = b''
+        self._master, self._slave = os.openpty()
+        # no echo or line end translation until a sender opens it
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> 'FakeController':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _run(self) -> None:
+        interval = 1.0 / self.rate if self.rate else 0.0
+        due = time.perf_counter()
+        while not self._stop.is_set():
+            timeout = 0.05
+            if b'\n' not in self._buffer:
+                # waiting for lines does not earn a burst of them later
+                due = max(due, time.perf_counter())
+            else:
+                timeout = max(0.0, min(timeout, due - time.perf_counter()))
+            if select.select([self._master], [], [], timeout)[0]:
+                self._receive(os.read(self._master, 4096))
+            now = time.perf_counter()
+            while b'\n' in self._buffer and now >= due:
+                line, self._buffer = self._buffer.split(b'\n', 1)
+                self._execute(line.decode('ascii'))
+                self._write('ok')
+                due += interval
+
+    def _receive(self, data: bytes) -> None:
+        for byte in data:
+            character = bytes((byte,))
+            if character == STATUS_REQUEST:
+                self._write('<%s|WPos:%.3f,%.3f,0.000|Bf:15,%d>' % (
+                    'Run' if self._buffer else 'Idle', self.x, self.y,
+                    self.bufferSize - len(self._buffer)))
+            elif character == SOFT_RESET:
+                self._buffer = b''
+                self._write("Grbl 1.1h ['$' for help]")
+            elif len(self._buffer) >= self.bufferSize:
+                self.overflows += 1
+            else:
+                self._buffer += character
+                self.received += 1
+
+    def _execute(self, line: str) -> None:
+        words = dict((letter, value) for letter, value in
+                     _WORD.findall(line.upper()))
+        if words.get('G') in ('90', '91'):
+            self._relative = words['G'] == '91'
+        for letter, attribute in (('X', 'x'), ('Y', 'y')):
+            if letter in words:
+                value = float(words[letter])
+                if self._relative:
+                    value += getattr(self, attribute)
+                setattr(self, attribute, value)
+
+    def _write(self, response: str) -> None:
+        os.write(self._master, (response + '\r\n').encode('ascii'))
@@ -0,0 +1,56 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import Iterable, Iterator
+
+from utilities.types import Command
+
+
+def parseGCode(lines: Iterable[str]) -> Iterator[Command]:
+    """
+    Lazily parses G Code lines into commands, one at a time.
+    Argument values are converted to float, G2/G3 get I and J defaulting to 0.
+    """
+    for index, line in enumerate(lines, 1):
+        line = line.split(';', 1)[0].strip()
+        if not line:
+            continue
+        splitted = line.split()
+        cmd = splitted[0]
+        args = {}
+        for arg in splitted[1:]:
+            try:
+                args[arg[0]] = float(arg[1:])
+            except ValueError:
+                # not a numeric word, nothing we could draw
+                continue
+        if cmd == 'G2' or cmd == 'G3':
+            args.setdefault('I', 0.0)
+            args.setdefault('J', 0.0)
+        yield Command(cmd, args, index)
+
+
+def parseGCodeFile(filename: str) -> Iterator[Command]:
+    with open(filename) as f:
+        yield from parseGCode(f)
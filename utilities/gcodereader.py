@@ -0,0 +1,485 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import collections
+import itertools
+import mmap
+import os
+import time
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from utilities.profiler import profiler
+from utilities.toolpath import Toolpath, G0, G1, G2, G3, HOME_X, HOME_Y
+
+# kinds of commands besides the G0 - G3 opcodes
+G90 = 4
+G91 = 5
+G28 = 6
+OTHER = 7
+# exact command words, like the text parser G00 is not G0
+_COMMANDS = {b'G0': G0, b'G1': G1, b'G2': G2, b'G3': G3,
+             b'G90': G90, b'G91': G91, b'G28': G28}
+# argument letters the toolpath cares about
+_ARGUMENTS = b'XYIJRF'
+
+# whitespace, plus ';' so a comment never sticks to the word before it
+_SEPARATORS = np.zeros(256, dtype=bool)
+_SEPARATORS[list(b' \t\n\v\f\r;')] = True
+# letters of the argument words
+_ARGUMENT_LETTERS = np.zeros(256, dtype=bool)
+_ARGUMENT_LETTERS[list(_ARGUMENTS)] = True
+# exact doubles, enough for the 15 digits handled by _parseNumbers
+_POWERS_OF_TEN = np.array([10.0 ** exponent for exponent in range(16)])
+
+# One row per G Code line that holds a command. kind is an opcode or one of
+# the kinds above, x, y and f are NaN where the line has no such word.
+RawCommands = NamedTuple('RawCommands', [('kind', np.ndarray),
+                                         ('x', np.ndarray),
+                                         ('y', np.ndarray),
+                                         ('i', np.ndarray),
+                                         ('j', np.ndarray),
+                                         ('r', np.ndarray),
+                                         ('f', np.ndarray),
+                                         ('line', np.ndarray)])
+# layout of RawCommands in the shared memory blocks of the worker processes
+_SHARED_COLUMNS = (('x', np.float64), ('y', np.float64), ('i', np.float64),
+                   ('j', np.float64), ('r', np.float64), ('f', np.float64),
+                   ('line', np.int64), ('kind', np.int8))
+_SHARED_ROW_SIZE = sum(np.dtype(dtype).itemsize
+                       for _, dtype in _SHARED_COLUMNS)
+# the worker processes, started on the first large file
+# multiprocessing is imported by the parallel reader only, most files are
+# read without and the GUI starts faster
+_pool = None  # type: ProcessPoolExecutor
+_poolWorkers = 0
+
+
+def _wordKeys(data: np.ndarray, starts: np.ndarray,
+              lengths: np.ndarray) -> np.ndarray:
+    # packs words of up to three bytes and their length into one integer
+    keys = lengths.astype(np.int64) << 24
+    for offset in range(3):
+        has = lengths > offset
+        keys[has] |= data[starts[has] + offset].astype(np.int64) << \
+            (8 * offset)
+    return keys
+
+
+_COMMAND_KEYS = {
+    code: _wordKeys(np.frombuffer(word, dtype=np.uint8),
+                    np.zeros(1, dtype=np.int64), np.array([len(word)]))[0]
+    for word, code in _COMMANDS.items()}
+
+
+def _parseNumbers(data: np.ndarray, starts: np.ndarray,
+                  lengths: np.ndarray) -> np.ndarray:
+    """
+    Converts the byte ranges to floats in one go, NaN where they are not a
+    number.
+    """
+    count = len(starts)
+    values = np.full(count, np.nan)
+    if not count:
+        return values
+    # Plain decimals with up to 15 digits are read as an exact integer
+    # mantissa and divided by an exact power of ten. That single rounding
+    # gives the same double as float() does.
+    mantissa = np.zeros(count, dtype=np.int64)
+    digits = np.zeros(count, dtype=np.int32)
+    decimals = np.zeros(count, dtype=np.int32)
+    dots = np.zeros(count, dtype=np.int32)
+    first = data.take(starts, mode='clip')
+    negative = first == ord('-')
+    signed = negative | (first == ord('+'))
+    plain = lengths > 0
+    for offset in range(int(lengths.max())):
+        inside = lengths > offset
+        char = data.take(starts + offset, mode='clip')
+        digit = char - ord('0')
+        isDigit = (digit < 10) & inside
+        np.multiply(mantissa, 10, out=mantissa, where=isDigit)
+        np.add(mantissa, digit, out=mantissa, where=isDigit)
+        np.add(digits, 1, out=digits, where=isDigit)
+        np.add(decimals, 1, out=decimals, where=isDigit & (dots > 0))
+        isDot = (char == ord('.')) & inside
+        np.add(dots, 1, out=dots, where=isDot)
+        valid = isDigit | isDot | ~inside
+        if not offset:
+            valid |= signed
+        plain &= valid
+    plain &= (digits > 0) & (digits <= 15) & (dots <= 1)
+    values[plain] = mantissa[plain] / _POWERS_OF_TEN[decimals[plain]]
+    values[negative & plain] *= -1
+    # the rare rest ('1e3', '1.2.3', 'inf', ...) goes through float() like
+    # in the text parser
+    for index in np.flatnonzero(~plain & (lengths > 0)).tolist():
+        word = data[starts[index]:starts[index] + lengths[index]].tobytes()
+        try:
+            values[index] = float(word)
+        except ValueError:
+            pass
+    return values
+
+
+def tokenise(data: np.ndarray, firstLine: int=1) -> Tuple[RawCommands, int]:
+    """
+    Splits whole lines of G Code bytes into commands without decoding them.
+    Returns the commands and the number of lines consumed.
+    """
+    size = len(data)
+    newlines = np.flatnonzero(data == ord('\n'))
+    lineCount = len(newlines) + (1 if size and data[-1] != ord('\n') else 0)
+    separator = _SEPARATORS[data]
+    boundary = np.empty(size + 1, dtype=bool)
+    boundary[0] = True
+    boundary[1:] = separator
+    starts = np.flatnonzero(~separator & boundary[:-1])
+    boundary[:-1] = separator
+    boundary[-1] = True
+    ends = np.flatnonzero(~separator & boundary[1:]) + 1
+    lines = np.searchsorted(newlines, starts)
+
+    # drop words behind the first ';' of their line
+    semicolons = np.flatnonzero(data == ord(';'))
+    if len(semicolons):
+        commentLines, first = np.unique(np.searchsorted(newlines, semicolons),
+                                        return_index=True)
+        commentStart = np.full(lineCount + 1, size)
+        commentStart[commentLines] = semicolons[first]
+        keep = starts < commentStart[lines]
+        starts = starts[keep]
+        ends = ends[keep]
+        lines = lines[keep]
+
+    # the first word of a line is its command, the rest are arguments
+    isCommand = np.empty(len(starts), dtype=bool)
+    isCommand[:1] = True
+    isCommand[1:] = lines[1:] != lines[:-1]
+    row = np.cumsum(isCommand) - 1
+    lengths = ends - starts
+
+    commands = np.flatnonzero(isCommand)
+    keys = _wordKeys(data, starts[commands], lengths[commands])
+    kind = np.full(len(commands), OTHER, dtype=np.int8)
+    for code, key in _COMMAND_KEYS.items():
+        kind[keys == key] = code
+    # a feed rate can be a line of its own like "F1000"
+    feedLines = np.flatnonzero(data[starts[commands]] == ord('F'))
+    feeds = _parseNumbers(data, starts[commands[feedLines]] + 1,
+                          lengths[commands[feedLines]] - 1)
+
+    letters = data[starts]
+    words = np.flatnonzero(~isCommand & _ARGUMENT_LETTERS[letters])
+    values = _parseNumbers(data, starts[words] + 1, lengths[words] - 1)
+    # non numeric words are skipped, like the text parser does
+    valid = ~np.isnan(values)
+    words = words[valid]
+    values = values[valid]
+    letters = letters[words]
+    columns = {}
+    for letter in _ARGUMENTS:
+        ofLetter = letters == letter
+        column = np.full(len(commands), np.nan)
+        column[row[words[ofLetter]]] = values[ofLetter]
+        columns[chr(letter)] = column
+    # an F argument takes precedence, like in the text parser
+    feed = columns['F']
+    feed[feedLines] = np.where(np.isnan(feed[feedLines]), feeds,
+                               feed[feedLines])
+    return RawCommands(kind, columns['X'], columns['Y'],
+                       np.nan_to_num(columns['I'], nan=0.0),
+                       np.nan_to_num(columns['J'], nan=0.0), columns['R'],
+                       feed, lines[commands] + firstLine), lineCount
+
+
+def _resolveAxis(values: np.ndarray, relative: np.ndarray, home: np.ndarray,
+                 homeValue: float, start: float) -> np.ndarray:
+    # absolute coordinate after each command, same arithmetic as
+    # ToolpathBuilder so the results are bit for bit identical
+    resolved = np.empty(len(values))
+    switches = np.flatnonzero(relative[1:] != relative[:-1]) + 1
+    bounds = [0] + switches.tolist() + [len(values)]
+    current = start
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        if begin == end:
+            continue
+        run = values[begin:end]
+        if relative[begin]:
+            steps = np.empty(end - begin + 1)
+            steps[0] = current
+            steps[1:] = np.nan_to_num(run, nan=0.0)
+            part = np.add.accumulate(steps)[1:]
+            part[home[begin:end]] = homeValue
+        else:
+            runHome = home[begin:end]
+            run = np.where(runHome, homeValue, run)
+            given = ~np.isnan(run) | runHome
+            last = np.maximum.accumulate(
+                np.where(given, np.arange(end - begin), -1))
+            part = np.where(last >= 0, run[np.maximum(last, 0)], current)
+        resolved[begin:end] = part
+        current = part[-1]
+    return resolved
+
+
+def resolveCommands(raw: RawCommands, relative: bool, x: float, y: float,
+                    feed: float) -> Tuple[Toolpath, bool, float, float,
+                                          float]:
+    """
+    Turns tokenised commands into absolute segments, starting from the given
+    modal state. Returns the toolpath and the state after the last command.
+    """
+    count = len(raw.kind)
+    if not count:
+        return Toolpath.empty(), relative, x, y, feed
+    # G91 switches to relative, G90 and G28 to absolute coordinates, a
+    # command itself is still resolved in the mode before it
+    mode = np.where(raw.kind == G91, 1, np.where(
+        (raw.kind == G90) | (raw.kind == G28), 0, -1))
+    last = np.maximum.accumulate(np.where(mode >= 0, np.arange(count), -1))
+    modeAfter = np.where(last >= 0, mode[np.maximum(last, 0)],
+                         int(relative))
+    used = np.empty(count, dtype=bool)
+    used[0] = relative
+    used[1:] = modeAfter[:-1] == 1
+    home = raw.kind == G28
+    xs = _resolveAxis(raw.x, used, home, HOME_X, x)
+    ys = _resolveAxis(raw.y, used, home, HOME_Y, y)
+
+    given = np.maximum.accumulate(
+        np.where(np.isnan(raw.f), -1, np.arange(count)))
+    feeds = np.where(given >= 0, raw.f[np.maximum(given, 0)], feed)
+
+    moves = raw.kind <= G3
+    x0 = np.empty(count)
+    x0[0] = x
+    x0[1:] = xs[:-1]
+    y0 = np.empty(count)
+    y0[0] = y
+    y0[1:] = ys[:-1]
+    toolpath = Toolpath({
+        'op': raw.kind[moves], 'x0': x0[moves], 'y0': y0[moves],
+        'x1': xs[moves], 'y1': ys[moves], 'i': raw.i[moves],
+        'j': raw.j[moves], 'r': raw.r[moves], 'f': feeds[moves],
+        'line': raw.line[moves]})
+    return (toolpath, bool(modeAfter[-1]), float(xs[-1]), float(ys[-1]),
+            float(feeds[-1]))
+
+
+def _sharedColumns(buffer: memoryview, count: int) -> Dict[str, np.ndarray]:
+    # raw command columns packed back to back, the 8 byte ones first
+    columns = {}
+    offset = 0
+    for name, dtype in _SHARED_COLUMNS:
+        columns[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                      offset=offset)
+        offset += count * np.dtype(dtype).itemsize
+    return columns
+
+
+def _tokeniseShared(filename: str, begin: int,
+                    end: int) -> Tuple[str, int, int]:
+    """
+    Worker side of the parallel reader: tokenises a byte range of whole
+    lines, with line numbers counted from 0, into a new shared memory block.
+    Returns its name, the number of commands and of lines.
+    """
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8, count=end - begin,
+                                 offset=begin)
+            raw, lineCount = tokenise(data, 0)
+            del data
+    from multiprocessing.shared_memory import SharedMemory
+    count = len(raw.kind)
+    memory = SharedMemory(create=True,
+                          size=max(count * _SHARED_ROW_SIZE, 1))
+    columns = _sharedColumns(memory.buf, count)
+    for name, column in columns.items():
+        column[:] = getattr(raw, name)
+    del columns, column
+    memory.close()
+    return memory.name, count, lineCount
+
+
+def _readShared(name: str, count: int) -> RawCommands:
+    from multiprocessing.shared_memory import SharedMemory
+    memory = SharedMemory(name=name)
+    try:
+        columns = _sharedColumns(memory.buf, count)
+        raw = RawCommands(**{name: column.copy()
+                             for name, column in columns.items()})
+        del columns
+    finally:
+        memory.close()
+        memory.unlink()
+    return raw
+
+
+def _unlinkShared(name: str) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+    memory = SharedMemory(name=name)
+    memory.close()
+    memory.unlink()
+
+
+def _workerPool(workers: int) -> 'ProcessPoolExecutor':
+    global _pool, _poolWorkers
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    if _pool is None or _poolWorkers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        # spawned, forking the threaded GUI process is not safe
+        _pool = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('spawn'))
+        _poolWorkers = workers
+    return _pool
+
+
+# noinspection PyPep8Naming
+class GCodeReader(object):
+    """
+    Reads a G Code file through mmap and tokenises the raw bytes into
+    toolpath columns block by block, without decoding or splitting lines
+    into strings. Large files are tokenised by a pool of worker processes
+    while the modal state is resolved here, block after block.
+    """
+    # the first block is small so a first batch is ready at once
+    FirstBlockSize = 64 * 1024
+    BlockSize = 8 * 1024 * 1024
+    # smaller files are not worth starting worker processes for
+    ParallelMinimumSize = 32 * 1024 * 1024
+
+    def __init__(self, filename: str, workers: int=None) -> None:
+        self.filename = filename
+        self.workers = workers or os.cpu_count() or 1
+        self.bytesRead = 0
+        self.elapsed = 0.0
+        self.relative = False
+        self.x = 0.0
+        self.y = 0.0
+        self.feed = float('nan')
+
+    @property
+    def throughput(self) -> float:
+        """
+        Parse speed so far in MB/s.
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.bytesRead / self.elapsed / 1e6
+
+    def batches(self) -> Iterator[Toolpath]:
+        with open(self.filename, 'rb') as f:
+            size = f.seek(0, 2)
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                blocks = self._blocks(mm, size)
+                if self.workers > 1 and \
+                        size >= GCodeReader.ParallelMinimumSize:
+                    tokenised = self._tokeniseParallel(mm, blocks)
+                else:
+                    tokenised = self._tokenise(mm, blocks)
+                line = 1
+                started = time.perf_counter()
+                for end, raw, lineCount in tokenised:
+                    raw = raw._replace(line=raw.line + line)
+                    with profiler.stage('resolve'):
+                        toolpath, self.relative, self.x, self.y, \
+                            self.feed = resolveCommands(
+                                raw, self.relative, self.x, self.y,
+                                self.feed)
+                    line += lineCount
+                    self.bytesRead = end
+                    self.elapsed += time.perf_counter() - started
+                    yield toolpath
+                    started = time.perf_counter()
+
+    @staticmethod
+    def _blocks(mm: mmap.mmap, size: int) -> List[Tuple[int, int]]:
+        # byte ranges of whole lines
+        blocks = []
+        begin = 0
+        blockSize = GCodeReader.FirstBlockSize
+        while begin < size:
+            end = min(begin + blockSize, size)
+            if end < size:
+                end = mm.rfind(b'\n', begin, end) + 1 or \
+                    mm.find(b'\n', end) + 1 or size
+            blocks.append((begin, end))
+            begin = end
+            blockSize = GCodeReader.BlockSize
+        return blocks
+
+    @staticmethod
+    def _tokenise(mm: mmap.mmap, blocks: List[Tuple[int, int]]) -> \
+            Iterator[Tuple[int, RawCommands, int]]:
+        for begin, end in blocks:
+            data = np.frombuffer(mm, dtype=np.uint8, count=end - begin,
+                                 offset=begin)
+            with profiler.stage('tokenise'):
+                raw, lineCount = tokenise(data, 0)
+            del data  # the mmap can't be closed while viewed
+            yield end, raw, lineCount
+
+    def _tokeniseParallel(self, mm: mmap.mmap,
+                          blocks: List[Tuple[int, int]]) -> \
+            Iterator[Tuple[int, RawCommands, int]]:
+        # the small first block is done here while the workers start up
+        pool = _workerPool(self.workers)
+        rest = iter(blocks[1:])
+        pending = collections.deque()
+
+        def submit(count: int) -> None:
+            for begin, end in itertools.islice(rest, count):
+                pending.append((end, pool.submit(
+                    _tokeniseShared, self.filename, begin, end)))
+
+        # a few blocks ahead of resolving keeps every worker busy without
+        # holding the whole file in shared memory
+        submit(2 * self.workers)
+        try:
+            yield from self._tokenise(mm, blocks[:1])
+            while pending:
+                end, future = pending.popleft()
+                with profiler.stage('tokeniseWait'):
+                    name, count, lineCount = future.result()
+                submit(1)
+                yield end, _readShared(name, count), lineCount
+        finally:
+            # interrupted, don't leave shared memory behind
+            for _, future in pending:
+                if not future.cancel():
+                    try:
+                        name, _, _ = future.result()
+                    except Exception:
+                        continue
+                    _unlinkShared(name)
+
+    def read(self) -> Toolpath:
+        return Toolpath.concatenate(list(self.batches()))
@@ -0,0 +1,260 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import collections
+import os
+import re
+import select
+import termios
+import threading
+import time
+import tty
+from typing import Iterable, Iterator, Optional, Tuple, Callable
+
+# characters Grbl's serial receive buffer holds, one kept free
+RX_BUFFER_SIZE = 127
+# seconds between two status report requests
+STATUS_INTERVAL = 0.2
+# seconds a read waits at most, bounds how late stop() is noticed
+READ_TIMEOUT = 0.05
+# sent without a line end and not counted, the controller acts on them at
+# once instead of buffering them
+STATUS_REQUEST = b'?'
+SOFT_RESET = b'\x18'
+
+_BAUD_RATES = {rate: getattr(termios, 'B%d' % rate)
+               for rate in (9600, 19200, 38400, 57600, 115200, 230400)
+               if hasattr(termios, 'B%d' % rate)}
+_COMMENT = re.compile(r'\([^)]*\)|;.*')
+_POSITION = re.compile(r'\|(MPos|WPos|WCO):([-0-9.]+),([-0-9.]+)')
+
+
+class ControllerError(Exception):
+    """
+    The controller rejected a line or raised an alarm.
+    """
+
+
+class SerialPort(object):
+    """
+    A serial device, or the slave end of a pty, in raw mode. POSIX only.
+    """
+    def __init__(self, path: str, baudRate: int=115200) -> None:
+        if baudRate not in _BAUD_RATES:
+            raise ValueError('unsupported baud rate %d' % baudRate)
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+        try:
+            tty.setraw(self._fd)
+            attributes = termios.tcgetattr(self._fd)
+            attributes[4] = attributes[5] = _BAUD_RATES[baudRate]
+            termios.tcsetattr(self._fd, termios.TCSANOW, attributes)
+        except termios.error as e:
+            os.close(self._fd)
+            raise OSError('%s is not a serial port: %s' % (path, e))
+        self._received = b''
+
+    def write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def readLine(self, timeout: float) -> Optional[str]:
+        """
+        The next line the device sent without its line end, None if none
+        was complete within timeout seconds.
+        """
+        deadline = time.perf_counter() + timeout
+        while b'\n' not in self._received:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or \
+                    not select.select([self._fd], [], [], remaining)[0]:
+                return None
+            data = os.read(self._fd, 4096)
+            if not data:
+                raise OSError('%s was closed' % self.path)
+            self._received += data
+        line, self._received = self._received.split(b'\n', 1)
+        return line.decode('ascii', 'replace').strip()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def streamedLines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    The lines worth sending with their line numbers, comments and program
+    delimiters left out, as these take room in the controller's buffer.
+    """
+    for number, line in enumerate(lines, 1):
+        line = _COMMENT.sub('', line).strip()
+        if line and line != '%':
+            yield number, line
+
+
+class GCodeSender(object):
+    """
+    Streams G Code to a controller acknowledging every line with ok or
+    error, like Grbl. Lines are sent as long as all characters not yet
+    acknowledged fit the controller's receive buffer, so it always has the
+    next lines at hand instead of waiting for each one to be sent.
+    run() blocks, stop() may be called from any other thread.
+    """
+    def __init__(self, port: SerialPort, lines: Iterable[str],
+                 bufferSize: int=RX_BUFFER_SIZE,
+                 statusInterval: Optional[float]=STATUS_INTERVAL,
+                 listener: Callable[['GCodeSender'], None]=None) -> None:
+        self.port = port
+        self.lines = streamedLines(lines)
+        self.bufferSize = bufferSize
+        # None for controllers without status reports
+        self.statusInterval = statusInterval
+        # called from run() on every acknowledgement and status report
+        self.listener = listener
+        self.sent = 0
+        self.acknowledged = 0
+        # file line number of the last acknowledged line
+        self.lineNumber = 0
+        # from the status reports, in work coordinates
+        self.position = None  # type: Optional[Tuple[float, float]]
+        self.state = ''
+        self.started = None  # type: float
+        self.finished = None  # type: float
+        self._workOffset = (0.0, 0.0)
+        self._lastAcknowledged = None  # type: float
+        # line number and length of the lines in the controller's buffer
+        self._pending = collections.deque()
+        self._buffered = 0
+        self._stop = threading.Event()
+
+    @property
+    def linesPerSecond(self) -> float:
+        """
+        Acknowledged lines per second since the first line was sent.
+        """
+        if self.started is None:
+            return 0.0
+        end = self.finished or time.perf_counter()
+        if not self._pending and self.acknowledged:
+            # done sending, the machine may still be moving
+            end = self._lastAcknowledged
+        return self.acknowledged / max(end - self.started, 1e-9)
+
+    def stop(self) -> None:
+        """
+        Ends run(), which resets the controller so it drops the lines it
+        still buffers and halts the machine.
+        """
+        self._stop.set()
+
+    def run(self) -> bool:
+        """
+        Sends all lines and waits for them to be acknowledged, and with
+        status reports for the machine to come to rest. Returns False if
+        stopped before.
+        """
+        self.started = time.perf_counter()
+        nextLine = next(self.lines, None)
+        nextStatus = self.started
+        try:
+            while nextLine is not None or self._pending or \
+                    self._moving():
+                if self._stop.is_set():
+                    self.port.write(SOFT_RESET)
+                    return False
+                while nextLine is not None and self._fits(*nextLine):
+                    self._send(*nextLine)
+                    nextLine = next(self.lines, None)
+                if self.statusInterval is not None and \
+                        time.perf_counter() >= nextStatus:
+                    self.port.write(STATUS_REQUEST)
+                    nextStatus = time.perf_counter() + self.statusInterval
+                response = self.port.readLine(READ_TIMEOUT)
+                while response is not None:
+                    self._handle(response)
+                    response = self.port.readLine(0)
+        finally:
+            self.finished = time.perf_counter()
+        return True
+
+    def _moving(self) -> bool:
+        # the machine still works off its planner after the last ok, known
+        # only from status reports
+        return self.statusInterval is not None and \
+            self.state not in ('', 'Idle')
+
+    def _fits(self, number: int, line: str) -> bool:
+        # with its line end
+        length = len(line) + 1
+        if length > self.bufferSize:
+            raise ValueError('line %d is longer than the controller buffer'
+                             % number)
+        return self._buffered + length <= self.bufferSize
+
+    def _send(self, number: int, line: str) -> None:
+        data = (line + '\n').encode('ascii')
+        self.port.write(data)
+        self._pending.append((number, len(data)))
+        self._buffered += len(data)
+        self.sent += 1
+
+    def _handle(self, response: str) -> None:
+        if response == 'ok' or response.startswith('error'):
+            if not self._pending:
+                # e.g. answering a line of an earlier stream
+                return
+            number, length = self._pending.popleft()
+            self._buffered -= length
+            if response != 'ok':
+                raise ControllerError('line %d: %s' % (number, response))
+            self.acknowledged += 1
+            self.lineNumber = number
+            self._lastAcknowledged = time.perf_counter()
+        elif response.startswith('<'):
+            self._parseStatus(response)
+        elif response.startswith('ALARM'):
+            raise ControllerError(response)
+        else:
+            # greetings, messages and settings
+            return
+        if self.listener is not None:
+            self.listener(self)
+
+    def _parseStatus(self, report: str) -> None:
+        # <Run|MPos:1.000,2.000,0.000|FS:500,0|WCO:0.000,0.000,0.000>
+        self.state = report[1:].split('|', 1)[0].rstrip('>')
+        machine = None
+        for kind, x, y in _POSITION.findall(report):
+            if kind == 'WPos':
+                self.position = (float(x), float(y))
+            elif kind == 'MPos':
+                machine = (float(x), float(y))
+            else:
+                self._workOffset = (float(x), float(y))
+        if machine is not None:
+            self.position = (machine[0] - self._workOffset[0],
+                             machine[1] - self._workOffset[1])
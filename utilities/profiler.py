@@ -0,0 +1,209 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Iterator, Optional
+
+
+# cProfile, pstats and json are imported when needed, the profiler is
+# created on every start but rarely enabled
+
+# noinspection PyPep8Naming
+class Profiler(object):
+    """
+    Opt-in timings of the loading and drawing stages and counters of the
+    paint() calls per item type. While disabled every call site only
+    checks the enabled flag.
+    """
+    # any value but 0 enables profiling from the start
+    EnvironmentVariable = 'QGV_PROFILE'
+    # prefix of the counters incremented by paint() overrides
+    PaintPrefix = 'paint.'
+
+    def __init__(self, enabled: bool=False) -> None:
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._profile = None  # type: Optional['cProfile.Profile']
+        self._frameStarted = None  # type: Optional[float]
+        self._framePaints = 0
+        self.enabled = False
+        self.reset()
+        self.setEnabled(enabled)
+
+    def reset(self) -> None:
+        with self._lock:
+            # name -> [calls, total seconds]
+            self.stages = {}  # type: Dict[str, List]
+            self.counters = {}  # type: Dict[str, int]
+            # (name, start, duration, thread id, args) for the trace
+            self.events = []  # type: List[Tuple]
+            # finished cProfile runs of worker threads
+            self.profiles = []  # type: List['cProfile.Profile']
+            # (items painted, seconds) of the last frame
+            self.lastFrame = (0, 0.0)
+
+    def setEnabled(self, enabled: bool) -> None:
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self._profile = self._startProfile()
+        elif self._profile is not None:
+            self._profile.disable()
+            with self._lock:
+                self.profiles.append(self._profile)
+            self._profile = None
+
+    @staticmethod
+    def _startProfile() -> Optional['cProfile.Profile']:
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is active on this interpreter
+            return None
+        return profile
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started, time.perf_counter() - started)
+
+    @contextmanager
+    def profiled(self) -> Iterator[None]:
+        """
+        Runs the block under cProfile, for threads other than the GUI thread
+        which is profiled as long as the profiler is enabled.
+        """
+        profile = self._startProfile() if self.enabled else None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self.profiles.append(profile)
+
+    def record(self, name: str, started: float, duration: float,
+               args: Dict[str, object]=None) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, [0, 0.0])
+            stage[0] += 1
+            stage[1] += duration
+            self.events.append((name, started, duration,
+                                threading.get_ident(), args))
+
+    def count(self, name: str, amount: int=1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def paintCount(self) -> int:
+        with self._lock:
+            return sum(count for name, count in self.counters.items()
+                       if name.startswith(Profiler.PaintPrefix))
+
+    def startFrame(self) -> None:
+        self._frameStarted = time.perf_counter()
+        self._framePaints = self.paintCount()
+
+    def countPaint(self, item: object) -> None:
+        self.count(Profiler.PaintPrefix + type(item).__name__)
+
+    def endFrame(self) -> None:
+        if self._frameStarted is None:
+            return
+        duration = time.perf_counter() - self._frameStarted
+        items = self.paintCount() - self._framePaints
+        self.lastFrame = (items, duration)
+        self.record('frame', self._frameStarted, duration, {'items': items})
+        self._frameStarted = None
+
+    def snapshot(self) -> Tuple[Dict[str, Tuple[int, float]],
+                                Dict[str, int]]:
+        """
+        Copies of the stages as name -> (calls, total seconds) and counters.
+        """
+        with self._lock:
+            return ({name: tuple(stage)
+                     for name, stage in self.stages.items()},
+                    dict(self.counters))
+
+    def summary(self) -> str:
+        stages = sorted(self.snapshot()[0].items(),
+                        key=lambda item: -item[1][1])
+        return ', '.join('%s %.0f ms' % (name, total * 1000)
+                         for name, (_, total) in stages
+                         if name != 'frame')
+
+    def writeStats(self, filename: str) -> None:
+        """
+        Dumps all cProfile runs merged into one pstats file.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        try:
+            with self._lock:
+                profiles = self.profiles + [self._profile]
+            profiles = [profile for profile in profiles
+                        if profile is not None]
+            if not profiles:
+                raise ValueError('Nothing was profiled yet')
+            import pstats
+            pstats.Stats(*profiles).dump_stats(filename)
+        finally:
+            if self._profile is not None:
+                self._profile.enable()
+
+    def writeChromeTrace(self, filename: str) -> None:
+        """
+        Writes the recorded stages as trace events, to be opened with
+        chrome://tracing or Perfetto.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                       'ts': (started - self._origin) * 1e6,
+                       'dur': duration * 1e6, 'args': args or {}}
+                      for name, started, duration, tid, args in self.events]
+            events.append({'name': 'counters', 'ph': 'C', 'pid': pid,
+                           'tid': threading.get_ident(),
+                           'ts': (time.perf_counter() - self._origin) * 1e6,
+                           'args': dict(self.counters)})
+        import json
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+profiler = Profiler(os.environ.get(Profiler.EnvironmentVariable, '0')
+                    not in ('', '0'))
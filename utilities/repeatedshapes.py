@@ -0,0 +1,186 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+import threading
+import weakref
+from typing import List, NamedTuple
+
+import numpy as np
+
+from utilities.toolpath import Toolpath, G0, G2
+from utilities.toolpathoptimizer import splitContours
+
+# A run of cuts that occurs more than once. key is the same for all runs of
+# the same shape, in any toolpath, rows start:stop are its first run here,
+# starts the first rows of all its runs and offsets (n, 2) their start
+# points.
+Shape = NamedTuple('Shape', [('key', bytes), ('start', int), ('stop', int),
+                             ('starts', np.ndarray),
+                             ('offsets', np.ndarray)])
+# instanced tells the rows drawn by one of the shapes
+RepeatedShapes = NamedTuple('RepeatedShapes', [('shapes', List[Shape]),
+                                               ('instanced', np.ndarray)])
+
+# shorter runs are only shapes as whole contours, or if they hold an arc
+MIN_SEGMENTS = 3
+# length of the windows repeats within contours are searched with
+WINDOW = 4
+# mm two runs may differ by and still be the same shape
+RESOLUTION = 1e-6
+
+
+def _segmentCodes(toolpath: Toolpath) -> np.ndarray:
+    """
+    Number per segment, equal for segments that are translated copies.
+    """
+    with np.errstate(invalid='ignore'):
+        record = np.column_stack([
+            np.round(np.nan_to_num(column, nan=np.inf) / RESOLUTION)
+            for column in (toolpath.x1 - toolpath.x0,
+                           toolpath.y1 - toolpath.y0,
+                           toolpath.i, toolpath.j, toolpath.r)])
+    record = np.column_stack((toolpath.op, record))
+    return np.unique(record, axis=0, return_inverse=True)[1].reshape(-1)
+
+
+def _worthIt(toolpath: Toolpath, start: int, stop: int) -> bool:
+    return stop - start >= MIN_SEGMENTS or \
+        bool((toolpath.op[start:stop] >= G2).any())
+
+
+def findRepeatedShapes(toolpath: Toolpath) -> RepeatedShapes:
+    """
+    Finds cuts repeated as they are, only translated: whole contours first,
+    then runs of at least WINDOW segments within the rest of the contours,
+    extended as long as all runs continue alike.
+    """
+    count = len(toolpath)
+    instanced = np.zeros(count, dtype=bool)
+    shapes = []  # type: List[Shape]
+    contours = splitContours(toolpath)
+    if len(contours.starts) < 2:
+        return RepeatedShapes(shapes, instanced)
+    codes = _segmentCodes(toolpath)
+
+    def addShape(starts: List[int], length: int) -> None:
+        first = starts[0]
+        for start in starts:
+            instanced[start:start + length] = True
+        rows = np.array(starts)
+        shapes.append(Shape(
+            _shapeKey(toolpath, first, first + length), first,
+            first + length, rows,
+            np.column_stack((toolpath.x0[rows], toolpath.y0[rows]))))
+
+    # whole contours
+    groups = {}
+    for start, stop in zip(contours.starts.tolist(),
+                           contours.stops.tolist()):
+        groups.setdefault(codes[start:stop].tobytes(), []).append(start)
+    lengths = dict(zip(contours.starts.tolist(),
+                       (contours.stops - contours.starts).tolist()))
+    for starts in groups.values():
+        length = lengths[starts[0]]
+        if len(starts) > 1 and _worthIt(toolpath, starts[0],
+                                        starts[0] + length):
+            addShape(starts, length)
+
+    # windows of the contours left, within one contour each
+    contour = np.zeros(count, dtype=np.int64)
+    contour[contours.starts] = 1
+    contour = np.cumsum(contour)
+    contour[toolpath.op == G0] = -1
+    if count < WINDOW:
+        return RepeatedShapes(shapes, instanced)
+    windows = np.arange(count - WINDOW + 1)
+    valid = (contour[windows] >= 0) & \
+        (contour[windows] == contour[windows + WINDOW - 1]) & \
+        ~instanced[windows] & ~instanced[windows + WINDOW - 1]
+    windows = windows[valid]
+    if len(windows) < 2:
+        return RepeatedShapes(shapes, instanced)
+    ids = np.unique(np.column_stack([codes[windows + offset]
+                                     for offset in range(WINDOW)]),
+                    axis=0, return_inverse=True)[1].reshape(-1)
+    order = np.argsort(ids, kind='stable')
+    bounds = np.flatnonzero(np.diff(ids[order])) + 1
+    groupsOf = [group for group in np.split(windows[order], bounds)
+                if len(group) > 1]
+    # the shape starting first wins overlaps
+    groupsOf.sort(key=lambda group: group[0])
+    for group in groupsOf:
+        starts = []
+        for start in group.tolist():
+            if not instanced[start:start + WINDOW].any() and \
+                    (not starts or start >= starts[-1] + WINDOW):
+                starts.append(start)
+        if len(starts) < 2:
+            continue
+        length = WINDOW
+        # grow while every run continues with the same segment, within
+        # its contour and without running into the next one
+        while True:
+            following = [start + length for start in starts]
+            if following[-1] >= count or any(
+                    contour[row] != contour[start] or instanced[row]
+                    for start, row in zip(starts, following)) or any(
+                    row >= start for row, start in zip(following[:-1],
+                                                       starts[1:])):
+                break
+            if len({codes[row] for row in following}) != 1:
+                break
+            length += 1
+        addShape(starts, length)
+    return RepeatedShapes(shapes, instanced)
+
+
+def _shapeKey(toolpath: Toolpath, start: int, stop: int) -> bytes:
+    # the geometry itself, codes are only comparable within one toolpath
+    rows = slice(start, stop)
+    x = toolpath.x0[start]
+    y = toolpath.y0[start]
+    relative = np.column_stack([
+        np.round(np.nan_to_num(column, nan=np.inf) / RESOLUTION)
+        for column in (toolpath.x0[rows] - x, toolpath.y0[rows] - y,
+                       toolpath.x1[rows] - x, toolpath.y1[rows] - y,
+                       toolpath.i[rows], toolpath.j[rows],
+                       toolpath.r[rows])])
+    return toolpath.op[start:stop].tobytes() + relative.tobytes()
+
+
+# toolpath -> its shapes, found once by the loader thread for the scene
+_shapes = weakref.WeakKeyDictionary()
+_shapesLock = threading.Lock()
+
+
+def repeatedShapes(toolpath: Toolpath) -> RepeatedShapes:
+    with _shapesLock:
+        shapes = _shapes.get(toolpath)
+    if shapes is None:
+        shapes = findRepeatedShapes(toolpath)
+        with _shapesLock:
+            _shapes[toolpath] = shapes
+    return shapes
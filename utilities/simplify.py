@@ -0,0 +1,106 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import Tuple
+
+import numpy as np
+
+
+def simplifyPolyline(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker: drops vertices of the (n, 2) polyline that are closer
+    than tolerance to the simplified line. End points are always kept.
+    """
+    count = len(points)
+    if count < 3:
+        return points
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    ranges = [(0, count - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        if last - first < 2:
+            continue
+        start = points[first]
+        direction = points[last] - start
+        inner = points[first + 1:last] - start
+        length = np.hypot(direction[0], direction[1])
+        if length:
+            distance = np.abs(inner[:, 0] * direction[1] -
+                              inner[:, 1] * direction[0]) / length
+        else:
+            # closed polyline, measure from the start point instead
+            distance = np.hypot(inner[:, 0], inner[:, 1])
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            ranges.append((first, index))
+            ranges.append((index, last))
+    return points[keep]
+
+
+def simplifyPolylines(points: np.ndarray, starts: np.ndarray,
+                      tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    simplifyPolyline on many polylines at once, stored back to back in the
+    (n, 2) points with polyline k starting at starts[k]. Every step splits
+    all ranges of all polylines together instead of one after the other.
+    Returns the kept points and where the polylines start among them.
+    """
+    count = len(points)
+    if not len(starts):
+        return points, starts
+    ends = np.append(starts[1:], count) - 1
+    keep = np.zeros(count, dtype=bool)
+    keep[starts] = keep[ends] = True
+    long = ends - starts >= 2
+    first, last = starts[long], ends[long]
+    while len(first):
+        inner = last - first - 1
+        offsets = np.cumsum(inner) - inner
+        owner = np.repeat(np.arange(len(first)), inner)
+        index = np.arange(len(owner)) - offsets[owner] + first[owner] + 1
+        start = points[first]
+        direction = points[last] - start
+        relative = points[index] - start[owner]
+        length = np.hypot(direction[:, 0], direction[:, 1])[owner]
+        cross = np.abs(relative[:, 0] * direction[owner, 1] -
+                       relative[:, 1] * direction[owner, 0])
+        # closed polylines measure from the start point instead
+        distance = np.where(length > 0, cross / np.where(length > 0,
+                                                         length, 1),
+                            np.hypot(relative[:, 0], relative[:, 1]))
+        farthest = np.maximum.reduceat(distance, offsets)
+        # the first point at that distance, like argmax
+        candidates = np.flatnonzero(distance == farthest[owner])
+        pivot = index[candidates[np.searchsorted(candidates, offsets)]]
+        split = farthest > tolerance
+        pivot = pivot[split]
+        keep[pivot] = True
+        first = np.concatenate((first[split], pivot))
+        last = np.concatenate((pivot, last[split]))
+        long = last - first >= 2
+        first, last = first[long], last[long]
+    return points[keep], np.cumsum(keep)[starts] - 1
@@ -0,0 +1,199 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import math
+import threading
+import weakref
+from typing import Optional
+
+import numpy as np
+
+from utilities.arcgeometry import sweeps
+from utilities.toolpath import Toolpath, G2
+
+
+# noinspection PyPep8Naming
+class SegmentGrid(object):
+    """
+    Uniform grid over the bounding boxes of the segments of a toolpath,
+    answering which segments lie in a rectangle or near a point. Built once,
+    the toolpath must not change afterwards.
+    """
+    # segments per cell the cell size aims for
+    SegmentsPerCell = 4
+    # cell references per segment above which the cells get coarser, keeps
+    # few huge arcs from filling the whole grid
+    MaxReferences = 16
+
+    def __init__(self, toolpath: Toolpath, cellSize: float=None) -> None:
+        self.toolpath = toolpath
+        count = len(toolpath)
+        minX, minY, maxX, maxY = toolpath.segmentBounds()
+        self.minX, self.minY, self.maxX, self.maxY = minX, minY, maxX, maxY
+
+        if count:
+            self.originX = float(minX.min())
+            self.originY = float(minY.min())
+            width = max(float(maxX.max()) - self.originX, 1e-9)
+            height = max(float(maxY.max()) - self.originY, 1e-9)
+        else:
+            self.originX = self.originY = 0.0
+            width = height = 1.0
+        if cellSize is None:
+            # no smaller than most segments, they'd span many cells
+            cellSize = math.sqrt(width * height *
+                                 SegmentGrid.SegmentsPerCell / max(count, 1))
+            if count:
+                cellSize = max(cellSize, float(np.nanmedian(np.maximum(
+                    maxX - minX, maxY - minY))))
+        cellSize = max(cellSize, width / 4096, height / 4096)
+        while True:
+            self.cellSize = cellSize
+            self.columns = int(width / cellSize) + 1
+            self.rows = int(height / cellSize) + 1
+            column0, row0 = self._cell(minX, minY)
+            column1, row1 = self._cell(maxX, maxY)
+            spans = column1 - column0 + 1
+            counts = spans * (row1 - row0 + 1)
+            total = int(counts.sum())
+            if total <= SegmentGrid.MaxReferences * max(count, 1):
+                break
+            cellSize *= 2
+
+        # every segment once per cell its box touches, sorted by cell
+        segments = np.repeat(np.arange(count), counts)
+        firsts = np.repeat(np.cumsum(counts) - counts, counts)
+        offset = np.arange(total) - firsts
+        spans = np.repeat(spans, counts)
+        cells = (np.repeat(row0, counts) + offset // spans) * self.columns + \
+            np.repeat(column0, counts) + offset % spans
+        order = np.argsort(cells, kind='stable')
+        self._segments = segments[order]
+        self._cellStarts = np.searchsorted(
+            cells[order], np.arange(self.columns * self.rows + 1))
+
+    def _cell(self, x: np.ndarray, y: np.ndarray):
+        # NaN, from broken R form arcs, ends up in the first cell
+        column = np.nan_to_num((x - self.originX) / self.cellSize)
+        row = np.nan_to_num((y - self.originY) / self.cellSize)
+        return (np.clip(column, 0, self.columns - 1).astype(np.int64),
+                np.clip(row, 0, self.rows - 1).astype(np.int64))
+
+    @staticmethod
+    def _clamp(cell: float, count: int) -> int:
+        return min(max(int(cell), 0), count - 1)
+
+    def inRect(self, x0: float, y0: float, x1: float,
+               y1: float) -> np.ndarray:
+        """
+        Rows of the segments whose bounding box intersects the rectangle,
+        ascending.
+        """
+        # plain floats, numpy has too much overhead for a single point
+        column0 = self._clamp((x0 - self.originX) / self.cellSize,
+                              self.columns)
+        column1 = self._clamp((x1 - self.originX) / self.cellSize,
+                              self.columns)
+        row0 = self._clamp((y0 - self.originY) / self.cellSize, self.rows)
+        row1 = self._clamp((y1 - self.originY) / self.cellSize, self.rows)
+        starts = self._cellStarts
+        # the cells of a grid row are consecutive
+        parts = [self._segments[starts[row * self.columns + column0]:
+                                starts[row * self.columns + column1 + 1]]
+                 for row in range(row0, row1 + 1)]
+        candidates = parts[0] if len(parts) == 1 and column0 == column1 \
+            else np.unique(np.concatenate(parts))
+        inside = (self.minX[candidates] <= x1) & \
+            (self.maxX[candidates] >= x0) & \
+            (self.minY[candidates] <= y1) & (self.maxY[candidates] >= y0)
+        return candidates[inside]
+
+    def distances(self, rows: np.ndarray, x: float, y: float) -> np.ndarray:
+        """
+        Distance of the point to each of the given segments.
+        """
+        toolpath = self.toolpath
+        x0 = toolpath.x0[rows]
+        y0 = toolpath.y0[rows]
+        dx = toolpath.x1[rows] - x0
+        dy = toolpath.y1[rows] - y0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip(np.nan_to_num(((x - x0) * dx + (y - y0) * dy) /
+                                      (dx ** 2 + dy ** 2)), 0, 1)
+            result = np.hypot(x0 + t * dx - x, y0 + t * dy - y)
+            arcRows = np.searchsorted(toolpath.arcIndex, rows)
+            isArc = toolpath.op[rows] >= G2
+            if isArc.any():
+                arcs = toolpath.arcGeometry()
+                which = arcRows[isArc]
+                cx = arcs.cx[which]
+                cy = arcs.cy[which]
+                alpha = arcs.startAngle[which]
+                delta = arcs.spanAngle[which]
+                onCircle = np.abs(np.hypot(x - cx, y - cy) -
+                                  np.abs(arcs.radius[which]))
+                theta = np.degrees(np.arctan2(y - cy, x - cx))
+                swept = sweeps(alpha, delta, theta)
+                ends = np.minimum(
+                    np.hypot(x0[isArc] - x, y0[isArc] - y),
+                    np.hypot(x0[isArc] + dx[isArc] - x,
+                             y0[isArc] + dy[isArc] - y))
+                result[isArc] = np.where(swept, onCircle, ends)
+        return result
+
+    def nearest(self, x: float, y: float,
+                tolerance: float) -> Optional[int]:
+        """
+        Row of the segment closest to the point, if one is within tolerance.
+        Of segments drawn over each other the last one wins.
+        """
+        rows = self.inRect(x - tolerance, y - tolerance, x + tolerance,
+                           y + tolerance)
+        if not len(rows):
+            return None
+        distances = self.distances(rows, x, y)
+        best = len(rows) - 1 - int(np.nanargmin(distances[::-1])) \
+            if not np.isnan(distances).all() else None
+        if best is None or distances[best] > tolerance:
+            return None
+        return int(rows[best])
+
+
+# toolpath -> weak reference to its grid. The grid refers to the toolpath,
+# holding it weakly as well keeps both collectable once no scene uses them.
+_grids = weakref.WeakKeyDictionary()
+_gridsLock = threading.Lock()
+
+
+def sharedGrid(toolpath: Toolpath) -> SegmentGrid:
+    """
+    The grid of toolpath, built once for all scenes showing it.
+    """
+    with _gridsLock:
+        reference = _grids.get(toolpath)
+        grid = reference() if reference is not None else None
+        if grid is None:
+            grid = SegmentGrid(toolpath)
+            _grids[toolpath] = weakref.ref(grid)
+        return grid
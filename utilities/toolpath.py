@@ -0,0 +1,296 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from array import array
+from typing import Iterable, Optional, Tuple, Dict, List
+
+import numpy as np
+
+from utilities.arcgeometry import ArcGeometry, arcGeometry, sweeps
+from utilities.gcodeparser import parseGCodeFile
+from utilities.types import Command, number
+
+# opcodes of the segments in a toolpath
+G0 = 0
+G1 = 1
+G2 = 2
+G3 = 3
+OPCODES = {'G0': G0, 'G1': G1, 'G2': G2, 'G3': G3}
+
+# where the machine ends up after G28 (reference drive)
+HOME_X = -0.9
+HOME_Y = 242.3
+
+# column name -> (array typecode, numpy dtype)
+COLUMNS = (
+    ('op', 'b', np.int8),
+    # resolved absolute start and end point of the segment
+    ('x0', 'd', np.float64),
+    ('y0', 'd', np.float64),
+    ('x1', 'd', np.float64),
+    ('y1', 'd', np.float64),
+    # arc center offsets and radius as given in the file, R is NaN if absent
+    ('i', 'd', np.float64),
+    ('j', 'd', np.float64),
+    ('r', 'd', np.float64),
+    # feed rate in effect in mm/min, NaN before the first F word
+    ('f', 'd', np.float64),
+    # line in the source file the segment was parsed from
+    ('line', 'q', np.int64),
+)
+
+
+# noinspection PyPep8Naming
+class Toolpath(object):
+    """
+    Column store of all G0 - G3 segments of a G Code program. Modal state
+    (G90/G91, G28) is already resolved, every segment knows its absolute
+    start and end point. Columns are read-only numpy arrays.
+    """
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 arcGeometry: ArcGeometry=None) -> None:
+        for name, _, _ in COLUMNS:
+            column = columns[name]
+            column.flags.writeable = False
+            setattr(self, name, column)
+        self._arcIndex = None
+        self._arcGeometry = arcGeometry
+
+    @classmethod
+    def fromCommands(cls, commands: Iterable[Command]) -> 'Toolpath':
+        builder = ToolpathBuilder()
+        for command in commands:
+            builder.addCommand(command)
+        return builder.build()
+
+    @classmethod
+    def fromFile(cls, filename: str) -> 'Toolpath':
+        return cls.fromCommands(parseGCodeFile(filename))
+
+    @classmethod
+    def empty(cls) -> 'Toolpath':
+        return cls({name: np.empty(0, dtype=dtype)
+                    for name, _, dtype in COLUMNS})
+
+    @classmethod
+    def concatenate(cls, toolpaths: List['Toolpath']) -> 'Toolpath':
+        if len(toolpaths) == 1:
+            return toolpaths[0]
+        if not toolpaths:
+            return cls.empty()
+        arcs = None
+        if all(toolpath._arcGeometry is not None for toolpath in toolpaths):
+            arcs = ArcGeometry(*(np.concatenate(columns) for columns in zip(
+                *(toolpath._arcGeometry for toolpath in toolpaths))))
+        return cls({name: np.concatenate([getattr(toolpath, name)
+                                          for toolpath in toolpaths])
+                    for name, _, _ in COLUMNS}, arcs)
+
+    def __len__(self) -> int:
+        return len(self.op)
+
+    def __getitem__(self, key: slice) -> 'Toolpath':
+        if not isinstance(key, slice):
+            raise TypeError('Toolpath only supports slicing')
+        arcs = None
+        start, stop, step = key.indices(len(self))
+        if self._arcGeometry is not None and step == 1:
+            # hand the already computed arcs of the slice along
+            first, last = np.searchsorted(self.arcIndex, (start, stop))
+            arcs = ArcGeometry(*(column[first:last]
+                                 for column in self._arcGeometry))
+        return Toolpath({name: getattr(self, name)[key]
+                         for name, _, _ in COLUMNS}, arcs)
+
+    @property
+    def segmentCount(self) -> int:
+        return len(self)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name, _, _ in COLUMNS}
+
+    @property
+    def arcIndex(self) -> np.ndarray:
+        """
+        Rows of the G2/G3 segments.
+        """
+        if self._arcIndex is None:
+            self._arcIndex = np.flatnonzero(self.op >= G2)
+        return self._arcIndex
+
+    def arcGeometry(self) -> ArcGeometry:
+        """
+        Geometry of the rows in arcIndex, computed once on first use.
+        """
+        if self._arcGeometry is None:
+            index = self.arcIndex
+            self._arcGeometry = arcGeometry(
+                self.op[index] == G2, self.x0[index], self.y0[index],
+                self.x1[index], self.y1[index], self.i[index],
+                self.j[index], self.r[index])
+        return self._arcGeometry
+
+    def changedRange(self, other: 'Toolpath') -> Optional[Tuple[int, int,
+                                                                int]]:
+        """
+        Smallest run of segments to replace to turn this toolpath into the
+        other one, as (start, stop here, stop in other), or None if both have
+        the same geometry. Line numbers are not compared.
+        """
+        count = min(len(self), len(other))
+
+        def equal(mine: slice, theirs: slice) -> np.ndarray:
+            same = np.ones(count, dtype=bool)
+            for name in ('op', 'x0', 'y0', 'x1', 'y1', 'i', 'j', 'r'):
+                a = getattr(self, name)[mine]
+                b = getattr(other, name)[theirs]
+                same &= (a == b) | ((a != a) & (b != b))
+            return same
+
+        head = equal(slice(0, count), slice(0, count))
+        start = int(np.argmin(head)) if not head.all() else count
+        if start == count and len(self) == len(other):
+            return None
+        tail = equal(slice(len(self) - count, len(self)),
+                     slice(len(other) - count, len(other)))[::-1]
+        end = int(np.argmin(tail)) if not tail.all() else count
+        # the common head and tail must not overlap
+        end = min(end, count - start)
+        return start, len(self) - end, len(other) - end
+
+    def segmentBounds(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                     np.ndarray]:
+        """
+        Bounding box of every segment as minX, minY, maxX and maxY columns.
+        Arcs reach out to the extremes of their circle they sweep over.
+        """
+        minX = np.minimum(self.x0, self.x1)
+        minY = np.minimum(self.y0, self.y1)
+        maxX = np.maximum(self.x0, self.x1)
+        maxY = np.maximum(self.y0, self.y1)
+        arcs = self.arcGeometry()
+        index = self.arcIndex
+        radius = np.abs(arcs.radius)
+        for angle, bounds, extreme in (
+                (0, maxX, arcs.cx + radius), (90, maxY, arcs.cy + radius),
+                (180, minX, arcs.cx - radius), (270, minY, arcs.cy - radius)):
+            swept = sweeps(arcs.startAngle, arcs.spanAngle, angle)
+            update = np.fmax if angle < 180 else np.fmin
+            bounds[index] = np.where(swept, update(bounds[index], extreme),
+                                     bounds[index])
+        return minX, minY, maxX, maxY
+
+    def boundingRect(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Returns (minX, minY, maxX, maxY) over all segments or None for an
+        empty toolpath.
+        """
+        if not len(self):
+            return None
+        minX, minY, maxX, maxY = self.segmentBounds()
+        return (float(np.nanmin(minX)), float(np.nanmin(minY)),
+                float(np.nanmax(maxX)), float(np.nanmax(maxY)))
+
+
+# noinspection PyPep8Naming
+class ToolpathBuilder(object):
+    """
+    Resolves commands into absolute segments in a single pass and appends
+    them to compact typed arrays.
+    """
+    def __init__(self) -> None:
+        self.relative = False
+        self.x = 0.0
+        self.y = 0.0
+        self.feed = float('nan')
+        self._arrays = None
+        self._op = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._arrays = {name: array(typecode)
+                        for name, typecode, _ in COLUMNS}
+        self._op = self._arrays['op']
+
+    def __len__(self) -> int:
+        return len(self._op)
+
+    def addCommand(self, command: Command) -> None:
+        cmd, args, line = command
+        x = self.x
+        y = self.y
+        if 'X' in args:
+            x = args['X'] + (x if self.relative else 0)
+        if 'Y' in args:
+            y = args['Y'] + (y if self.relative else 0)
+        if 'F' in args:
+            self.feed = args['F']
+        elif cmd[:1] == 'F':
+            # a line of its own like "F1000"
+            try:
+                self.feed = float(cmd[1:])
+            except ValueError:
+                pass
+        op = OPCODES.get(cmd)
+        if op is not None:
+            self.addSegment(op, x, y, args.get('I', 0.0), args.get('J', 0.0),
+                            args.get('R', float('nan')), line)
+            return
+        if cmd == 'G91':
+            self.relative = True
+        elif cmd == 'G90':
+            self.relative = False
+        elif cmd == 'G28':
+            # reference drive + general init
+            self.relative = False
+            x = HOME_X
+            y = HOME_Y
+        self.x = x
+        self.y = y
+
+    def addSegment(self, op: int, x: number, y: number, i: number,
+                   j: number, r: number, line: int=0) -> None:
+        arrays = self._arrays
+        self._op.append(op)
+        arrays['x0'].append(self.x)
+        arrays['y0'].append(self.y)
+        arrays['x1'].append(x)
+        arrays['y1'].append(y)
+        arrays['i'].append(i)
+        arrays['j'].append(j)
+        arrays['r'].append(r)
+        arrays['f'].append(self.feed)
+        arrays['line'].append(line)
+        self.x = x
+        self.y = y
+
+    def build(self) -> Toolpath:
+        """
+        Returns the segments added since the last call, without copying.
+        Modal state is kept, so parsing can continue afterwards.
+        """
+        arrays = self._arrays
+        self._reset()
+        return Toolpath({name: np.frombuffer(arrays[name], dtype=dtype)
+                         for name, _, dtype in COLUMNS})
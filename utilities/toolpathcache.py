@@ -0,0 +1,169 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from utilities import getCachePath
+from utilities.arcgeometry import ArcGeometry
+from utilities.toolpath import Toolpath
+
+# entry layout: magic, header length, JSON header padded to a multiple of 8,
+# then the raw columns, each padded to a multiple of 8 as well
+_MAGIC = b'QGVT0002'
+
+
+def contentHash(filename: str) -> str:
+    import hashlib  # not needed before the first lookup, keeps startup fast
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# noinspection PyPep8Naming
+class ToolpathCache(object):
+    """
+    Keeps resolved toolpaths, arc geometry included, on disk so reopening a
+    file skips parsing. Entries are found by file size, mtime and content
+    hash. Beyond maxBytes the least recently used ones are evicted.
+    """
+    DefaultMaxBytes = 1 << 30
+
+    def __init__(self, directory: str=None,
+                 maxBytes: int=DefaultMaxBytes) -> None:
+        self.directory = directory or getCachePath('toolpaths')
+        self.maxBytes = maxBytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._indexFile = os.path.join(self.directory, 'index.json')
+
+    def _readIndex(self) -> dict:
+        try:
+            with open(self._indexFile) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _writeIndex(self, index: dict) -> None:
+        self._atomicWrite(self._indexFile, json.dumps(index).encode())
+
+    def _atomicWrite(self, filename: str, *chunks: bytes) -> None:
+        import tempfile
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, filename)
+
+    def key(self, filename: str) -> str:
+        """
+        Content hash of the file, only recomputed when size or mtime changed
+        since it was last seen. Taken before reading the file, so a file
+        changing meanwhile is not stored under its new content.
+        """
+        stat = os.stat(filename)
+        path = os.path.abspath(filename)
+        index = self._readIndex()
+        known = index.get(path)
+        if known and known[0] == stat.st_size and \
+                known[1] == stat.st_mtime_ns:
+            return known[2]
+        key = '%s-%d' % (contentHash(filename), stat.st_size)
+        index[path] = [stat.st_size, stat.st_mtime_ns, key]
+        self._writeIndex(index)
+        return key
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.toolpath')
+
+    def lookup(self, key: str) -> Optional[Toolpath]:
+        entry = self._entry(key)
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            toolpath = self._decode(data)
+        except (ValueError, KeyError, TypeError):
+            # truncated or corrupt, a miss that is not worth keeping
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+            return None
+        # mark as recently used
+        os.utime(entry)
+        return toolpath
+
+    @staticmethod
+    def _decode(data: bytes) -> Toolpath:
+        if data[:8] != _MAGIC:
+            raise ValueError('not a toolpath cache entry')
+        headerLength = int.from_bytes(data[8:16], 'little')
+        header = json.loads(data[16:16 + headerLength].decode())
+        start = 16 + headerLength
+        arrays = {name: np.frombuffer(data, dtype=dtype, count=count,
+                                      offset=start + offset)
+                  for name, dtype, count, offset in header}
+        return Toolpath(arrays, ArcGeometry(
+            *(arrays['arc.' + name] for name in ArcGeometry._fields)))
+
+    def store(self, key: str, toolpath: Toolpath) -> None:
+        arrays = toolpath.columns()
+        for name, column in zip(ArcGeometry._fields, toolpath.arcGeometry()):
+            arrays['arc.' + name] = column
+        header = []
+        offset = 0
+        for name, column in arrays.items():
+            header.append([name, column.dtype.str, len(column), offset])
+            offset += -(-column.nbytes // 8) * 8
+        headerBytes = json.dumps(header).encode()
+        headerBytes += b' ' * (-len(headerBytes) % 8)
+        chunks = [_MAGIC, len(headerBytes).to_bytes(8, 'little'), headerBytes]
+        for column in arrays.values():
+            data = np.ascontiguousarray(column).tobytes()
+            chunks.append(data + bytes(-len(data) % 8))
+        self._atomicWrite(self._entry(key), *chunks)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.toolpath'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
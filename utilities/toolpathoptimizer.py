@@ -0,0 +1,372 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+import math
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utilities.gcodeparser import parseGCode
+from utilities.toolpath import Toolpath, G0, G2, G3
+
+# Runs of connected cuts, rows start:stop of a toolpath. Closed contours
+# end where they start.
+Contours = NamedTuple('Contours', [('starts', np.ndarray),
+                                   ('stops', np.ndarray),
+                                   ('closed', np.ndarray)])
+
+# commands that may be left out or moved around by reordering, anything
+# else between the cuts (tool changes, laser power, ...) is kept in place
+# and stops the optimiser
+REORDERABLE = {'G0', 'G1', 'G2', 'G3', 'G90', 'G91'}
+# contours a contour is compared with for 2-opt, in tour order
+TWO_OPT_WINDOW = 50
+TWO_OPT_PASSES = 5
+# mm an end point may miss the start point of a closed contour
+CLOSED_TOLERANCE = 1e-6
+
+
+def splitContours(toolpath: Toolpath) -> Contours:
+    """
+    Splits the cuts of a toolpath wherever a G0 or a jump is between them.
+    """
+    cut = np.flatnonzero(toolpath.op != G0)
+    if not len(cut):
+        empty = np.empty(0, dtype=np.int64)
+        return Contours(empty, empty, np.empty(0, dtype=bool))
+    # a cut continues the contour of the row right before it if it
+    # starts where that one ended
+    continues = np.zeros(len(cut), dtype=bool)
+    continues[1:] = (cut[1:] == cut[:-1] + 1) & \
+        (toolpath.x0[cut[1:]] == toolpath.x1[cut[:-1]]) & \
+        (toolpath.y0[cut[1:]] == toolpath.y1[cut[:-1]])
+    starts = cut[~continues]
+    stops = np.append(cut[np.flatnonzero(~continues)[1:] - 1], cut[-1]) + 1
+    closed = np.hypot(toolpath.x1[stops - 1] - toolpath.x0[starts],
+                      toolpath.y1[stops - 1] - toolpath.y0[starts]) <= \
+        CLOSED_TOLERANCE
+    return Contours(starts, stops, closed)
+
+
+# noinspection PyPep8Naming
+class _EndpointGrid(object):
+    """
+    Points contours can be entered at, bucketed into a uniform grid to find
+    the nearest one of the contours not taken yet.
+    """
+    def __init__(self, points: np.ndarray, owners: np.ndarray,
+                 count: int) -> None:
+        self.points = points.tolist()
+        self.owners = owners.tolist()
+        self.taken = [False] * count
+        self.origin = points.min(axis=0).tolist()
+        extent = float((points.max(axis=0) - points.min(axis=0)).max())
+        # about one point per cell
+        self.cellSize = max(extent / max(math.sqrt(len(points)), 1), 1e-9)
+        cells = np.floor((points - points.min(axis=0)) /
+                         self.cellSize).astype(np.int64)
+        self.columns = int(cells[:, 0].max()) + 1
+        self.rows = int(cells[:, 1].max()) + 1
+        self.cells = {}
+        for index, cell in enumerate(map(tuple, cells.tolist())):
+            self.cells.setdefault(cell, []).append(index)
+
+    def take(self, contour: int) -> None:
+        self.taken[contour] = True
+
+    def _closest(self, indexes: List[int], x: float, y: float,
+                 best: Tuple[float, Optional[int]]) -> Tuple[float,
+                                                             Optional[int]]:
+        for index in indexes:
+            if self.taken[self.owners[index]]:
+                continue
+            px, py = self.points[index]
+            distance = math.hypot(px - x, py - y)
+            if distance < best[0]:
+                best = distance, index
+        return best
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        """
+        Index of the closest point of a contour not taken yet.
+        """
+        column = min(max(int((x - self.origin[0]) / self.cellSize), 0),
+                     self.columns - 1)
+        row = min(max(int((y - self.origin[1]) / self.cellSize), 0),
+                  self.rows - 1)
+        best = math.inf, None
+        ring = 0
+        while True:
+            if 8 * ring >= len(self.cells):
+                # the ring is larger than what is left, look at all of it
+                for cell in list(self.cells):
+                    best = self._closest(self._prune(cell), x, y, best)
+                return best[1]
+            for cell in self._ring(column, row, ring):
+                if cell in self.cells:
+                    best = self._closest(self._prune(cell), x, y, best)
+            # points further out are at least ring cells away
+            if best[1] is not None and best[0] <= ring * self.cellSize:
+                return best[1]
+            ring += 1
+
+    def _prune(self, cell: Tuple[int, int]) -> List[int]:
+        indexes = [index for index in self.cells[cell]
+                   if not self.taken[self.owners[index]]]
+        if indexes:
+            self.cells[cell] = indexes
+        else:
+            del self.cells[cell]
+        return indexes
+
+    @staticmethod
+    def _ring(column: int, row: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if not ring:
+            yield column, row
+            return
+        for offset in range(-ring, ring + 1):
+            yield column + offset, row - ring
+            yield column + offset, row + ring
+        for offset in range(-ring + 1, ring):
+            yield column - ring, row + offset
+            yield column + ring, row + offset
+
+
+def _nearestNeighbour(starts: np.ndarray, ends: np.ndarray,
+                      reversible: np.ndarray, free: np.ndarray,
+                      position: Tuple[float, float]) -> Tuple[np.ndarray,
+                                                              np.ndarray]:
+    # every free contour can be entered at its start, reversible ones also
+    # at their end
+    owners = np.concatenate((free, free[reversible[free]]))
+    points = np.concatenate((starts[free], ends[free[reversible[free]]]))
+    entersAtEnd = np.arange(len(owners)) >= len(free)
+    grid = _EndpointGrid(points, owners, len(starts))
+    order = []
+    reversed_ = []
+    x, y = position
+    for _ in range(len(free)):
+        index = grid.nearest(x, y)
+        contour = int(owners[index])
+        grid.take(contour)
+        order.append(contour)
+        reversed_.append(bool(entersAtEnd[index]))
+        x, y = (starts if entersAtEnd[index] else ends)[contour].tolist()
+    return np.array(order, dtype=np.int64), np.array(reversed_, dtype=bool)
+
+
+def _twoOpt(entries: np.ndarray, exits: np.ndarray, isOpen: np.ndarray,
+            order: np.ndarray, reversed_: np.ndarray,
+            position: Tuple[float, float], tail: Optional[np.ndarray],
+            reverse: bool) -> None:
+    """
+    Reverses runs of the tour in place where that shortens the rapids,
+    comparing each contour with the next TWO_OPT_WINDOW ones. Reversing a
+    run reverses the open contours in it.
+    """
+    count = len(order)
+    start = np.array(position, dtype=np.float64)
+    for _ in range(TWO_OPT_PASSES):
+        improved = False
+        for i in range(count):
+            j = np.arange(i, min(i + TWO_OPT_WINDOW, count))
+            previous = exits[i - 1] if i else start
+            following = np.empty((len(j), 2))
+            following[:-1] = entries[j[:-1] + 1]
+            following[-1] = entries[j[-1] + 1] if j[-1] + 1 < count else \
+                (tail if tail is not None else np.nan)
+            linked = ~np.isnan(following[:, 0])
+            gains = np.hypot(*(previous - entries[i])) - \
+                np.hypot(*(previous - exits[j]).T)
+            gains[linked] += np.hypot(*(exits[j] - following).T)[linked] - \
+                np.hypot(*(entries[i] - following).T)[linked]
+            if not reverse:
+                # open contours would have to be cut the other way round
+                gains[np.cumsum(isOpen[j]) > 0] = 0
+            best = int(np.argmax(gains))
+            if gains[best] <= 1e-9:
+                continue
+            run = slice(i, j[best] + 1)
+            entries[run], exits[run] = \
+                exits[run][::-1].copy(), entries[run][::-1].copy()
+            order[run] = order[run][::-1].copy()
+            isOpen[run] = isOpen[run][::-1].copy()
+            reversed_[run] = reversed_[run][::-1] ^ isOpen[run]
+            improved = True
+        if not improved:
+            break
+
+
+def optimizeOrder(toolpath: Toolpath, contours: Contours,
+                  reverse: bool=True,
+                  keepLast: bool=True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Order of the contours, and whether each is cut backwards, that keeps
+    the rapids short: nearest neighbour from where the toolpath starts,
+    improved by 2-opt. With keepLast the last contour, usually the frame
+    cut free at the end, stays last and as it is.
+    """
+    count = len(contours.starts)
+    if not count:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+    starts = np.column_stack((toolpath.x0[contours.starts],
+                              toolpath.y0[contours.starts]))
+    ends = np.column_stack((toolpath.x1[contours.stops - 1],
+                            toolpath.y1[contours.stops - 1]))
+    isOpen = ~contours.closed
+    free = np.arange(count - 1 if keepLast else count)
+    position = float(toolpath.x0[0]), float(toolpath.y0[0])
+    order, reversed_ = np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+    if len(free):
+        order, reversed_ = _nearestNeighbour(starts, ends, isOpen & reverse,
+                                             free, position)
+        entries = np.where(reversed_[:, None], ends[order], starts[order])
+        exits = np.where(reversed_[:, None], starts[order], ends[order])
+        _twoOpt(entries, exits, isOpen[order], order, reversed_, position,
+                starts[-1] if keepLast else None, reverse)
+    if keepLast:
+        order = np.append(order, count - 1)
+        reversed_ = np.append(reversed_, False)
+    return order, reversed_
+
+
+def reorderToolpath(toolpath: Toolpath, contours: Contours,
+                    order: np.ndarray, reversed_: np.ndarray) -> Toolpath:
+    """
+    The contours in the given order and direction, joined by G0 moves.
+    Reversed arcs turn the other way, around their center given by I and J.
+    """
+    lengths = contours.stops[order] - contours.starts[order]
+    offsets = np.cumsum(lengths) - lengths
+    # k-th segment of each contour, counted from its end if reversed
+    within = np.arange(int(lengths.sum())) - np.repeat(offsets, lengths)
+    flip = np.repeat(reversed_, lengths)
+    rows = np.repeat(contours.starts[order], lengths) + \
+        np.where(flip, np.repeat(lengths, lengths) - 1 - within, within)
+
+    op = toolpath.op[rows].copy()
+    x0 = np.where(flip, toolpath.x1[rows], toolpath.x0[rows])
+    y0 = np.where(flip, toolpath.y1[rows], toolpath.y0[rows])
+    x1 = np.where(flip, toolpath.x0[rows], toolpath.x1[rows])
+    y1 = np.where(flip, toolpath.y0[rows], toolpath.y1[rows])
+    i = toolpath.i[rows].copy()
+    j = toolpath.j[rows].copy()
+    arcs = flip & (op >= G2)
+    op[arcs] = G2 + G3 - op[arcs]
+    # R form arcs are the same arc both ways, I and J are from the start
+    centered = arcs & ((i != 0) | (j != 0))
+    i[centered] += x1[centered] - x0[centered]
+    j[centered] += y1[centered] - y0[centered]
+    cuts = {'op': op, 'x0': x0, 'y0': y0, 'x1': x1, 'y1': y1, 'i': i,
+            'j': j, 'r': toolpath.r[rows], 'f': toolpath.f[rows],
+            'line': toolpath.line[rows]}
+
+    # a G0 to the first point of every contour not started from right there
+    previousX = np.append(toolpath.x0[0], x1[offsets[1:] - 1])
+    previousY = np.append(toolpath.y0[0], y1[offsets[1:] - 1])
+    jumps = (previousX != x0[offsets]) | (previousY != y0[offsets])
+    at = offsets[jumps]
+    moves = {'op': np.full(len(at), G0, dtype=np.int8),
+             'x0': previousX[jumps], 'y0': previousY[jumps],
+             'x1': x0[at], 'y1': y0[at], 'i': np.zeros(len(at)),
+             'j': np.zeros(len(at)), 'r': np.full(len(at), np.nan),
+             'f': cuts['f'][at], 'line': cuts['line'][at]}
+    return Toolpath({name: np.insert(cuts[name], at, moves[name])
+                     for name in cuts})
+
+
+def formatToolpath(toolpath: Toolpath, feed: float=math.nan) -> Iterator[str]:
+    """
+    G Code lines of the toolpath in absolute coordinates. An F word is put
+    before every cut whose feed differs from the one in effect.
+    """
+    columns = [column.tolist() for column in (
+        toolpath.op, toolpath.x1, toolpath.y1, toolpath.i, toolpath.j,
+        toolpath.r, toolpath.f)]
+    for op, x, y, i, j, r, f in zip(*columns):
+        if op != G0 and f == f and f != feed:
+            feed = f
+            yield 'F%g' % f
+        if op < G2:
+            yield 'G%d X%f Y%f' % (op, x, y)
+        elif i == 0 and j == 0 and r == r:
+            yield 'G%d X%f Y%f R%f' % (op, x, y, r)
+        else:
+            yield 'G%d X%f Y%f I%f J%f' % (op, x, y, i, j)
+
+
+def optimizeProgram(lines: Iterable[str], reverse: bool=True,
+                    keepLast: bool=True) -> Tuple[List[str], Toolpath,
+                                                  Toolpath]:
+    """
+    Reorders the cuts of a G Code program for short rapids. Returns the
+    new program and the toolpaths from the first to the last cut before
+    and after. Everything before the first and after the last cut is kept
+    as it is, a command between them that is not a move or a G90/G91
+    raises a ValueError.
+    """
+    lines = [line.rstrip('\r\n') for line in lines]
+    commands = list(parseGCode(lines))
+    toolpath = Toolpath.fromCommands(commands)
+    cut = np.flatnonzero(toolpath.op != G0)
+    if not len(cut):
+        return lines, toolpath, toolpath
+    firstLine = int(toolpath.line[0])
+    lastLine = int(toolpath.line[cut[-1]])
+    relative = False
+    # the mode the kept lines before the first move leave
+    relativeBefore = False
+    for command in commands:
+        if command.line == firstLine:
+            relativeBefore = relative
+        if command.line >= lastLine:
+            break
+        if command.cmd in ('G90', 'G28'):
+            relative = False
+        elif command.cmd == 'G91':
+            relative = True
+        if command.line > firstLine and command.cmd not in REORDERABLE \
+                and not command.cmd.startswith('F'):
+            raise ValueError('%s in line %d, between the cuts, would move '
+                             'with them' % (command.cmd, command.line))
+    before = toolpath[:int(cut[-1]) + 1]
+    contours = splitContours(before)
+    order, reversed_ = optimizeOrder(before, contours, reverse, keepLast)
+    after = reorderToolpath(before, contours, order, reversed_)
+    # the feed in effect from the lines kept before the first cut, the
+    # formatted moves are absolute
+    program = lines[:firstLine - 1]
+    if relativeBefore:
+        program.append('G90')
+    program += formatToolpath(after, float(toolpath.f[0]))
+    feed = float(toolpath.f[cut[-1]])
+    if feed == feed and feed != float(after.f[-1]):
+        # what follows expects the feed of the cut that was last
+        program.append('F%g' % feed)
+    if relative:
+        program.append('G91')
+    program += lines[lastLine:]
+    return program, before, after
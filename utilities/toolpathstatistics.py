@@ -0,0 +1,113 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utilities.toolpath import Toolpath, G0
+
+# mm/min the machine moves with on G0, F words only apply to cuts
+DEFAULT_RAPID_RATE = 3000.0
+
+# Lengths in mm, times in seconds. Cuts before the first F word have no
+# known feed rate, their length is counted in untimedLength instead.
+Statistics = NamedTuple('Statistics', [
+    ('segments', int),
+    ('cutLength', float),
+    ('rapidLength', float),
+    ('arcLength', float),
+    ('boundingRect', Optional[Tuple[float, float, float, float]]),
+    ('cutTime', float),
+    ('rapidTime', float),
+    ('totalTime', float),
+    ('untimedLength', float)])
+
+
+def segmentLengths(toolpath: Toolpath) -> np.ndarray:
+    lengths = np.hypot(toolpath.x1 - toolpath.x0, toolpath.y1 - toolpath.y0)
+    arcs = toolpath.arcGeometry()
+    lengths[toolpath.arcIndex] = np.abs(arcs.radius) * \
+        np.radians(np.abs(arcs.spanAngle))
+    return lengths
+
+
+def segmentTimes(toolpath: Toolpath, rapidRate: float=DEFAULT_RAPID_RATE,
+                 untimedRate: float=0.0) -> np.ndarray:
+    """
+    Seconds every segment takes. Cuts without a feed rate move with
+    untimedRate, with 0 they take no time like in toolpathStatistics.
+    """
+    lengths = np.nan_to_num(segmentLengths(toolpath))
+    cut = toolpath.op != G0
+    with np.errstate(invalid='ignore'):
+        rates = np.where(cut & (toolpath.f > 0), toolpath.f, untimedRate)
+    rates[~cut] = rapidRate
+    times = np.zeros(len(toolpath))
+    moving = rates > 0
+    times[moving] = lengths[moving] / rates[moving] * 60
+    return times
+
+
+def toolpathStatistics(toolpath: Toolpath,
+                       rapidRate: float=DEFAULT_RAPID_RATE) -> Statistics:
+    lengths = segmentLengths(toolpath)
+    cut = toolpath.op != G0
+    feed = toolpath.f
+    with np.errstate(invalid='ignore'):
+        timed = cut & (feed > 0)
+    cutLength = float(np.nansum(lengths[cut]))
+    rapidLength = float(np.nansum(lengths[~cut]))
+    # F is per minute
+    cutTime = float(np.nansum(lengths[timed] / feed[timed])) * 60
+    rapidTime = rapidLength / rapidRate * 60
+    return Statistics(
+        len(toolpath), cutLength, rapidLength,
+        float(np.nansum(lengths[toolpath.arcIndex])),
+        toolpath.boundingRect(), cutTime, rapidTime, cutTime + rapidTime,
+        float(np.nansum(lengths[cut & ~timed])))
+
+
+def formatDuration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return '%d:%02d:%02d' % (hours, minutes, seconds)
+
+
+def formatStatistics(statistics: Statistics) -> str:
+    lines = ['Segments:       %d' % statistics.segments,
+             'Cut length:     %.1f mm' % statistics.cutLength,
+             '  of it arcs:   %.1f mm' % statistics.arcLength,
+             'Rapid length:   %.1f mm' % statistics.rapidLength]
+    if statistics.boundingRect is not None:
+        lines.append('Bounding box:   X %.1f to %.1f, Y %.1f to %.1f' % (
+            statistics.boundingRect[0], statistics.boundingRect[2],
+            statistics.boundingRect[1], statistics.boundingRect[3]))
+    lines += ['Cut time:       %s' % formatDuration(statistics.cutTime),
+              'Rapid time:     %s' % formatDuration(statistics.rapidTime),
+              'Estimated time: %s' % formatDuration(statistics.totalTime)]
+    if statistics.untimedLength:
+        lines.append('Without feed:   %.1f mm, not in the time' %
+                     statistics.untimedLength)
+    return '\n'.join(lines)
@@ -0,0 +1,67 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import threading
+import weakref
+from typing import Optional, Tuple
+
+from utilities.toolpath import Toolpath
+
+StoreKey = Tuple[str, int, int]
+
+
+# noinspection PyPep8Naming
+class ToolpathStore(object):
+    """
+    Toolpaths of the files open in any document, kept as long as one of them
+    still shows it. Toolpaths are read-only, documents of the same file draw
+    from the same columns and arc geometry instead of parsing it again.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._toolpaths = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def key(filename: str) -> StoreKey:
+        """
+        Identifies the file as it is now, a changed file gets a new key.
+        """
+        stat = os.stat(filename)
+        return os.path.realpath(filename), stat.st_size, stat.st_mtime_ns
+
+    def lookup(self, key: StoreKey) -> Optional[Toolpath]:
+        with self._lock:
+            return self._toolpaths.get(key)
+
+    def store(self, key: StoreKey, toolpath: Toolpath) -> Toolpath:
+        """
+        Keeps toolpath for key, unless another loader was faster. Returns the
+        toolpath to use.
+        """
+        with self._lock:
+            return self._toolpaths.setdefault(key, toolpath)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._toolpaths)
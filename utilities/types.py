@@ -22,7 +22,12 @@
 # SOFTWARE.
 
 
-from typing import Union, Tuple, Dict
+from typing import Union, Tuple, Dict, NamedTuple
 
 number = Union[int, float]
 GCode = Tuple[str, Dict[str, number]]
+# A parsed G Code line. Indexes like GCode ([0] is the command, [1] the args)
+# and additionally carries the 1-based line number in the source file.
+Command = NamedTuple('Command', [('cmd', str),
+                                 ('args', Dict[str, number]),
+                                 ('line', int)])
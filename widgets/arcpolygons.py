@@ -0,0 +1,60 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import math
+from functools import lru_cache
+
+from PyQt5.QtGui import QPainter, QPolygonF
+
+from utilities.arcgeometry import arcPoints
+from widgets.polygonarrays import arrayToPolygon
+
+# distinct arcs kept flattened, about 1 KB each
+ArcCacheSize = 8192
+# pixels a chord may be away from its arc
+PixelTolerance = 0.25
+
+
+# noinspection PyPep8Naming
+@lru_cache(maxsize=ArcCacheSize)
+def arcPolygon(radius: float, startAngle: int, spanAngle: int,
+               tolerance: float) -> QPolygonF:
+    """
+    The flattened arc around the origin, angles in 1/16 degrees like Qt's.
+    Identical arcs share the polygon and only translate it, so flattening
+    costs once per distinct arc and tolerance. Do not modify the result.
+    """
+    return arrayToPolygon(arcPoints(radius, -startAngle / 16,
+                                    spanAngle / 16, tolerance))
+
+
+# noinspection PyPep8Naming
+def arcTolerance(painter: QPainter) -> float:
+    """
+    PixelTolerance in item coordinates, rounded down to a power of two so
+    that zooming only needs a new polygon every factor of two.
+    """
+    transform = painter.worldTransform()
+    scale = math.sqrt(abs(transform.determinant())) or 1
+    return 2.0 ** math.floor(math.log2(PixelTolerance / scale))
@@ -0,0 +1,176 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from typing import List
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QBrush, QPainter, QPaintEvent
+from PyQt5.QtWidgets import QGraphicsView, QWidget
+
+from utilities.toolpath import Toolpath
+from widgets.rasterlayer import RasterLayer
+from widgets.toolpathscene import ToolpathScene
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class Document(QGraphicsView):
+    """
+    A tab of the main window: a view with its own scene, showing one G Code
+    file. Documents of the same file share its toolpath, not their items.
+    With a raster layer, panning and zooming blits tiles and the items are
+    painted once the view settled.
+    """
+    # ms without panning or zooming after which the items are painted again
+    SettleDelay = 250
+    # bytes of G Code per segment, to guess the segments of a file
+    BytesPerSegment = 24
+
+    def __init__(self, parent: QWidget=None) -> None:
+        super(Document, self).__init__(parent)
+        # set up first, scrollContentsBy is called from here on
+        self.rasterLayer = None  # type: RasterLayer
+        self.interacting = False
+        self.settleTimer = QTimer(self)
+        self.settleTimer.setSingleShot(True)
+        self.settleTimer.setInterval(Document.SettleDelay)
+        # noinspection PyUnresolvedReferences
+        self.settleTimer.timeout.connect(self.settle)
+        self.toolpathScene = ToolpathScene(self)
+        self.setScene(self.toolpathScene)
+        self.scale(1, -1)
+        self.setBackgroundBrush(QBrush(Qt.lightGray))
+        self.viewport().setMouseTracking(True)
+        self.zoomFactor = 1
+        self.filename = None  # type: str
+        # title of a toolpath shown without a file
+        self.name = None  # type: str
+        # the toolpath as loaded in batches, merged into one when done
+        self.batches = []  # type: List[Toolpath]
+
+    @property
+    def title(self) -> str:
+        if self.filename is None:
+            return self.name or 'Untitled'
+        return os.path.basename(self.filename)
+
+    @property
+    def toolpath(self) -> Toolpath:
+        return Toolpath.concatenate(self.batches)
+
+    def setFile(self, filename: str=None) -> None:
+        self.filename = filename
+        self.name = None
+        self.batches = []
+        self.setToolTip(filename or '')
+
+    def expectFile(self, filename: str) -> None:
+        """
+        Prepares the scene for the segments of filename, before its
+        batches are added.
+        """
+        try:
+            size = os.path.getsize(filename)
+        except OSError:
+            # the loader reports it
+            return
+        self.toolpathScene.expectSegments(size // Document.BytesPerSegment)
+
+    def addBatch(self, toolpath: Toolpath) -> None:
+        self.batches.append(toolpath)
+        self.toolpathScene.addToolpath(toolpath)
+
+    def mergeBatches(self, toolpath: Toolpath) -> None:
+        """
+        Swaps the loaded batches for toolpath holding the same segments,
+        usually the one shared with other documents of the file.
+        """
+        self.toolpathScene.mergeToolpaths(self.batches, toolpath)
+        self.batches = [toolpath]
+
+    def release(self) -> None:
+        """
+        Deletes the items now rather than whenever Qt deletes the document.
+        """
+        self.setRasterEnabled(False)
+        self.setFile(None)
+        self.toolpathScene.reset()
+
+    def zoom(self, factor: float) -> None:
+        self.interact()
+        self.scale(factor, factor)
+        self.zoomFactor *= factor
+
+    def setRasterEnabled(self, enabled: bool) -> None:
+        if enabled and self.rasterLayer is None:
+            self.rasterLayer = RasterLayer(self)
+            # noinspection PyUnresolvedReferences
+            self.rasterLayer.updated.connect(self.rasterUpdated)
+        elif not enabled and self.rasterLayer is not None:
+            self.rasterLayer.clear()
+            self.rasterLayer.deleteLater()
+            self.rasterLayer = None
+            self.settle()
+
+    def interact(self) -> None:
+        if self.rasterLayer is not None:
+            self.interacting = True
+            self.settleTimer.start()
+
+    def settle(self) -> None:
+        self.settleTimer.stop()
+        if self.interacting:
+            self.interacting = False
+            self.viewport().update()
+
+    def rasterUpdated(self) -> None:
+        if self.interacting:
+            self.viewport().update()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        self.interact()
+        super(Document, self).scrollContentsBy(dx, dy)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        if not self.interacting or not self._paintRaster(event):
+            super(Document, self).paintEvent(event)
+
+    def _paintRaster(self, event: QPaintEvent) -> bool:
+        scene = self.toolpathScene
+        # not while loading, every batch would start over
+        if len(self.batches) != 1:
+            return False
+        self.rasterLayer.setSource(
+            scene.spatialIndex, scene.cutPen,
+            scene.movePen if scene.showMovement else None)
+        transform = self.viewportTransform()
+        rect = self.mapToScene(event.rect()).boundingRect()
+        painter = QPainter(self.viewport())
+        painter.setTransform(transform)
+        self.drawBackground(painter, rect)
+        painter.fillRect(ToolpathScene.MaterialRect, Qt.white)
+        painter.resetTransform()
+        painted = self.rasterLayer.paint(painter, transform, rect)
+        painter.end()
+        return painted
@@ -0,0 +1,148 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import os
+
+from PyQt5.QtCore import QThread, QObject, pyqtSignal
+
+from utilities.gcodereader import GCodeReader
+from utilities.profiler import profiler
+from utilities.repeatedshapes import repeatedShapes
+from utilities.toolpath import Toolpath
+from utilities.toolpathcache import ToolpathCache
+from utilities.toolpathstore import ToolpathStore
+from widgets.toolpathscene import ToolpathScene
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class GCodeLoaderThread(QThread):
+    """
+    Parses a G Code file and computes its geometry off the GUI thread,
+    handing back the toolpath in batches as they are ready.
+    """
+    # emitted with a Toolpath holding the next segments
+    batchReady = pyqtSignal(object)
+    # emitted with the share of the file parsed so far, 0 - 100
+    progress = pyqtSignal(int)
+    # emitted with the reason loading ended early, not when interrupted
+    failed = pyqtSignal(str)
+
+    # upper bound for the segments the GUI thread adds in one go
+    MaxBatchSize = 16384
+
+    def __init__(self, filename: str, cache: ToolpathCache=None,
+                 parent: QObject=None, store: ToolpathStore=None) -> None:
+        super(GCodeLoaderThread, self).__init__(parent)
+        self.filename = filename
+        self.cache = cache
+        self.cacheHit = False
+        self.store = store
+        # the file is already open in another document
+        self.shared = False
+        # all segments in one toolpath once loading finished
+        self.toolpath = None  # type: Toolpath
+        self.segmentCount = 0
+        # why loading failed, None if it did not
+        self.error = None  # type: str
+        self.reader = GCodeReader(filename)
+        self._fileSize = 1
+
+    def run(self) -> None:
+        with profiler.profiled():
+            try:
+                self._load()
+            except Exception as e:
+                # escaping run() it would abort the application, the file
+                # may be gone or unreadable by now
+                self.error = str(e) or type(e).__name__
+                # noinspection PyUnresolvedReferences
+                self.failed.emit(self.error)
+
+    def _load(self) -> None:
+        self._fileSize = max(os.path.getsize(self.filename), 1)
+        key = None
+        if self.store is not None:
+            # taken before reading, a file changing meanwhile gets a new key
+            key = self.store.key(self.filename)
+            toolpath = self.store.lookup(key)
+            if toolpath is not None:
+                self.shared = True
+                self._emitWhole(toolpath)
+                return
+        cacheKey = None
+        if self.cache is not None:
+            with profiler.stage('cacheLookup'):
+                cacheKey = self.cache.key(self.filename)
+                toolpath = self.cache.lookup(cacheKey)
+            if toolpath is not None:
+                self.cacheHit = True
+                if self._emitWhole(toolpath) and key is not None:
+                    self.toolpath = self.store.store(key, toolpath)
+                return
+        batches = []
+        for toolpath in self.reader.batches():
+            batches.append(toolpath)
+            if not self._emitBatches(toolpath):
+                return
+        # batches carry their arcs, so does the result
+        self.toolpath = Toolpath.concatenate(batches)
+        # not if the file changed while it was read, the toolpath might be
+        # of either content
+        if cacheKey is not None and cacheKey == self.cache.key(self.filename):
+            with profiler.stage('cacheStore'):
+                self.cache.store(cacheKey, self.toolpath)
+        if key is not None:
+            self.toolpath = self.store.store(key, self.toolpath)
+
+    def _emitWhole(self, toolpath: Toolpath) -> bool:
+        self.reader.bytesRead = self._fileSize
+        self.toolpath = toolpath
+        return self._emitBatches(toolpath)
+
+    def _emitBatches(self, toolpath: Toolpath) -> bool:
+        # once for the whole toolpath, the batches are slices of it
+        with profiler.stage('arcGeometry'):
+            toolpath.arcGeometry()
+        for start in range(0, len(toolpath), GCodeLoaderThread.MaxBatchSize):
+            if self.isInterruptionRequested():
+                return False
+            self._emitBatch(
+                toolpath[start:start + GCodeLoaderThread.MaxBatchSize])
+        return True
+
+    def _emitBatch(self, toolpath: Toolpath) -> None:
+        # arc geometry is kept by the toolpath, do the math here
+        with profiler.stage('arcGeometry'):
+            toolpath.arcGeometry()
+        # cached for the scene, which instances these in batched mode
+        if ToolpathScene.InstanceShapes:
+            with profiler.stage('repeatedShapes'):
+                repeatedShapes(toolpath)
+        self.segmentCount += len(toolpath)
+        # noinspection PyUnresolvedReferences
+        self.batchReady.emit(toolpath)
+        # noinspection PyUnresolvedReferences
+        self.progress.emit(
+            min(100, self.reader.bytesRead * 100 // self._fileSize))
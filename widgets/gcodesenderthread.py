@@ -0,0 +1,98 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+import time
+from typing import Iterable
+
+from PyQt5.QtCore import QThread, QObject, pyqtSignal
+
+from utilities.gcodesender import GCodeSender, SerialPort, ControllerError
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class GCodeSenderThread(QThread):
+    """
+    Streams G Code to a controller off the GUI thread, reporting how far
+    it got at most every UpdateInterval seconds.
+    """
+    # emitted with the last acknowledged line number and the lines per
+    # second so far
+    progress = pyqtSignal(int, float)
+    # emitted with the tool position of the latest status report
+    position = pyqtSignal(float, float)
+    # emitted with the reason sending ended early, not when stopped
+    failed = pyqtSignal(str)
+
+    UpdateInterval = 0.05
+
+    def __init__(self, port: str, lines: Iterable[str], baudRate: int,
+                 parent: QObject=None) -> None:
+        super(GCodeSenderThread, self).__init__(parent)
+        self.port = port
+        self.lines = lines
+        self.baudRate = baudRate
+        self.sender = None  # type: GCodeSender
+        # all lines sent and acknowledged
+        self.completed = False
+        self._lastUpdate = 0.0
+
+    def stop(self) -> None:
+        self.requestInterruption()
+        if self.sender is not None:
+            self.sender.stop()
+
+    def run(self) -> None:
+        try:
+            port = SerialPort(self.port, self.baudRate)
+        except (OSError, ValueError) as e:
+            # noinspection PyUnresolvedReferences
+            self.failed.emit(str(e))
+            return
+        self.sender = GCodeSender(port, self.lines, listener=self._update)
+        # stopped before the sender existed
+        if self.isInterruptionRequested():
+            self.sender.stop()
+        try:
+            self.completed = self.sender.run()
+        except (ControllerError, ValueError, OSError) as e:
+            # noinspection PyUnresolvedReferences
+            self.failed.emit(str(e))
+        finally:
+            port.close()
+        self._emit(self.sender)
+
+    def _update(self, sender: GCodeSender) -> None:
+        # thousands of lines a second would flood the GUI thread
+        if time.perf_counter() - self._lastUpdate >= self.UpdateInterval:
+            self._emit(sender)
+
+    def _emit(self, sender: GCodeSender) -> None:
+        self._lastUpdate = time.perf_counter()
+        # noinspection PyUnresolvedReferences
+        self.progress.emit(sender.lineNumber, sender.linesPerSecond)
+        if sender.position is not None:
+            # noinspection PyUnresolvedReferences
+            self.position.emit(*sender.position)
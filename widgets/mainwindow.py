@@ -22,34 +22,52 @@
 # SOFTWARE.
 
 import os
-import math
-from typing import List
+import time
+from typing import List, Set
 
-from PyQt5 import uic
-from PyQt5.QtCore import QRectF, QLineF, Qt
-from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsScene,\
-    QFileDialog, QMessageBox, QInputDialog, QWidget, QGraphicsItem,\
-    QCheckBox, QColorDialog, QGraphicsView
-from PyQt5.QtGui import QColor, QPainter, QPageLayout, QPen, QBrush
-from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
+import numpy as np
+from PyQt5.QtCore import Qt, QEvent, QObject, QTimer,\
+    QFileSystemWatcher, QPoint
+from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog,\
+    QMessageBox, QInputDialog, QWidget, QCheckBox, QColorDialog,\
+    QGraphicsView, QAction, QActionGroup, QProgressBar, QLabel
+from PyQt5.QtGui import QColor, QPainter, QPageLayout, QCloseEvent
 
 from utilities import getResourcesPath
-from utilities.types import number, GCode
-from widgets.penwidthsettable import PenWidthSettable
-from widgets.qgraphicsarcitem import QGraphicsArcItem
-from widgets.qgraphicscoloredlineitem import QGraphicsColoredLineItem
-from widgets.qgraphicsmovementlineitem import QGraphicsMovementLineItem
+from utilities.profiler import profiler
+from utilities.toolpath import Toolpath
+from utilities.toolpathcache import ToolpathCache
+from utilities.toolpathstore import ToolpathStore
+from utilities.types import number
+from widgets.document import Document
+from widgets.gcodeloaderthread import GCodeLoaderThread
+from widgets.gcodesenderthread import GCodeSenderThread
+from widgets.playbackbar import PlaybackBar
+from widgets.profilerdock import ProfilerDock
+from widgets.statisticsdock import StatisticsDock
+from widgets.toolpathscene import ToolpathScene
+from widgets.uiloader import loadUi
 
 
 # because Qt:
 # noinspection PyPep8Naming
 class MainWindow(QMainWindow):
+    # pixels the cursor may be away from a segment to hover it
+    HoverDistance = 4
+    SenderBaudRate = 115200
+
     def __init__(self, parent: QWidget=None) -> None:
         super(MainWindow, self).__init__(parent)
-        uic.loadUi(os.path.join(getResourcesPath(), 'ui', 'mainwindow.ui'),
-                   self)
+        loadUi(os.path.join(getResourcesPath(), 'ui', 'mainwindow.ui'), self)
         self.actionExit.triggered.connect(QApplication.quit)
         self.actionLoad_G_Code.triggered.connect(self.askGCodeFile)
+        self.actionCancelLoading.triggered.connect(self.cancelLoading)
+        self.actionNewTab.triggered.connect(self.newDocument)
+        self.actionCloseTab.triggered.connect(self.actionCloseTabSlot)
+        # noinspection PyUnresolvedReferences
+        self.tabWidget.tabCloseRequested.connect(self.closeDocument)
+        # noinspection PyUnresolvedReferences
+        self.tabWidget.currentChanged.connect(self.documentChanged)
         self.actionPrint.triggered.connect(self.actionPrintSlot)
         self.actionClear.triggered.connect(self.actionClearSlot)
         self.actionZoomIn.triggered.connect(self.zoomIn)
@@ -67,43 +85,121 @@ class MainWindow(QMainWindow):
                                   self.checkBoxActionShowMovement)
         self.actionSetMoveLineColor.triggered.connect(
             self.actionSetMoveLineColorSlot)
+        self.renderModeGroup = QActionGroup(self)
+        self.renderModeGroup.addAction(self.actionRenderPerItem)
+        self.renderModeGroup.addAction(self.actionRenderBatched)
+        # noinspection PyUnresolvedReferences
+        self.renderModeGroup.triggered.connect(self.actionRenderModeSlot)
+        self.actionRasterTiles.toggled.connect(self.actionRasterTilesSlot)
+
+        self.progressBar = QProgressBar(self.statusBar)
+        self.progressBar.setMaximumWidth(200)
+        self.progressBar.hide()
+        self.statusBar.addPermanentWidget(self.progressBar)
+
+        self.hoverLabel = QLabel(self.statusBar)
+        self.statusBar.addPermanentWidget(self.hoverLabel)
+
+        self.statisticsDock = StatisticsDock(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.statisticsDock)
+        self.menuEdit.addAction(self.statisticsDock.toggleViewAction())
+
+        self.playbackBar = PlaybackBar(self)
+        self.addToolBar(Qt.BottomToolBarArea, self.playbackBar)
+        self.playbackBar.hide()
+        self.menuEdit.addAction(self.playbackBar.toggleViewAction())
+        # noinspection PyUnresolvedReferences
+        self.statisticsDock.rapidRate.valueChanged.connect(
+            self.playbackBar.setRapidRate)
 
-        self.zoomFactor = 1
-        self._precision = 1
-        self._moveLineColor = Qt.green
-        self.material = None
-        self.scene = QGraphicsScene()
-        self.graphicsView.setScene(self.scene)
-        self.graphicsView.scale(1, -1)
-        self.graphicsView.setBackgroundBrush(QBrush(Qt.lightGray))
-        self.clearScene()
+        self.profilerDock = ProfilerDock(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.profilerDock)
+        self.profilerDock.hide()
+        self.menuProfiling.addAction(self.profilerDock.toggleViewAction())
+        self.profilerLabel = QLabel(self.statusBar)
+        self.statusBar.addPermanentWidget(self.profilerLabel)
+        self.profilerTimer = QTimer(self)
+        self.profilerTimer.setInterval(ProfilerDock.RefreshInterval)
+        # noinspection PyUnresolvedReferences
+        self.profilerTimer.timeout.connect(self.updateProfilerLabel)
+        self.actionProfiling.toggled.connect(self.actionProfilingSlot)
+        self.actionResetProfile.triggered.connect(self.actionResetProfileSlot)
+        self.actionSaveProfile.triggered.connect(self.askProfileFile)
+
+        self.watcher = QFileSystemWatcher(self)
+        # noinspection PyUnresolvedReferences
+        self.watcher.fileChanged.connect(self.watchedFileChanged)
+        # tools write files in several steps, reload once they're done
+        self.reloadTimer = QTimer(self)
+        self.reloadTimer.setSingleShot(True)
+        self.reloadTimer.setInterval(300)
+        # noinspection PyUnresolvedReferences
+        self.reloadTimer.timeout.connect(self.reloadGCode)
+        self.actionWatchFile.toggled.connect(self.actionWatchFileSlot)
+        self.actionSendGCode.triggered.connect(self.askSendGCode)
+        self.actionStopSending.triggered.connect(self.stopSending)
+
+        self.loader = None
+        # the document loaded into, None while reloading
+        self.loaderDocument = None  # type: Document
+        self.loadStarted = 0.0
+        self.reloading = False
+        # files changed on disk, reloaded one after the other
+        self.changedFiles = set()
+        self.senderThread = None  # type: GCodeSenderThread
+        # the document being sent, its scene shows the tool
+        self.senderDocument = None  # type: Document
+        self.senderPort = '/dev/ttyUSB0'
+        # controllers without status reports: the tool is shown at the end
+        # of the last acknowledged line instead
+        self.senderReportsPosition = False
+        # documents of the same file share its toolpath
+        self.toolpathStore = ToolpathStore()
+        try:
+            self.toolpathCache = ToolpathCache()
+        except OSError:
+            # no writable cache directory, parse every time
+            self.toolpathCache = None
+        self.newDocument()
         self.updateStatusBar()
+        self.actionProfilingSlot(profiler.enabled)
+        self.actionProfiling.setChecked(profiler.enabled)
+
+    @property
+    def document(self) -> Document:
+        return self.tabWidget.currentWidget()
+
+    @property
+    def documents(self) -> List[Document]:
+        return [self.tabWidget.widget(index)
+                for index in range(self.tabWidget.count())]
+
+    @property
+    def scene(self) -> ToolpathScene:
+        return self.document.toolpathScene
 
     @property
     def moveLineColor(self) -> QColor:
-        return self._moveLineColor
+        return self.scene.moveLineColor
 
     @moveLineColor.setter
     def moveLineColor(self, new_color: QColor) -> None:
-        self._moveLineColor = new_color
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsMovementLineItem):
-                item.color = self.moveLineColor
+        self.scene.moveLineColor = new_color
+        self.playbackBar.updatePens()
 
     @property
     def precision(self) -> number:
-        return self._precision
+        return self.scene.precision
 
     @precision.setter
     def precision(self, new_precision: number) -> None:
-        self._precision = new_precision
-        for item in self.scene.items():
-            if isinstance(item, PenWidthSettable) and\
-                    isinstance(item, QGraphicsItem):
-                item.penWidth = self.precision
+        self.scene.precision = new_precision
+        self.playbackBar.updatePens()
         self.updateStatusBar()
 
     def actionPrintSlot(self) -> None:
+        # rarely used, not worth importing on every start
+        from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
         printer = QPrinter()
         printer.setPageOrientation(QPageLayout.Landscape)
         if QPrintDialog(printer).exec_():
@@ -111,22 +207,94 @@ class MainWindow(QMainWindow):
             painter.setRenderHint(QPainter.Antialiasing)
             view = QGraphicsView()
             view.setScene(self.scene)
-            view.setSceneRect(QRectF(0, 0, 290, 200))
-            view.fitInView(QRectF(0, 0, 290, 200), Qt.KeepAspectRatio)
+            view.setSceneRect(ToolpathScene.MaterialRect)
+            view.fitInView(ToolpathScene.MaterialRect, Qt.KeepAspectRatio)
             view.scale(1, -1)
             view.render(painter)
             del painter  # necessary, thanks Qt
 
     def updateStatusBar(self) -> None:
         # noinspection PyUnresolvedReferences
-        self.statusBar.showMessage('Current pen width: %.3f' % self._precision)
+        self.statusBar.showMessage('Current pen width: %.3f' % self.precision)
 
     def actionShowMovementSlot(self, toggle: bool) -> None:
         self.checkBoxActionShowMovement.setChecked(toggle)
         self.actionShowMovement.setChecked(toggle)
-        for item in self.scene.items():
-            if isinstance(item, QGraphicsMovementLineItem):
-                item.setVisible(toggle)
+        self.scene.showMovement = toggle
+
+    def actionRenderModeSlot(self, action: QAction) -> None:
+        # the scene is built anew, playback items included
+        self.playbackBar.stop()
+        if action is self.actionRenderBatched:
+            self.scene.renderMode = ToolpathScene.Batched
+        else:
+            self.scene.renderMode = ToolpathScene.PerItem
+
+    def actionRasterTilesSlot(self, toggle: bool) -> None:
+        for document in self.documents:
+            document.setRasterEnabled(toggle)
+
+    def actionProfilingSlot(self, toggle: bool) -> None:
+        profiler.setEnabled(toggle)
+        self.profilerLabel.setVisible(toggle)
+        if toggle:
+            self.profilerTimer.start()
+            self.updateProfilerLabel()
+        else:
+            self.profilerTimer.stop()
+
+    def actionResetProfileSlot(self) -> None:
+        profiler.reset()
+        self.profilerDock.refresh()
+        self.updateProfilerLabel()
+
+    def updateProfilerLabel(self) -> None:
+        items, seconds = profiler.lastFrame
+        self.profilerLabel.setText('Last frame: %d items in %.1f ms' % (
+            items, seconds * 1000))
+
+    def askProfileFile(self) -> None:
+        # noinspection PyCallByClass, PyTypeChecker
+        filename, selectedFilter = QFileDialog.getSaveFileName(
+            self, 'Save profile', 'profile.json',
+            'Chrome trace (*.json);;cProfile statistics (*.pstats)')
+        if not filename:
+            return
+        try:
+            if filename.endswith('.pstats') or \
+                    selectedFilter.startswith('cProfile'):
+                profiler.writeStats(filename)
+            else:
+                profiler.writeChromeTrace(filename)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, 'Save profile', str(e))
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        # the current document is None while the last tab closes
+        if self.document is not None and \
+                watched is self.document.viewport():
+            if event.type() == QEvent.MouseMove:
+                self.showSegmentAt(event.pos())
+            elif profiler.enabled and event.type() == QEvent.Paint:
+                profiler.startFrame()
+        return super(MainWindow, self).eventFilter(watched, event)
+
+    def showSegmentAt(self, position: QPoint) -> None:
+        # the index would be rebuilt for every batch while loading
+        if self.loaderDocument is self.document:
+            return
+        point = self.document.mapToScene(position)
+        # a few pixels around the cursor
+        tolerance = self.HoverDistance / max(
+            abs(self.document.transform().m11()), 1e-9)
+        row = self.scene.segmentAt(point.x(), point.y(), tolerance)
+        if row is None:
+            self.hoverLabel.clear()
+            return
+        toolpath = self.scene.spatialIndex.toolpath
+        self.hoverLabel.setText('Line %d: G%d to X%.3f Y%.3f' % (
+            toolpath.line[row], toolpath.op[row], toolpath.x1[row],
+            toolpath.y1[row]))
 
     def askPenWidth(self) -> None:
         # noinspection PyCallByClass, PyTypeChecker
@@ -161,12 +329,15 @@ class MainWindow(QMainWindow):
         return False
 
     def clearScene(self) -> None:
-        self.scene.clear()
+        if self.loaderDocument is self.document:
+            self.cancelLoading()
+        self.playbackBar.stop()
+        self.document.release()
+        self.updateTab(self.document)
+        self.updateWatcher()
+        self.statisticsDock.setToolpath(Toolpath.empty())
         self.precision = 1
         self.updateStatusBar()
-        self.material = self.scene.addRect(QRectF(0, 0, 290, 200))
-        self.material.setPen(QPen(Qt.white))
-        self.material.setBrush(QBrush(Qt.white))
 
     def askGCodeFile(self) -> None:
         # noinspection PyCallByClass, PyTypeChecker
@@ -181,132 +352,364 @@ class MainWindow(QMainWindow):
                 self.loadGCode(filetuple[0])
 
     def zoomIn(self) -> None:
-        self.graphicsView.scale(1.15, 1.15)
-        self.zoomFactor *= 1.15
+        self.document.zoom(1.15)
 
     def zoomOut(self) -> None:
-        self.graphicsView.scale(1.0 / 1.15, 1.0 / 1.15)
-        self.zoomFactor /= 1.15
+        self.document.zoom(1.0 / 1.15)
 
     def resetZoom(self) -> None:
-        self.graphicsView.scale(1.0 / self.zoomFactor, 1.0 / self.zoomFactor)
-        self.zoomFactor = 1
+        self.document.zoom(1.0 / self.document.zoomFactor)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.cancelLoading()
+        self.stopSending()
+        # stops the tile renderers
+        for document in self.documents:
+            document.setRasterEnabled(False)
+        super(MainWindow, self).closeEvent(event)
+
+    def newDocument(self) -> Document:
+        document = Document(self.tabWidget)
+        if self.actionRenderBatched.isChecked():
+            document.toolpathScene.renderMode = ToolpathScene.Batched
+        document.toolpathScene.showMovement = \
+            self.actionShowMovement.isChecked()
+        document.setRasterEnabled(self.actionRasterTiles.isChecked())
+        # frames start with the viewport's paint event, hovering shows the
+        # segment under the cursor
+        document.viewport().installEventFilter(self)
+        self.tabWidget.setCurrentIndex(
+            self.tabWidget.addTab(document, document.title))
+        return document
+
+    def actionCloseTabSlot(self) -> None:
+        self.closeDocument(self.tabWidget.currentIndex())
+
+    def closeDocument(self, index: int) -> None:
+        document = self.tabWidget.widget(index)
+        if document is self.loaderDocument:
+            self.cancelLoading()
+        if document is self.senderDocument:
+            self.stopSending()
+            # signals still queued leave the closed tab alone
+            self.senderDocument = None
+        if document is self.document:
+            self.playbackBar.stop()
+        # its items go right away, the toolpath once no other tab shows it
+        document.release()
+        self.tabWidget.removeTab(index)
+        document.deleteLater()
+        if not self.tabWidget.count():
+            self.newDocument()
+        self.updateWatcher()
+
+    def documentChanged(self) -> None:
+        if self.document is None:
+            return
+        self.actionShowMovementSlot(self.scene.showMovement)
+        if self.scene.renderMode == ToolpathScene.Batched:
+            self.actionRenderBatched.setChecked(True)
+        else:
+            self.actionRenderPerItem.setChecked(True)
+        self.hoverLabel.clear()
+        self.statisticsDock.setToolpath(self.document.toolpath)
+        self.playbackBar.setScene(self.scene)
+        self.updateStatusBar()
+
+    def updateTab(self, document: Document) -> None:
+        index = self.tabWidget.indexOf(document)
+        self.tabWidget.setTabText(index, document.title)
+        self.tabWidget.setTabToolTip(index, document.filename or '')
+
+    def updateWatcher(self) -> None:
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        # files replaced by renaming drop out of the watcher, add them anew
+        if self.actionWatchFile.isChecked():
+            files = self.openFiles()
+            if files:
+                self.watcher.addPaths(sorted(files))
+
+    def openFiles(self) -> Set[str]:
+        return {document.filename for document in self.documents
+                if document.filename and os.path.isfile(document.filename)}
+
+    def actionWatchFileSlot(self, toggle: bool) -> None:
+        self.updateWatcher()
+        if toggle:
+            # catch up with changes made while not watching
+            self.changedFiles.update(self.openFiles())
+            if self.changedFiles:
+                self.reloadTimer.start()
+
+    def watchedFileChanged(self, filename: str) -> None:
+        if filename in self.openFiles():
+            self.changedFiles.add(filename)
+            self.reloadTimer.start()
 
     def loadGCode(self, filename: str) -> None:
-        rawSteps = []
-        # a step is tuple of str (command) and dict of arg -> value
-        # eg ('G1', {'X': 0})
-        with open(filename) as f:
-            for index, line in enumerate(f):
-                line = line.split(';', 1)[0]
-                if not line:
-                    continue
-                splitted = line.strip().split(' ')
-                cmd = splitted[0]
-                packedArgs = splitted[1:]
-                args = {}
-                for arg in packedArgs:
-                    args[arg[0]] = arg[1:]
-                rawSteps.append((cmd, args))
-        for rawStep in rawSteps:
-            cmd = rawStep[0]
-            args = rawStep[1]
-            if cmd == 'G2' or cmd == 'G3':
-                try:
-                    args['I']
-                except KeyError:
-                    args['I'] = 0
-                try:
-                    args['J']
-                except KeyError:
-                    args['J'] = 0
-        self.execGCode(rawSteps)
-
-    def execGCode(self, codes: List[GCode]) -> None:
-        relative_mode = False
-        prevX = 0
-        prevY = 0
-        for code in codes:
-            cmd = code[0]
-            args = code[1]
-            if 'X' in args:
-                x = float(args['X']) + (prevX if relative_mode else 0)
-            else:
-                x = prevX
-            if 'Y' in args:
-                y = float(args['Y']) + (prevY if relative_mode else 0)
-            else:
-                y = prevY
-            if cmd == 'G0':
-                line = QGraphicsMovementLineItem(
-                    line=QLineF(prevX, prevY, x, y),
-                    color=self._moveLineColor,
-                    penWidth=self.precision)
-                if not self.checkBoxActionShowMovement.isChecked():
-                    line.setVisible(False)
-                self.scene.addItem(line)
-            elif cmd == 'G1':
-                self.scene.addItem(
-                    QGraphicsColoredLineItem(
-                        line=QLineF(prevX, prevY, x, y),
-                        penWidth=self.precision))
-            elif cmd == 'G2' or cmd == 'G3':
-                offsetX = float(args['I'])
-                offsetY = float(args['J'])
-                if offsetX == 0 and offsetY == 0:
-                    # only R given
-                    radius = float(args['R'])
-                    dx = x - prevX
-                    dy = y - prevY
-                    dist = math.sqrt(dx ** 2 + dy ** 2)
-                    h = math.sqrt((radius ** 2) - ((dist ** 2) / 4))
-                    tmpx = dy * h / dist
-                    tmpy = -dx * h / dist
-                    ccw = (cmd == 'G3')
-                    if (ccw and radius > 0) or ((not ccw) and radius < 0):
-                        tmpx = -tmpx
-                        tmpy = -tmpy
-                    middleX = tmpx + (2 * x - dx) / 2
-                    middleY = tmpy + (2 * y - dy) / 2
-                else:
-                    radius = math.sqrt(offsetX ** 2 + offsetY ** 2)
-                    middleX = prevX + offsetX
-                    middleY = prevY + offsetY
-                rectBottomLeftX = middleX - radius
-                rectBottomLeftY = middleY - radius
-                rectLength = 2 * radius
-                alpha = math.degrees(math.atan2(prevY - middleY,
-                                                prevX - middleX))
-                beta = math.degrees(math.atan2(y - middleY, x - middleX))
-                if cmd == 'G2':
-                    if beta > alpha:
-                        if beta >= 180:
-                            beta -= 360
-                        else:
-                            alpha += 360
-                elif cmd == 'G3':
-                    if beta < alpha:
-                        if alpha > 180:
-                            alpha -= 360
-                        else:
-                            beta += 360
-                delta = alpha - beta
-                if delta == 0:
-                    delta = 360
-                ellipse = QGraphicsArcItem(rectBottomLeftX, rectBottomLeftY,
-                                           rectLength, rectLength,
-                                           penWidth=self.precision)
-                ellipse.setStartAngle(-alpha)
-                ellipse.setSpanAngle(delta)
-                self.scene.addItem(ellipse)
-            elif cmd == 'G91':
-                relative_mode = True
-            elif cmd == 'G90':
-                relative_mode = False
-            elif cmd == 'G28':
-                # reference drive + general init
-                relative_mode = False
-                x = -0.9
-                y = 242.3
-            prevX = x
-            prevY = y
+        self.cancelLoading()
+        document = self.document
+        if document.filename is not None or document.batches:
+            document = self.newDocument()
+        document.setFile(filename)
+        document.expectFile(filename)
+        self.updateTab(document)
+        self.updateWatcher()
+        self.loaderDocument = document
+        self.startLoader(filename)
+
+    def showToolpath(self, toolpath: Toolpath, name: str) -> Document:
+        """
+        Shows a toolpath that was not loaded from a file, e.g. one generated
+        by the producer, in a tab of its own.
+        """
+        document = self.document
+        if document.filename is not None or document.batches:
+            document = self.newDocument()
+        document.setFile(None)
+        document.name = name
+        document.toolpathScene.expectSegments(len(toolpath))
+        document.addBatch(toolpath)
+        self.updateTab(document)
+        self.documentChanged()
+        return document
+
+    def reloadGCode(self) -> None:
+        """
+        Loads the next changed file again and replaces only the segments
+        that changed in all documents showing it.
+        """
+        self.updateWatcher()
+        if self.loader is not None and not self.reloading:
+            # still loading a file, check again afterwards
+            self.reloadTimer.start()
+            return
+        if self.loader is not None:
+            # changed again while reloading, start over
+            self.changedFiles.add(self.loader.filename)
+            self.cancelLoading()
+        self.changedFiles &= self.openFiles()
+        if not self.changedFiles:
+            return
+        self.reloading = True
+        self.startLoader(self.changedFiles.pop())
+
+    def startLoader(self, filename: str) -> None:
+        # a playback does not follow segments added or replaced
+        self.playbackBar.stop()
+        self.loader = GCodeLoaderThread(filename, self.toolpathCache, self,
+                                        self.toolpathStore)
+        self.loader.batchReady.connect(self.loaderBatchReady)
+        self.loader.progress.connect(self.progressBar.setValue)
+        self.loader.finished.connect(self.loaderFinished)
+        self.progressBar.setValue(0)
+        self.progressBar.show()
+        self.actionCancelLoading.setEnabled(True)
+        self.loadStarted = time.perf_counter()
+        self.loader.start()
+
+    def cancelLoading(self) -> None:
+        if self.loader is None:
+            return
+        loader = self.loader
+        # batches of the old loader still queued are dropped by the slots
+        self.loader = None
+        self.loaderDocument = None
+        self.reloading = False
+        loader.requestInterruption()
+        loader.wait()
+        loader.deleteLater()
+        self.progressBar.hide()
+        self.actionCancelLoading.setEnabled(False)
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage('Loading cancelled after %d segments' %
+                                   loader.segmentCount)
+
+    def loaderBatchReady(self, toolpath: Toolpath) -> None:
+        if self.sender() is not self.loader:
+            return
+        # a reload replaces the segments once all of them are there
+        if not self.reloading:
+            self.execGCode(toolpath)
+
+    def loaderFinished(self) -> None:
+        if self.sender() is not self.loader:
+            return
+        loader = self.loader
+        self.progressBar.hide()
+        self.actionCancelLoading.setEnabled(False)
+        if loader.error is not None:
+            self.loaderFailed(loader)
+            return
+        if loader.shared:
+            source = 'shared with an open tab'
+        elif loader.cacheHit:
+            source = 'from cache'
+        else:
+            source = 'parsed at %.1f MB/s' % loader.reader.throughput
+        if self.reloading:
+            message = self.applyReload(loader.toolpath)
+        else:
+            # drop the batches, keep the toolpath the store shares
+            self.loaderDocument.mergeBatches(loader.toolpath)
+            message = 'Loaded %d segments from %s, %s' % (
+                loader.segmentCount, os.path.basename(loader.filename),
+                source)
+        if profiler.enabled:
+            profiler.record('loadGCode', self.loadStarted,
+                            time.perf_counter() - self.loadStarted)
+            message += ' | ' + profiler.summary()
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage(message)
+        self.loader = None
+        self.loaderDocument = None
+        loader.deleteLater()
+        # build the index now instead of on the first hover
+        with profiler.stage('spatialIndex'):
+            _ = self.scene.spatialIndex
+        with profiler.stage('statistics'):
+            self.statisticsDock.setToolpath(self.document.toolpath)
+        if self.changedFiles:
+            self.reloadTimer.start()
+
+    def loaderFailed(self, loader: GCodeLoaderThread) -> None:
+        # the batches that made it stay in the document
+        self.loader = None
+        self.loaderDocument = None
+        self.reloading = False
+        loader.deleteLater()
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage('Loading %s failed after %d segments' % (
+            os.path.basename(loader.filename), loader.segmentCount))
+        QMessageBox.warning(self, 'Load G Code', '%s: %s' % (
+            loader.filename, loader.error))
+        if self.changedFiles:
+            self.reloadTimer.start()
+
+    def applyReload(self, new: Toolpath) -> str:
+        self.reloading = False
+        started = time.perf_counter()
+        name = os.path.basename(self.loader.filename)
+        replaced = None
+        for document in self.documents:
+            if document.filename != self.loader.filename:
+                continue
+            old = document.toolpath
+            changed = old.changedRange(new)
+            if changed is None:
+                # same geometry, the line numbers may still differ
+                document.mergeBatches(new)
+                continue
+            start, oldStop, newStop = changed
+            # the unchanged segments still get the new line numbers
+            document.toolpathScene.replaceSegments(
+                0, len(old), new, (start, len(old) - oldStop))
+            document.batches = [new]
+            replaced = oldStop - start, newStop - start
+        if replaced is None:
+            return 'Reloaded %s, nothing changed' % name
+        return 'Reloaded %s, replaced %d by %d segments in %.0f ms' % (
+            name, replaced[0], replaced[1],
+            (time.perf_counter() - started) * 1000)
+
+    def execGCode(self, toolpath: Toolpath) -> None:
+        with profiler.stage('execGCode'):
+            self.loaderDocument.addBatch(toolpath)
+
+    def askSendGCode(self) -> None:
+        if self.senderThread is not None:
+            return
+        document = self.document
+        if not document.filename or not os.path.isfile(document.filename):
+            QMessageBox.information(self, 'Send to machine',
+                                    'Only G Code files can be sent, load '
+                                    'one first.')
+            return
+        # noinspection PyCallByClass, PyTypeChecker
+        port, ok = QInputDialog.getText(
+            self, 'Send to machine',
+            'Serial port of the controller for %s:' %
+            os.path.basename(document.filename), text=self.senderPort)
+        if ok and port:
+            self.senderPort = port
+            self.startSender(document, port)
+
+    def startSender(self, document: Document, port: str) -> None:
+        try:
+            with open(document.filename) as f:
+                # as it is now, the file may change while it is sent
+                lines = f.readlines()
+        except OSError as e:
+            QMessageBox.warning(self, 'Send to machine', str(e))
+            return
+        self.senderDocument = document
+        self.senderReportsPosition = False
+        self.senderThread = GCodeSenderThread(port, lines,
+                                              self.SenderBaudRate, self)
+        self.senderThread.progress.connect(self.senderProgress)
+        self.senderThread.position.connect(self.senderPosition)
+        self.senderThread.failed.connect(self.senderFailed)
+        self.senderThread.finished.connect(self.senderFinished)
+        self.actionSendGCode.setEnabled(False)
+        self.actionStopSending.setEnabled(True)
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage('Sending %s to %s' % (
+            os.path.basename(document.filename), port))
+        self.senderThread.start()
+
+    def stopSending(self) -> None:
+        if self.senderThread is None:
+            return
+        # the remaining slots run from the finished signal
+        self.senderThread.stop()
+        self.senderThread.wait()
+
+    def senderProgress(self, lineNumber: int, linesPerSecond: float) -> None:
+        if self.sender() is not self.senderThread or \
+                self.senderDocument is None:
+            return
+        toolpath = self.senderDocument.toolpath
+        if not self.senderReportsPosition and len(toolpath):
+            # the end of the last segment up to that line
+            row = int(np.searchsorted(toolpath.line, lineNumber,
+                                      side='right')) - 1
+            if row >= 0:
+                self.senderDocument.toolpathScene.setToolPosition(
+                    toolpath.x1[row], toolpath.y1[row])
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage('Sending line %d, %.0f lines/s' % (
+            lineNumber, linesPerSecond))
+
+    def senderPosition(self, x: float, y: float) -> None:
+        if self.sender() is not self.senderThread or \
+                self.senderDocument is None:
+            return
+        self.senderReportsPosition = True
+        self.senderDocument.toolpathScene.setToolPosition(x, y)
+
+    def senderFailed(self, message: str) -> None:
+        if self.sender() is self.senderThread:
+            QMessageBox.warning(self, 'Send to machine', message)
+
+    def senderFinished(self) -> None:
+        if self.sender() is not self.senderThread:
+            return
+        thread = self.senderThread
+        self.senderThread = None
+        self.senderDocument = None
+        thread.deleteLater()
+        self.actionSendGCode.setEnabled(True)
+        self.actionStopSending.setEnabled(False)
+        sender = thread.sender
+        if sender is None or sender.started is None:
+            # noinspection PyUnresolvedReferences
+            self.statusBar.showMessage('Nothing sent')
+            return
+        state = 'Sent' if thread.completed else 'Stopped after'
+        # noinspection PyUnresolvedReferences
+        self.statusBar.showMessage(
+            '%s %d lines in %.1f s, %.0f lines/s sustained' % (
+                state, sender.acknowledged,
+                (sender.finished or time.perf_counter()) - sender.started,
+                sender.linesPerSecond))
@@ -32,6 +32,10 @@ class PenWidthSettable(object):
     def __init__(self):
         self._pen = QPen()
 
+    def sharePen(self, pen: QPen) -> None:
+        # items sharing one pen object all follow changes made to it
+        self._pen = pen
+
     @property
     def penWidth(self) -> float:
         return self._pen.widthF()
@@ -0,0 +1,135 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QToolBar, QWidget, QSlider, QLabel, QComboBox
+
+from utilities.toolpathstatistics import DEFAULT_RAPID_RATE, formatDuration
+from widgets.toolpathplayback import ToolpathPlayback
+from widgets.toolpathscene import ToolpathScene
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class PlaybackBar(QToolBar):
+    """
+    Play, pause and seek controls for watching the current scene being cut.
+    """
+    Speeds = (1, 2, 5, 10, 50, 100, 1000)
+    SliderSteps = 10000
+
+    def __init__(self, parent: QWidget=None) -> None:
+        super(PlaybackBar, self).__init__('Playback', parent)
+        self.setObjectName('playbackBar')
+        self.scene = None  # type: ToolpathScene
+        self.rapidRate = DEFAULT_RAPID_RATE
+        self.playback = None  # type: ToolpathPlayback
+        self.actionPlay = self.addAction(
+            QIcon.fromTheme('media-playback-start'), 'Play')
+        self.actionPlay.setCheckable(True)
+        self.actionPlay.toggled.connect(self.actionPlaySlot)
+        self.actionStop = self.addAction(
+            QIcon.fromTheme('media-playback-stop'), 'Stop')
+        self.actionStop.triggered.connect(self.stop)
+        self.slider = QSlider(Qt.Horizontal, self)
+        self.slider.setRange(0, PlaybackBar.SliderSteps)
+        # noinspection PyUnresolvedReferences
+        self.slider.sliderMoved.connect(self.seek)
+        self.addWidget(self.slider)
+        self.timeLabel = QLabel(self)
+        self.addWidget(self.timeLabel)
+        self.speed = QComboBox(self)
+        for speed in PlaybackBar.Speeds:
+            self.speed.addItem('%dx' % speed, speed)
+        self.speed.setToolTip('Multiple of the feed rates')
+        # noinspection PyUnresolvedReferences
+        self.speed.currentIndexChanged.connect(self.updateSpeed)
+        self.addWidget(self.speed)
+        self.toggleViewAction().triggered.connect(self.toggleViewSlot)
+        self.updateTime(0)
+
+    def setScene(self, scene: ToolpathScene) -> None:
+        self.stop()
+        self.scene = scene
+
+    def setRapidRate(self, rapidRate: float) -> None:
+        # applies from the next playback on
+        self.rapidRate = rapidRate
+
+    def _ensurePlayback(self) -> bool:
+        if self.playback is None and self.scene is not None:
+            self.playback = ToolpathPlayback(self.scene, self.rapidRate, self)
+            self.playback.timeChanged.connect(self.updateTime)
+            self.playback.playingChanged.connect(self.actionPlay.setChecked)
+            self.updateSpeed()
+        return self.playback is not None
+
+    def actionPlaySlot(self, toggle: bool) -> None:
+        if not toggle:
+            if self.playback is not None:
+                self.playback.pause()
+        elif self._ensurePlayback():
+            self.playback.play()
+        self.actionPlay.setIcon(QIcon.fromTheme(
+            'media-playback-pause' if toggle else 'media-playback-start'))
+        self.actionPlay.setText('Pause' if toggle else 'Play')
+
+    def stop(self) -> None:
+        """
+        Ends the playback, the scene shows everything again.
+        """
+        if self.playback is None:
+            return
+        playback = self.playback
+        self.playback = None
+        playback.stop()
+        playback.deleteLater()
+        self.actionPlay.setChecked(False)
+        self.updateTime(0)
+
+    def seek(self, position: int) -> None:
+        if self._ensurePlayback():
+            self.playback.seek(self.playback.duration * position /
+                               PlaybackBar.SliderSteps)
+
+    def updateSpeed(self) -> None:
+        if self.playback is not None:
+            self.playback.speed = self.speed.currentData()
+
+    def updatePens(self) -> None:
+        if self.playback is not None:
+            self.playback.updatePens()
+
+    def updateTime(self, time: float) -> None:
+        duration = self.playback.duration if self.playback else 0.0
+        if not self.slider.isSliderDown():
+            self.slider.setValue(round(
+                time / duration * PlaybackBar.SliderSteps) if duration else 0)
+        self.timeLabel.setText('%s / %s' % (formatDuration(time),
+                                            formatDuration(duration)))
+
+    def toggleViewSlot(self, toggle: bool) -> None:
+        # closed by the user, not just minimized with the window
+        if not toggle:
+            self.stop()
@@ -0,0 +1,49 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import numpy as np
+from PyQt5.QtGui import QPolygonF
+
+
+def polygonToArray(polygon: QPolygonF) -> np.ndarray:
+    """
+    Copies the points of the polygon into an (n, 2) array.
+    """
+    pointer = polygon.data()
+    if pointer is None:
+        return np.empty((0, 2))
+    pointer.setsize(len(polygon) * 2 * 8)
+    return np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2).copy()
+
+
+def arrayToPolygon(points: np.ndarray) -> QPolygonF:
+    """
+    Builds a polygon from an (n, 2) array without a QPointF per point.
+    """
+    polygon = QPolygonF(len(points))
+    if len(points):
+        pointer = polygon.data()
+        pointer.setsize(len(points) * 2 * 8)
+        np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)[:] = points
+    return polygon
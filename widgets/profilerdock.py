@@ -0,0 +1,78 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QShowEvent, QHideEvent
+from PyQt5.QtWidgets import QDockWidget, QTreeWidget, QTreeWidgetItem,\
+    QWidget
+
+from utilities.profiler import profiler, Profiler
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class ProfilerDock(QDockWidget):
+    """
+    Lists the recorded stages and paint() counters, refreshed while shown.
+    """
+    RefreshInterval = 500  # ms
+
+    def __init__(self, parent: QWidget=None) -> None:
+        super(ProfilerDock, self).__init__('Profiler', parent)
+        self.setObjectName('profilerDock')
+        self.tree = QTreeWidget(self)
+        self.tree.setHeaderLabels(['Name', 'Calls', 'Total ms', 'Mean ms'])
+        self.setWidget(self.tree)
+        self.timer = QTimer(self)
+        self.timer.setInterval(ProfilerDock.RefreshInterval)
+        # noinspection PyUnresolvedReferences
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super(ProfilerDock, self).showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        super(ProfilerDock, self).hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self) -> None:
+        stages, counters = profiler.snapshot()
+        self.tree.clear()
+        stagesItem = QTreeWidgetItem(self.tree, ['Stages'])
+        for name, (calls, total) in sorted(stages.items()):
+            QTreeWidgetItem(stagesItem, [
+                name, str(calls), '%.1f' % (total * 1000),
+                '%.2f' % (total * 1000 / calls)])
+        countersItem = QTreeWidgetItem(self.tree, ['Calls'])
+        for name, calls in sorted(counters.items()):
+            if name.startswith(Profiler.PaintPrefix):
+                name = name[len(Profiler.PaintPrefix):] + '.paint'
+            QTreeWidgetItem(countersItem, [name, str(calls)])
+        items, seconds = profiler.lastFrame
+        QTreeWidgetItem(self.tree, ['Last frame', str(items),
+                                    '%.1f' % (seconds * 1000)])
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
@@ -24,9 +24,11 @@
 
 from PyQt5.QtWidgets import QGraphicsEllipseItem, QWidget,\
     QStyleOptionGraphicsItem
-from PyQt5.QtGui import QPainter, QBrush
+from PyQt5.QtGui import QPainter, QBrush, QPen
 
+from widgets.arcpolygons import arcPolygon, arcTolerance
 from widgets.penwidthsettable import PenWidthSettable
+from utilities.profiler import profiler
 from utilities.types import number
 
 
@@ -36,21 +38,36 @@ class QGraphicsArcItem(QGraphicsEllipseItem, PenWidthSettable):
     # Need this class because ellipse would draw a "piece of pie" like circle,
     # we only need the arc
     def __init__(self, x: number, y: number, width: number, height: number,
-                 penWidth: float = 1, parent: QWidget=None) -> None:
+                 penWidth: float = 1, parent: QWidget=None,
+                 pen: QPen=None) -> None:
         super(QGraphicsArcItem, self).__init__(x, y, width, height, parent)
-        self._pen.setWidthF(penWidth)
+        if pen is not None:
+            self.sharePen(pen)
+        else:
+            self._pen.setWidthF(penWidth)
 
     def setStartAngle(self, angle: number) -> None:
         # 5760? Yeah no Qt
-        super(QGraphicsArcItem, self).setStartAngle(angle * 16)
+        super(QGraphicsArcItem, self).setStartAngle(round(angle * 16))
 
     def setSpanAngle(self, angle: number) -> None:
         # 0-360° convenience
-        super(QGraphicsArcItem, self).setSpanAngle(angle * 16)
+        super(QGraphicsArcItem, self).setSpanAngle(round(angle * 16))
 
     def paint(self, painter: QPainter,
               styleOptionGraphicsItem: QStyleOptionGraphicsItem,
               widget: QWidget=None):
+        if profiler.enabled:
+            profiler.countPaint(self)
         painter.setPen(self._pen)
         painter.setBrush(QBrush())
-        painter.drawArc(self.rect(), self.startAngle(), self.spanAngle())
+        # drawArc would flatten the arc anew on every paint
+        rect = self.rect()
+        # R form arcs over 180° have a negative R and so a negative width
+        polygon = arcPolygon(round(abs(rect.width()) / 2, 9),
+                             self.startAngle(), self.spanAngle(),
+                             arcTolerance(painter))
+        center = rect.center()
+        painter.translate(center)
+        painter.drawPolyline(polygon)
+        painter.translate(-center)
@@ -24,9 +24,10 @@
 
 from PyQt5.QtWidgets import QGraphicsLineItem, QStyleOptionGraphicsItem,\
     QWidget
-from PyQt5.QtGui import QColor, QPainter, QBrush
+from PyQt5.QtGui import QColor, QPainter, QBrush, QPen
 from PyQt5.QtCore import QLineF, Qt
 
+from utilities.profiler import profiler
 from widgets.penwidthsettable import PenWidthSettable
 
 
@@ -34,10 +35,14 @@ from widgets.penwidthsettable import PenWidthSettable
 # noinspection PyPep8Naming
 class QGraphicsColoredLineItem(QGraphicsLineItem, PenWidthSettable):
     def __init__(self, line: QLineF, color: QColor=Qt.black,
-                 penWidth: float=1, parent: QWidget=None) -> None:
+                 penWidth: float=1, parent: QWidget=None,
+                 pen: QPen=None) -> None:
         super(QGraphicsColoredLineItem, self).__init__(line, parent)
-        self._pen.setColor(color)
-        self._pen.setWidthF(penWidth)
+        if pen is not None:
+            self.sharePen(pen)
+        else:
+            self._pen.setColor(color)
+            self._pen.setWidthF(penWidth)
 
     @property
     def color(self) -> QColor:
@@ -50,6 +55,8 @@ class QGraphicsColoredLineItem(QGraphicsLineItem, PenWidthSettable):
     def paint(self, painter: QPainter,
               styleOptionGraphicsItem: QStyleOptionGraphicsItem,
               widget: QWidget=None):
+        if profiler.enabled:
+            profiler.countPaint(self)
         painter.setPen(self._pen)
         painter.setBrush(QBrush())
         painter.drawLine(self.line())
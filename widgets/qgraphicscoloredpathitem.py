@@ -0,0 +1,107 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from PyQt5.QtWidgets import QGraphicsPathItem, QStyleOptionGraphicsItem,\
+    QWidget
+from PyQt5.QtGui import QColor, QPainter, QBrush, QPainterPath, QPen
+from PyQt5.QtCore import Qt
+
+from utilities.profiler import profiler
+from utilities.simplify import simplifyPolylines
+from widgets.penwidthsettable import PenWidthSettable
+from widgets.polygonarrays import polygonToArray, arrayToPolygon
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class QGraphicsColoredPathItem(QGraphicsPathItem, PenWidthSettable):
+    # Holds many consecutive segments of one kind in a single path, instead
+    # of one item per G Code command
+    def __init__(self, path: QPainterPath, color: QColor=Qt.black,
+                 penWidth: float=1, parent: QWidget=None,
+                 pen: QPen=None) -> None:
+        super(QGraphicsColoredPathItem, self).__init__(path, parent)
+        if pen is not None:
+            self.sharePen(pen)
+        else:
+            self._pen.setColor(color)
+            self._pen.setWidthF(penWidth)
+        self._detailTolerances = ()  # type: Sequence[float]
+        # tolerance -> the path simplified with it, made on first use
+        self._levelsOfDetail = {}  # type: Dict[float, QPainterPath]
+
+    def setDetailTolerances(self, tolerances: Sequence[float]) -> None:
+        """
+        Tolerances (in scene units) to simplify the path with for zooming
+        out. Painting picks the coarsest one that still deviates less than
+        half a device pixel and simplifies the path the first time it does.
+        """
+        self._detailTolerances = sorted(tolerances, reverse=True)
+        self._levelsOfDetail = {}
+
+    def _levelOfDetail(self, tolerance: float) -> QPainterPath:
+        simplified = self._levelsOfDetail.get(tolerance)
+        if simplified is None:
+            with profiler.stage('levelsOfDetail'):
+                simplified = QPainterPath()
+                polylines = [polygonToArray(polygon) for polygon in
+                             self.path().toSubpathPolygons()]
+                if polylines:
+                    starts = np.cumsum([0] + [len(polyline) for polyline
+                                              in polylines[:-1]])
+                    points, starts = simplifyPolylines(
+                        np.concatenate(polylines), starts, tolerance)
+                    for polyline in np.split(points, starts[1:]):
+                        simplified.addPolygon(arrayToPolygon(polyline))
+            self._levelsOfDetail[tolerance] = simplified
+        return simplified
+
+    @property
+    def color(self) -> QColor:
+        return self._pen.color()
+
+    @color.setter
+    def color(self, newColor: QColor) -> None:
+        self._pen.setColor(newColor)
+
+    def paint(self, painter: QPainter,
+              styleOptionGraphicsItem: QStyleOptionGraphicsItem,
+              widget: QWidget=None):
+        if profiler.enabled:
+            profiler.countPaint(self)
+        path = self.path()
+        if self._detailTolerances:
+            pixel = 1 / styleOptionGraphicsItem.levelOfDetailFromTransform(
+                painter.worldTransform())
+            for tolerance in self._detailTolerances:
+                if tolerance <= pixel / 2:
+                    path = self._levelOfDetail(tolerance)
+                    break
+        painter.setPen(self._pen)
+        painter.setBrush(QBrush())
+        painter.drawPath(path)
@@ -0,0 +1,97 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import numpy as np
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+from PyQt5.QtGui import QPainter, QBrush, QPainterPath, QPen
+from PyQt5.QtCore import QRectF
+
+from utilities.profiler import profiler
+from widgets.penwidthsettable import PenWidthSettable
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class QGraphicsInstancedPathItem(QGraphicsItem, PenWidthSettable):
+    # One path drawn at many offsets, for a shape cut over and over. Only the
+    # path and the offsets are kept, however often the shape repeats.
+    def __init__(self, path: QPainterPath, pen: QPen,
+                 parent: QGraphicsItem=None) -> None:
+        super(QGraphicsInstancedPathItem, self).__init__(parent)
+        self.sharePen(pen)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self._path = path
+        self._pathRect = path.controlPointRect()
+        self._offsets = np.empty((0, 2))
+        self._rect = QRectF()
+
+    def path(self) -> QPainterPath:
+        return self._path
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets
+
+    def addOffsets(self, offsets: np.ndarray) -> None:
+        self.setOffsets(np.concatenate((self._offsets, offsets)))
+
+    def setOffsets(self, offsets: np.ndarray) -> None:
+        self.prepareGeometryChange()
+        self._offsets = offsets
+        if not len(offsets):
+            self._rect = QRectF()
+            return
+        low = self._offsets.min(axis=0)
+        high = self._offsets.max(axis=0)
+        self._rect = QRectF(
+            low[0] + self._pathRect.left(), low[1] + self._pathRect.top(),
+            high[0] - low[0] + self._pathRect.width(),
+            high[1] - low[1] + self._pathRect.height())
+
+    def boundingRect(self) -> QRectF:
+        margin = self._pen.widthF() / 2
+        return self._rect.adjusted(-margin, -margin, margin, margin)
+
+    def paint(self, painter: QPainter,
+              styleOptionGraphicsItem: QStyleOptionGraphicsItem,
+              widget: QWidget=None):
+        if profiler.enabled:
+            profiler.countPaint(self)
+        # only the copies reaching into the exposed area
+        exposed = styleOptionGraphicsItem.exposedRect
+        margin = self._pen.widthF() / 2
+        x = self._offsets[:, 0]
+        y = self._offsets[:, 1]
+        visible = \
+            (x + self._pathRect.right() >= exposed.left() - margin) & \
+            (x + self._pathRect.left() <= exposed.right() + margin) & \
+            (y + self._pathRect.bottom() >= exposed.top() - margin) & \
+            (y + self._pathRect.top() <= exposed.bottom() + margin)
+        painter.setPen(self._pen)
+        painter.setBrush(QBrush())
+        path = self._path
+        for dx, dy in self._offsets[visible].tolist():
+            painter.translate(dx, dy)
+            painter.drawPath(path)
+            painter.translate(-dx, -dy)
@@ -23,7 +23,7 @@
 
 
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QColor
+from PyQt5.QtGui import QColor, QPen
 from PyQt5.QtCore import QLineF
 
 from widgets.qgraphicscoloredlineitem import QGraphicsColoredLineItem
@@ -33,5 +33,6 @@ from widgets.qgraphicscoloredlineitem import QGraphicsColoredLineItem
 # noinspection PyPep8Naming
 class QGraphicsMovementLineItem(QGraphicsColoredLineItem):
     def __init__(self, line: QLineF, color: QColor,
-                 penWidth: float=1, parent: QWidget=None):
-        super(QGraphicsMovementLineItem, self).__init__(line, color, penWidth, parent)
+                 penWidth: float=1, parent: QWidget=None, pen: QPen=None):
+        super(QGraphicsMovementLineItem, self).__init__(line, color, penWidth,
+                                                        parent, pen)
@@ -0,0 +1,37 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QColor, QPainterPath, QPen
+
+from widgets.qgraphicscoloredpathitem import QGraphicsColoredPathItem
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class QGraphicsMovementPathItem(QGraphicsColoredPathItem):
+    def __init__(self, path: QPainterPath, color: QColor,
+                 penWidth: float=1, parent: QWidget=None, pen: QPen=None):
+        super(QGraphicsMovementPathItem, self).__init__(path, color, penWidth,
+                                                        parent, pen)
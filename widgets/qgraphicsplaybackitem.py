@@ -0,0 +1,92 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+from PyQt5.QtGui import QPainter, QBrush, QPainterPath, QPen
+from PyQt5.QtCore import QRectF
+
+from utilities.profiler import profiler
+from widgets.penwidthsettable import PenWidthSettable
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class QGraphicsPlaybackItem(QGraphicsItem, PenWidthSettable):
+    # The growing path of a playback. Its bounding rect is fixed, appending
+    # segments only repaints the area they cover instead of the whole item.
+    def __init__(self, rect: QRectF, pen: QPen,
+                 parent: QGraphicsItem=None) -> None:
+        super(QGraphicsPlaybackItem, self).__init__(parent)
+        self.sharePen(pen)
+        self._rect = QRectF(rect)
+        self._path = QPainterPath()
+        # the segment being cut right now, drawn after the path
+        self._partial = QPainterPath()
+
+    def path(self) -> QPainterPath:
+        return self._path
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def _dirty(self, path: QPainterPath) -> QRectF:
+        margin = self._pen.widthF()
+        return path.controlPointRect().adjusted(-margin, -margin,
+                                                margin, margin)
+
+    def takePath(self) -> QPainterPath:
+        """
+        Empties the item without repainting, for another item showing the
+        returned path from now on.
+        """
+        path = self._path
+        self._path = QPainterPath()
+        return path
+
+    def clear(self) -> None:
+        self._path = QPainterPath()
+        self.update()
+
+    def appendPath(self, path: QPainterPath) -> None:
+        if path.isEmpty():
+            return
+        self._path.addPath(path)
+        self.update(self._dirty(path))
+
+    def setPartial(self, path: QPainterPath) -> None:
+        if not self._partial.isEmpty():
+            self.update(self._dirty(self._partial))
+        self._partial = path
+        if not path.isEmpty():
+            self.update(self._dirty(path))
+
+    def paint(self, painter: QPainter,
+              styleOptionGraphicsItem: QStyleOptionGraphicsItem,
+              widget: QWidget=None):
+        if profiler.enabled:
+            profiler.countPaint(self)
+        painter.setPen(self._pen)
+        painter.setBrush(QBrush())
+        painter.drawPath(self._path)
+        if not self._partial.isEmpty():
+            painter.drawPath(self._partial)
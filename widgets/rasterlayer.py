@@ -0,0 +1,185 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+import math
+from collections import OrderedDict
+from typing import Tuple
+
+from PyQt5.QtCore import QObject, QRectF, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPen, QTransform
+
+from utilities.spatialindex import SegmentGrid
+from widgets.tilerendererthread import TileRendererThread, TileKey
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class RasterLayer(QObject):
+    """
+    Images of a toolpath in tiles at a few zoom levels, rendered in the
+    background and kept in a memory capped LRU cache. A view blits them
+    while it is panned or zoomed instead of painting every item.
+    """
+    # emitted when a tile arrived, the view may want to repaint
+    updated = pyqtSignal()
+
+    # zoom levels, each twice the scale of the one before
+    Levels = 6
+    # pixels the whole toolpath spans at level 0
+    BaseSize = 1024
+    # memory all tiles of a layer may take
+    MaxBytes = 256 * 1024 * 1024
+
+    def __init__(self, parent: QObject=None) -> None:
+        super(RasterLayer, self).__init__(parent)
+        self._tiles = OrderedDict()
+        self._bytes = 0
+        self._renderer = None  # type: TileRendererThread
+        self._source = None
+
+    def setSource(self, grid: SegmentGrid, cutPen: QPen,
+                  movePen: QPen=None) -> None:
+        """
+        Renders the toolpath of grid with the pens, the tiles are kept as
+        long as neither changes. Without movePen moves are left out.
+        """
+        source = (grid, self._penKey(cutPen), self._penKey(movePen))
+        if self._source is not None and source[0] is self._source[0] and \
+                source[1:] == self._source[1:]:
+            return
+        self.clear()
+        self._source = source
+        bounds = grid.toolpath.boundingRect()
+        if bounds is None:
+            return
+        minX, minY, maxX, maxY = bounds
+        baseScale = RasterLayer.BaseSize / max(maxX - minX, maxY - minY,
+                                               1e-3)
+        self._renderer = TileRendererThread(grid, baseScale, cutPen,
+                                            movePen, self)
+        self._renderer.tileReady.connect(self._tileReady)
+        self._renderer.start(TileRendererThread.LowPriority)
+        # level 0 is small and always there to fall back to
+        self._renderer.request(self._keys(0, QRectF(
+            minX, minY, maxX - minX, maxY - minY)))
+
+    @staticmethod
+    def _penKey(pen: QPen=None) -> Tuple:
+        if pen is None:
+            return ()
+        return pen.color().rgba(), pen.widthF(), pen.isCosmetic()
+
+    def clear(self) -> None:
+        if self._renderer is not None:
+            self._renderer.stop()
+            self._renderer.deleteLater()
+            self._renderer = None
+        self._source = None
+        self._tiles.clear()
+        self._bytes = 0
+
+    @property
+    def memoryUsage(self) -> int:
+        return self._bytes
+
+    def level(self, scale: float) -> int:
+        """
+        The level whose tiles are at least as sharp as scale pixels per mm,
+        -1 if scale is past the last one.
+        """
+        renderer = self._renderer
+        ratio = scale / renderer.baseScale
+        if ratio > 2 ** (RasterLayer.Levels - 1):
+            return -1
+        return max(math.ceil(math.log2(ratio)), 0) if ratio > 0 else 0
+
+    def _keys(self, level: int, rect: QRectF) -> list:
+        length = self._renderer.tileLength(level)
+        columns = range(math.floor(rect.left() / length),
+                        math.floor(rect.right() / length) + 1)
+        rows = range(math.floor(rect.top() / length),
+                     math.floor(rect.bottom() / length) + 1)
+        # from the middle outwards, rendered first
+        middleColumn = (columns.start + columns.stop) / 2
+        middleRow = (rows.start + rows.stop) / 2
+        return sorted(((level, column, row) for column in columns
+                       for row in rows),
+                      key=lambda key: abs(key[1] - middleColumn) +
+                      abs(key[2] - middleRow))
+
+    def paint(self, painter: QPainter, transform: QTransform,
+              rect: QRectF) -> bool:
+        """
+        Draws the tiles covering rect, in scene coordinates, through the
+        transform of a view. Missing tiles are requested and drawn from a
+        coarser level meanwhile. False if the view is zoomed in too far
+        for the tiles, or they are not set up.
+        """
+        if self._renderer is None:
+            return False
+        level = self.level(math.sqrt(abs(transform.determinant())))
+        if level < 0:
+            return False
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        length = self._renderer.tileLength(level)
+        missing = []
+        for key in self._keys(level, rect):
+            _, column, row = key
+            target = transform.mapRect(QRectF(column * length, row * length,
+                                              length, length))
+            image = self._tiles.get(key)
+            if image is not None:
+                self._tiles.move_to_end(key)
+                painter.drawImage(target, image)
+                continue
+            missing.append(key)
+            for coarser in range(level - 1, -1, -1):
+                # the part of the tile of the coarser level covering it
+                factor = 2 ** (level - coarser)
+                image = self._tiles.get((coarser, column // factor,
+                                         row // factor))
+                if image is None:
+                    continue
+                size = TileRendererThread.TileSize / factor
+                # rows count upwards, image lines downwards
+                painter.drawImage(target, image, QRectF(
+                    column % factor * size,
+                    (factor - 1 - row % factor) * size, size, size))
+                break
+        if missing:
+            self._renderer.request(missing)
+        return True
+
+    def _tileReady(self, key: TileKey, image: QImage) -> None:
+        if self.sender() is not self._renderer:
+            return
+        self._tiles[key] = image
+        self._bytes += image.sizeInBytes()
+        while self._bytes > RasterLayer.MaxBytes and len(self._tiles) > 1:
+            _, dropped = self._tiles.popitem(last=False)
+            self._bytes -= dropped.sizeInBytes()
+        # noinspection PyUnresolvedReferences
+        self.updated.emit()
@@ -0,0 +1,90 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from PyQt5.QtWidgets import QDockWidget, QWidget, QFormLayout, QLabel,\
+    QDoubleSpinBox
+
+from utilities.toolpath import Toolpath
+from utilities.toolpathstatistics import DEFAULT_RAPID_RATE, Statistics,\
+    toolpathStatistics, formatDuration
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class StatisticsDock(QDockWidget):
+    """
+    Path lengths and estimated machining time of the current file.
+    """
+    def __init__(self, parent: QWidget=None) -> None:
+        super(StatisticsDock, self).__init__('Statistics', parent)
+        self.setObjectName('statisticsDock')
+        self.toolpath = Toolpath.empty()
+        widget = QWidget(self)
+        layout = QFormLayout(widget)
+        self.rapidRate = QDoubleSpinBox(widget)
+        self.rapidRate.setRange(1, 100000)
+        self.rapidRate.setDecimals(0)
+        self.rapidRate.setSuffix(' mm/min')
+        self.rapidRate.setValue(DEFAULT_RAPID_RATE)
+        # noinspection PyUnresolvedReferences
+        self.rapidRate.valueChanged.connect(self.refresh)
+        layout.addRow('Rapid rate:', self.rapidRate)
+        self.labels = {}
+        for name, title in (('segments', 'Segments:'),
+                            ('cutLength', 'Cut length:'),
+                            ('arcLength', 'Arc length:'),
+                            ('rapidLength', 'Rapid length:'),
+                            ('boundingRect', 'Bounding box:'),
+                            ('cutTime', 'Cut time:'),
+                            ('rapidTime', 'Rapid time:'),
+                            ('totalTime', 'Estimated time:'),
+                            ('untimedLength', 'Without feed:')):
+            self.labels[name] = QLabel(widget)
+            layout.addRow(title, self.labels[name])
+        self.setWidget(widget)
+        self.refresh()
+
+    def setToolpath(self, toolpath: Toolpath) -> None:
+        self.toolpath = toolpath
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.showStatistics(toolpathStatistics(self.toolpath,
+                                               self.rapidRate.value()))
+
+    def showStatistics(self, statistics: Statistics) -> None:
+        labels = self.labels
+        labels['segments'].setText(str(statistics.segments))
+        for name in ('cutLength', 'arcLength', 'rapidLength',
+                     'untimedLength'):
+            labels[name].setText('%.1f mm' % getattr(statistics, name))
+        for name in ('cutTime', 'rapidTime', 'totalTime'):
+            labels[name].setText(formatDuration(getattr(statistics, name)))
+        if statistics.boundingRect is None:
+            labels['boundingRect'].clear()
+        else:
+            labels['boundingRect'].setText(
+                'X %.1f to %.1f\nY %.1f to %.1f' % (
+                    statistics.boundingRect[0], statistics.boundingRect[2],
+                    statistics.boundingRect[1], statistics.boundingRect[3]))
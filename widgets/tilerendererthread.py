@@ -0,0 +1,195 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+
+import math
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtCore import QThread, QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPen, QTransform
+
+from utilities.arcgeometry import arcPoints
+from utilities.spatialindex import SegmentGrid
+from utilities.toolpath import G0, G2
+from widgets.polygonarrays import arrayToPolygon
+
+# zoom level, column and row of a tile
+TileKey = Tuple[int, int, int]
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class TileRendererThread(QThread):
+    """
+    Renders square tiles of a toolpath into images off the GUI thread,
+    straight from its columns, without any graphics items. Tiles of level
+    n are drawn at baseScale * 2 ** n pixels per mm, tile (0, 0) starts at
+    the origin.
+    """
+    # emitted with the key and image of a rendered tile
+    tileReady = pyqtSignal(object, QImage)
+
+    # edge length of a tile in pixels
+    TileSize = 256
+    # pixels a flattened arc may be away from the real one
+    ArcTolerance = 0.25
+    # tiles spanning more grid cells than this test every segment instead
+    MaxGridCells = 4096
+
+    def __init__(self, grid: SegmentGrid, baseScale: float, cutPen: QPen,
+                 movePen: QPen=None, parent: QObject=None) -> None:
+        super(TileRendererThread, self).__init__(parent)
+        self.grid = grid
+        self.baseScale = baseScale
+        # copies, the scene's pens are changed on the GUI thread
+        self.cutPen = QPen(cutPen)
+        self.movePen = QPen(movePen) if movePen is not None else None
+        self._pending = []  # type: List[TileKey]
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def scale(self, level: int) -> float:
+        return self.baseScale * 2 ** level
+
+    def tileLength(self, level: int) -> float:
+        """
+        Edge length of the tiles of level in mm.
+        """
+        return TileRendererThread.TileSize / self.scale(level)
+
+    def request(self, keys: List[TileKey]) -> None:
+        """
+        Replaces the tiles still to render, the first one is rendered next.
+        """
+        with self._condition:
+            self._pending = list(reversed(keys))
+            self._condition.notify()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                key = self._pending.pop()
+            # noinspection PyUnresolvedReferences
+            self.tileReady.emit(key, self.render(key))
+
+    def render(self, key: TileKey) -> QImage:
+        level, column, row = key
+        scale = self.scale(level)
+        length = self.tileLength(level)
+        x0 = column * length
+        y0 = row * length
+        size = TileRendererThread.TileSize
+        image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        pad = max(self.cutPen.widthF(), self.movePen.widthF()
+                  if self.movePen is not None else 0) / 2
+        rows = self._rows(x0 - pad, y0 - pad, x0 + length + pad,
+                          y0 + length + pad)
+        if not len(rows):
+            return image
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        # G Code is y-up, images are y-down
+        painter.setTransform(QTransform(scale, 0, 0, -scale, -x0 * scale,
+                                        (y0 + length) * scale))
+        moves = self.grid.toolpath.op[rows] == G0
+        tolerance = TileRendererThread.ArcTolerance / scale
+        # moves are below the cuts, as in the scene
+        for pen, selected in ((self.movePen, rows[moves]),
+                              (self.cutPen, rows[~moves])):
+            if pen is None or not len(selected):
+                continue
+            painter.setPen(pen)
+            for polyline in self._polylines(selected, tolerance):
+                painter.drawPolyline(arrayToPolygon(polyline))
+        painter.end()
+        return image
+
+    def _rows(self, x0: float, y0: float, x1: float,
+              y1: float) -> np.ndarray:
+        grid = self.grid
+        cells = ((x1 - x0) / grid.cellSize + 1) * \
+            ((y1 - y0) / grid.cellSize + 1)
+        if cells <= TileRendererThread.MaxGridCells:
+            return grid.inRect(x0, y0, x1, y1)
+        # zoomed out, the cell lists would be longer than the toolpath
+        return np.flatnonzero((grid.minX <= x1) & (grid.maxX >= x0) &
+                              (grid.minY <= y1) & (grid.maxY >= y0))
+
+    def _polylines(self, rows: np.ndarray,
+                   tolerance: float) -> List[np.ndarray]:
+        """
+        The segments of rows, ascending, joined into polylines wherever one
+        starts at the end of the one before. Arcs are flattened.
+        """
+        toolpath = self.grid.toolpath
+        starts = np.column_stack((toolpath.x0[rows], toolpath.y0[rows]))
+        ends = np.column_stack((toolpath.x1[rows], toolpath.y1[rows]))
+        isArc = toolpath.op[rows] >= G2
+        counts = np.ones(len(rows), dtype=np.int64)
+        flattened = []  # type: List[Optional[np.ndarray]]
+        if isArc.any():
+            arcs = toolpath.arcGeometry()
+            for index, arc in zip(np.flatnonzero(isArc).tolist(),
+                                  np.searchsorted(toolpath.arcIndex,
+                                                  rows[isArc]).tolist()):
+                cx, cy, radius, alpha, delta = (float(column[arc])
+                                                for column in arcs)
+                if not math.isfinite(radius) or not math.isfinite(delta):
+                    # broken R form, like the scene draw it straight
+                    flattened.append(None)
+                    continue
+                points = arcPoints(abs(radius), alpha, delta, tolerance)
+                points[:, 0] += cx
+                points[:, 1] += cy
+                # the start point is the end of the segment before
+                flattened.append(points[1:])
+                counts[index] = len(points) - 1
+        offsets = np.cumsum(counts) - counts
+        points = np.empty((int(counts.sum()), 2))
+        points[offsets[~isArc]] = ends[~isArc]
+        for index, arc in zip(np.flatnonzero(isArc).tolist(), flattened):
+            if arc is None:
+                points[offsets[index]] = ends[index]
+            else:
+                points[offsets[index]:offsets[index] + len(arc)] = arc
+        # polylines begin where a segment does not continue the one before
+        breaks = np.flatnonzero(np.concatenate((
+            [True], np.any(starts[1:] != ends[:-1], axis=1))))
+        points = np.insert(points, offsets[breaks], starts[breaks], axis=0)
+        return np.split(points, offsets[breaks[1:]] +
+                        np.arange(1, len(breaks)))
@@ -0,0 +1,263 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+from typing import List
+
+import numpy as np
+from PyQt5.QtCore import QObject, QPointF, QRectF, QElapsedTimer, QTimer, Qt,\
+    pyqtSignal
+from PyQt5.QtGui import QColor, QPainterPath, QPen, QBrush
+from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsItem
+
+from utilities.toolpath import Toolpath, G0, G2
+from utilities.toolpathstatistics import DEFAULT_RAPID_RATE, segmentTimes
+from widgets.qgraphicscoloredpathitem import QGraphicsColoredPathItem
+from widgets.qgraphicsmovementpathitem import QGraphicsMovementPathItem
+from widgets.qgraphicsplaybackitem import QGraphicsPlaybackItem
+from widgets.toolpathscene import ToolpathScene
+
+
+def _appendSegments(cutPath: QPainterPath, movePath: QPainterPath,
+                    toolpath: Toolpath) -> None:
+    # same path building as the batched scene, split by kind only
+    columns = [column.tolist() for column in (
+        toolpath.op, toolpath.x0, toolpath.y0, toolpath.x1, toolpath.y1)]
+    arcs = zip(*(column.tolist() for column in toolpath.arcGeometry()))
+    for op, prevX, prevY, x, y in zip(*columns):
+        path = movePath if op == G0 else cutPath
+        position = path.currentPosition()
+        connected = path.elementCount() and position.x() == prevX and \
+            position.y() == prevY
+        if op < G2:
+            if not connected:
+                path.moveTo(prevX, prevY)
+            path.lineTo(x, y)
+        else:
+            middleX, middleY, radius, alpha, delta = next(arcs)
+            # R form arcs over 180° have a negative R
+            radius = abs(radius)
+            rect = QRectF(middleX - radius, middleY - radius,
+                          2 * radius, 2 * radius)
+            if not connected:
+                path.arcMoveTo(rect, -alpha)
+            path.arcTo(rect, -alpha, delta)
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class ToolpathPlayback(QObject):
+    """
+    Reveals the toolpath of a scene in machining order, at a multiple of the
+    feed rates, while the rest of the scene is drawn faintly. A frame only
+    extends the growing head path, every ChunkSize segments the head turns
+    into a finished item and starts over.
+    """
+    # emitted with the playback time in seconds
+    timeChanged = pyqtSignal(float)
+    # emitted with True when playing starts and False when it stops
+    playingChanged = pyqtSignal(bool)
+
+    ChunkSize = 2048
+    FrameInterval = 16  # ms
+    # opacity of the segments not reached yet
+    GhostAlpha = 40
+    ToolRadius = 4  # px
+
+    def __init__(self, scene: ToolpathScene,
+                 rapidRate: float=DEFAULT_RAPID_RATE,
+                 parent: QObject=None) -> None:
+        super(ToolpathPlayback, self).__init__(parent)
+        self.scene = scene
+        self.toolpath = Toolpath.concatenate(scene.toolpaths)
+        # cuts without F play at the rapid rate instead of not at all
+        self.ends = np.cumsum(segmentTimes(self.toolpath, rapidRate,
+                                           rapidRate))
+        self.duration = float(self.ends[-1]) if len(self.ends) else 0.0
+        self.speed = 1.0
+        self.time = 0.0
+        self.timer = QTimer(self)
+        self.timer.setInterval(ToolpathPlayback.FrameInterval)
+        # noinspection PyUnresolvedReferences
+        self.timer.timeout.connect(self._frame)
+        self._clock = QElapsedTimer()
+
+        self.cutPen = QPen(scene.cutPen)
+        self.movePen = QPen(scene.movePen)
+        self.cutPen.setColor(scene.cutColor)
+        self.movePen.setColor(scene.moveLineColor)
+        scene.ghostAlpha = ToolpathPlayback.GhostAlpha
+
+        # segments drawn so far, the head starts at _headStart
+        self._revealed = 0
+        self._headStart = 0
+        self._chunks = []  # type: List[QGraphicsItem]
+        bounds = self.toolpath.boundingRect() or (0, 0, 0, 0)
+        rect = QRectF(bounds[0], bounds[1], bounds[2] - bounds[0],
+                      bounds[3] - bounds[1])
+        # room for the pen
+        margin = max(self.cutPen.widthF(), self.movePen.widthF()) + 1
+        rect.adjust(-margin, -margin, margin, margin)
+        self._cutHead = QGraphicsPlaybackItem(rect, self.cutPen)
+        scene.addItem(self._cutHead)
+        self._moveHead = QGraphicsPlaybackItem(rect, self.movePen,
+                                               scene.movementLayer)
+        self.tool = QGraphicsEllipseItem(
+            -ToolpathPlayback.ToolRadius, -ToolpathPlayback.ToolRadius,
+            2 * ToolpathPlayback.ToolRadius, 2 * ToolpathPlayback.ToolRadius)
+        self.tool.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+        self.tool.setPen(QPen(Qt.NoPen))
+        self.tool.setBrush(QBrush(QColor(Qt.red)))
+        self.tool.setZValue(1)
+        scene.addItem(self.tool)
+        self.seek(0)
+
+    @property
+    def playing(self) -> bool:
+        return self.timer.isActive()
+
+    def play(self) -> None:
+        if self.time >= self.duration:
+            self.seek(0)
+        self._clock.start()
+        self.timer.start()
+        # noinspection PyUnresolvedReferences
+        self.playingChanged.emit(True)
+
+    def pause(self) -> None:
+        if not self.playing:
+            return
+        self.timer.stop()
+        # noinspection PyUnresolvedReferences
+        self.playingChanged.emit(False)
+
+    def stop(self) -> None:
+        """
+        Ends the playback and shows the scene as before.
+        """
+        self.pause()
+        for item in self._chunks + [self._moveHead, self._cutHead,
+                                    self.tool]:
+            self.scene.removeItem(item)
+        self._chunks = []
+        self.scene.ghostAlpha = 255
+
+    def updatePens(self) -> None:
+        # follow pen width and color changes of the scene
+        self.cutPen.setWidthF(self.scene.cutPen.widthF())
+        self.movePen.setWidthF(self.scene.movePen.widthF())
+        self.cutPen.setColor(self.scene.cutColor)
+        self.movePen.setColor(self.scene.moveLineColor)
+        self.scene.update()
+
+    def _frame(self) -> None:
+        time = self.time + self._clock.restart() / 1000 * self.speed
+        self.seek(time)
+        if time >= self.duration:
+            self.pause()
+
+    def seek(self, time: float) -> None:
+        """
+        Shows the toolpath as machined after time seconds.
+        """
+        self.time = time = min(max(time, 0.0), self.duration)
+        # segments completely done
+        done = int(np.searchsorted(self.ends, time, side='right'))
+        if done < self._headStart:
+            # back into finished chunks, drop those and start their head
+            keep = done // ToolpathPlayback.ChunkSize
+            for item in self._chunks[2 * keep:]:
+                self.scene.removeItem(item)
+            del self._chunks[2 * keep:]
+            self._headStart = keep * ToolpathPlayback.ChunkSize
+            self._resetHead()
+        elif done < self._revealed:
+            self._resetHead()
+        while self._revealed < done:
+            stop = min(done, self._headStart + ToolpathPlayback.ChunkSize)
+            cutPath, movePath = QPainterPath(), QPainterPath()
+            _appendSegments(cutPath, movePath,
+                            self.toolpath[self._revealed:stop])
+            self._cutHead.appendPath(cutPath)
+            self._moveHead.appendPath(movePath)
+            self._revealed = stop
+            if stop == self._headStart + ToolpathPlayback.ChunkSize:
+                self._finishChunk()
+        self._showPartial(done, time)
+        # noinspection PyUnresolvedReferences
+        self.timeChanged.emit(time)
+
+    def _resetHead(self) -> None:
+        self._cutHead.clear()
+        self._moveHead.clear()
+        self._revealed = self._headStart
+
+    def _finishChunk(self) -> None:
+        # the same pixels as the head, which starts empty again
+        cutItem = QGraphicsColoredPathItem(self._cutHead.takePath(),
+                                           pen=self.cutPen)
+        self.scene.addItem(cutItem)
+        moveItem = QGraphicsMovementPathItem(self._moveHead.takePath(), None,
+                                             parent=self.scene.movementLayer,
+                                             pen=self.movePen)
+        self._chunks += [cutItem, moveItem]
+        self._headStart = self._revealed
+
+    def _showPartial(self, done: int, time: float) -> None:
+        cutPath, movePath = QPainterPath(), QPainterPath()
+        if done < len(self.toolpath):
+            start = float(self.ends[done - 1]) if done else 0.0
+            length = float(self.ends[done]) - start
+            fraction = (time - start) / length if length > 0 else 0.0
+            segment = self.toolpath[done:done + 1]
+            path = movePath if segment.op[0] == G0 else cutPath
+            self._partialPath(path, segment, fraction)
+            position = path.currentPosition()
+        elif len(self.toolpath):
+            position = QPointF(float(self.toolpath.x1[-1]),
+                               float(self.toolpath.y1[-1]))
+        else:
+            position = QPointF()
+        self._cutHead.setPartial(cutPath)
+        self._moveHead.setPartial(movePath)
+        self.tool.setPos(position)
+
+    @staticmethod
+    def _partialPath(path: QPainterPath, segment: Toolpath,
+                     fraction: float) -> None:
+        x0, y0 = float(segment.x0[0]), float(segment.y0[0])
+        x1, y1 = float(segment.x1[0]), float(segment.y1[0])
+        if segment.op[0] < G2:
+            path.moveTo(x0, y0)
+            path.lineTo(x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction)
+            return
+        middleX, middleY, radius, alpha, delta = (
+            float(column[0]) for column in segment.arcGeometry())
+        if not math.isfinite(radius):
+            path.moveTo(x0, y0)
+            return
+        radius = abs(radius)
+        rect = QRectF(middleX - radius, middleY - radius,
+                      2 * radius, 2 * radius)
+        path.arcMoveTo(rect, -alpha)
+        path.arcTo(rect, -alpha, delta * fraction)
@@ -0,0 +1,498 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PyQt5.QtCore import QRectF, QLineF, QPointF, Qt
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsItem, QWidget,\
+    QGraphicsPathItem
+from PyQt5.QtGui import QColor, QPen, QBrush, QPainterPath, QPainter
+
+from utilities.profiler import profiler
+from utilities.repeatedshapes import repeatedShapes
+from utilities.spatialindex import SegmentGrid, sharedGrid
+from utilities.toolpath import Toolpath, G0, G1, G2
+from utilities.types import number
+from widgets.qgraphicsarcitem import QGraphicsArcItem
+from widgets.qgraphicscoloredlineitem import QGraphicsColoredLineItem
+from widgets.qgraphicscoloredpathitem import QGraphicsColoredPathItem
+from widgets.qgraphicsinstancedpathitem import QGraphicsInstancedPathItem
+from widgets.qgraphicsmovementlineitem import QGraphicsMovementLineItem
+from widgets.qgraphicsmovementpathitem import QGraphicsMovementPathItem
+
+
+# because Qt:
+# noinspection PyPep8Naming
+class ToolpathScene(QGraphicsScene):
+    # render modes
+    PerItem = 0  # one graphics item per G Code command
+    Batched = 1  # few path items per kind of segment and tile
+    # edge length of the square tiles batched paths are split into, in mm
+    TileSize = 50
+    # tolerances in mm batched paths are simplified with for zooming out,
+    # on first paint that far out, paths with less elements than
+    # MinDetailElements are left alone,
+    # can be narrowed per scene when only one zoom level is ever shown
+    DetailTolerances = (0.1, 0.4, 1.6, 6.4)
+    MinDetailElements = 64
+    # batched mode draws cuts repeated as they are, only translated, with
+    # one path for all copies
+    InstanceShapes = True
+    # the sheet of material being cut, in mm
+    MaterialRect = QRectF(0, 0, 290, 200)
+    # pixels, the marker of the tool keeps its size at every zoom
+    ToolMarkerSize = 8
+
+    def __init__(self, parent: QWidget=None) -> None:
+        super(ToolpathScene, self).__init__(parent)
+        self.toolpaths = []  # type: List[Toolpath]
+        # per item mode: the item of every segment of all toolpaths
+        self._segmentItems = []  # type: List[QGraphicsItem]
+        # batched mode: tile key -> the path items of that key
+        self._tileItems = {}  # type: Dict[int, List[QGraphicsItem]]
+        # batched mode: shape key -> the item drawing all copies of it
+        self._shapeItems = \
+            {}  # type: Dict[bytes, QGraphicsInstancedPathItem]
+        # batched mode: shape key -> the length of its runs and their first
+        # rows over all toolpaths, in the order of the item's offsets
+        self._shapeRuns = {}  # type: Dict[bytes, Tuple[int, np.ndarray]]
+        # batched mode: which rows over all toolpaths the shapes draw
+        self._instanced = np.zeros(0, dtype=bool)
+        self._spatialIndex = None  # type: SegmentGrid
+        self.material = None
+        self.movementLayer = None
+        self.toolMarker = None  # type: QGraphicsPathItem
+        # where the machine is while sending, None when not shown
+        self._toolPosition = None  # type: Tuple[float, float]
+        self._renderMode = ToolpathScene.PerItem
+        # shared by all items, changing them restyles everything at once
+        self.cutPen = QPen(QColor(Qt.black))
+        self.movePen = QPen(QColor(Qt.green))
+        # the colors chosen for the pens, drawn with the opacity below
+        self._cutColor = QColor(Qt.black)
+        self._moveLineColor = QColor(Qt.green)
+        self._ghostAlpha = 255
+        self._showMovement = True
+        self.reset()
+
+    @property
+    def renderMode(self) -> int:
+        return self._renderMode
+
+    @renderMode.setter
+    def renderMode(self, newMode: int) -> None:
+        if newMode != self._renderMode:
+            self._renderMode = newMode
+            self._rebuild()
+
+    @property
+    def moveLineColor(self) -> QColor:
+        return QColor(self._moveLineColor)
+
+    @moveLineColor.setter
+    def moveLineColor(self, newColor: QColor) -> None:
+        self._moveLineColor = QColor(newColor)
+        self._applyColors()
+
+    @property
+    def cutColor(self) -> QColor:
+        return QColor(self._cutColor)
+
+    @property
+    def ghostAlpha(self) -> int:
+        return self._ghostAlpha
+
+    @ghostAlpha.setter
+    def ghostAlpha(self, newAlpha: int) -> None:
+        """
+        Draws all toolpaths with the given alpha, 255 draws them opaque.
+        The chosen colors are kept and come back at 255.
+        """
+        self._ghostAlpha = newAlpha
+        self._applyColors()
+
+    def _applyColors(self) -> None:
+        for pen, color in ((self.cutPen, self._cutColor),
+                           (self.movePen, self._moveLineColor)):
+            color = QColor(color)
+            color.setAlpha(color.alpha() * self._ghostAlpha // 255)
+            pen.setColor(color)
+        self.update()
+
+    @property
+    def precision(self) -> number:
+        return self.cutPen.widthF()
+
+    @precision.setter
+    def precision(self, newPrecision: number) -> None:
+        self.cutPen.setWidthF(newPrecision)
+        self.movePen.setWidthF(newPrecision)
+        self.update()
+
+    @property
+    def showMovement(self) -> bool:
+        return self._showMovement
+
+    @showMovement.setter
+    def showMovement(self, toggle: bool) -> None:
+        self._showMovement = toggle
+        # hiding the layer hides all movement items below it
+        self.movementLayer.setVisible(toggle)
+
+    def setToolPosition(self, x: number, y: number) -> None:
+        self._toolPosition = (x, y)
+        self.toolMarker.setPos(x, y)
+        self.toolMarker.show()
+
+    def hideToolPosition(self) -> None:
+        self._toolPosition = None
+        self.toolMarker.hide()
+
+    def drawForeground(self, painter: QPainter, rect: QRectF) -> None:
+        super(ToolpathScene, self).drawForeground(painter, rect)
+        # drawn last, all items of the frame are painted by now
+        if profiler.enabled:
+            profiler.endFrame()
+
+    @property
+    def spatialIndex(self) -> SegmentGrid:
+        """
+        Grid over the segments of all toolpaths, built on first use after
+        they changed.
+        """
+        if self._spatialIndex is None:
+            self._spatialIndex = sharedGrid(
+                Toolpath.concatenate(self.toolpaths))
+        return self._spatialIndex
+
+    def segmentAt(self, x: number, y: number,
+                  tolerance: number) -> Optional[int]:
+        """
+        Row in spatialIndex.toolpath of the segment under the point.
+        """
+        return self.spatialIndex.nearest(x, y, tolerance)
+
+    def reset(self) -> None:
+        self.toolpaths = []
+        self._spatialIndex = None
+        self._rebuild()
+
+    def addToolpath(self, toolpath: Toolpath) -> None:
+        self.toolpaths.append(toolpath)
+        self._spatialIndex = None
+        self._addToolpathItems(toolpath)
+
+    def mergeToolpaths(self, parts: List[Toolpath],
+                       toolpath: Toolpath) -> None:
+        """
+        Swaps the consecutive toolpaths parts for toolpath holding the same
+        segments, so the parts can be freed. The items stay as they are.
+        """
+        if not parts:
+            return
+        start = next(index for index, shown in enumerate(self.toolpaths)
+                     if shown is parts[0])
+        self.toolpaths[start:start + len(parts)] = [toolpath]
+        self._spatialIndex = None
+
+    def replaceSegments(self, start: int, stop: int, toolpath: Toolpath,
+                        same: Tuple[int, int]=(0, 0)) -> None:
+        """
+        Swaps the segments start:stop, counted over all toolpaths shown, for
+        the given ones. `same` is the number of leading and trailing
+        segments whose geometry did not change, only the items between them
+        are replaced, or in batched mode the tiles they touch.
+        """
+        old = Toolpath.concatenate(self.toolpaths)
+        # replacing everything keeps the given toolpath, it may be shared
+        self.toolpaths = [Toolpath.concatenate(
+            [part for part in (old[:start], toolpath, old[stop:])
+             if len(part)])]
+        self._spatialIndex = None
+        head, tail = same
+        removed = old[start + head:stop - tail]
+        added = toolpath[head:len(toolpath) - tail]
+        start += head
+        stop -= tail
+        if self._renderMode == ToolpathScene.Batched:
+            full = self.toolpaths[0]
+            # runs of shapes cut by the change are drawn by the tiles now
+            freed = self._replaceShapeRuns(start, stop, added)
+            keys = self._tileKeys(full)
+            changed = np.union1d(np.union1d(self._tileKeys(removed),
+                                            self._tileKeys(added)),
+                                 keys[freed])
+            for key in changed.tolist():
+                for item in self._tileItems.pop(key, ()):
+                    self.removeItem(item)
+            rows = np.isin(keys, changed) & ~self._instanced
+            subset = Toolpath({name: column[rows] for name, column in
+                               full.columns().items()})
+            self._addTileItems(subset, np.zeros(len(subset), dtype=bool))
+        else:
+            for item in self._segmentItems[start:stop]:
+                self.removeItem(item)
+            items = self._segmentItems[stop:]
+            del self._segmentItems[start:]
+            self._addSingleItems(added)
+            self._segmentItems.extend(items)
+
+    def _rebuild(self) -> None:
+        self.clear()
+        # a few hundred tiles are culled faster by a linear scan than by
+        # keeping Qt's BSP tree up to date, they are cells of a grid already
+        self.setItemIndexMethod(
+            QGraphicsScene.NoIndex if self._renderMode == ToolpathScene.Batched
+            else QGraphicsScene.BspTreeIndex)
+        if self._renderMode == ToolpathScene.PerItem:
+            self._fitBspTree(sum(len(toolpath)
+                                 for toolpath in self.toolpaths))
+        self._segmentItems = []
+        self._tileItems = {}
+        self._shapeItems = {}
+        self._shapeRuns = {}
+        self._instanced = np.zeros(0, dtype=bool)
+        self.material = self.addRect(ToolpathScene.MaterialRect)
+        self.material.setPen(QPen(Qt.white))
+        self.material.setBrush(QBrush(Qt.white))
+        self.movementLayer = self.addPath(QPainterPath())
+        self.movementLayer.setFlag(QGraphicsItem.ItemHasNoContents)
+        self.movementLayer.setVisible(self._showMovement)
+        self._addToolMarker()
+        for toolpath in self.toolpaths:
+            self._addToolpathItems(toolpath)
+
+    def _addToolMarker(self) -> None:
+        size = ToolpathScene.ToolMarkerSize
+        path = QPainterPath()
+        path.addEllipse(QPointF(0, 0), size / 2, size / 2)
+        for dx, dy in ((1, 0), (0, 1)):
+            path.moveTo(-size * dx, -size * dy)
+            path.lineTo(size * dx, size * dy)
+        self.toolMarker = self.addPath(path, QPen(QColor(Qt.red), 2))
+        self.toolMarker.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+        # above all segments
+        self.toolMarker.setZValue(1)
+        if self._toolPosition is None:
+            self.toolMarker.hide()
+        else:
+            self.toolMarker.setPos(*self._toolPosition)
+
+    def _addToolpathItems(self, toolpath: Toolpath) -> None:
+        if self._renderMode == ToolpathScene.Batched:
+            self._addBatchedItems(toolpath)
+        else:
+            self._addSingleItems(toolpath)
+
+    def expectSegments(self, count: int) -> None:
+        """
+        Sizes the BSP tree for count more segments, to be called before a
+        toolpath is added in batches. Items added later keep the depth.
+        """
+        if (self._renderMode == ToolpathScene.PerItem
+                and not self._segmentItems):
+            self._fitBspTree(count)
+
+    def _fitBspTree(self, count: int) -> None:
+        """
+        Sizes the BSP tree for count items like Qt would. Left to Qt, the
+        tree is rebuilt slowly whenever another scene holds items too, the
+        depth has to be set before the first item is added.
+        """
+        depth = max(math.ceil(math.log2(count + 1)), 5)
+        if depth != self.bspTreeDepth():
+            self.setBspTreeDepth(depth)
+
+    def _addSingleItems(self, toolpath: Toolpath) -> None:
+        columns = [getattr(toolpath, name).tolist() for name in
+                   ('op', 'x0', 'y0', 'x1', 'y1')]
+        arcs = zip(*(column.tolist() for column in toolpath.arcGeometry()))
+        items = self._segmentItems
+        for op, prevX, prevY, x, y in zip(*columns):
+            if op == G0:
+                items.append(QGraphicsMovementLineItem(
+                    line=QLineF(prevX, prevY, x, y), color=None,
+                    parent=self.movementLayer, pen=self.movePen))
+            elif op == G1:
+                line = QGraphicsColoredLineItem(
+                    line=QLineF(prevX, prevY, x, y), pen=self.cutPen)
+                self.addItem(line)
+                items.append(line)
+            else:
+                middleX, middleY, radius, alpha, delta = next(arcs)
+                rectBottomLeftX = middleX - radius
+                rectBottomLeftY = middleY - radius
+                rectLength = 2 * radius
+                ellipse = QGraphicsArcItem(rectBottomLeftX, rectBottomLeftY,
+                                           rectLength, rectLength,
+                                           pen=self.cutPen)
+                ellipse.setStartAngle(-alpha)
+                ellipse.setSpanAngle(delta)
+                self.addItem(ellipse)
+                items.append(ellipse)
+
+    @staticmethod
+    def _tileKeys(toolpath: Toolpath) -> np.ndarray:
+        # kind of segment (G0, G1 or arc) and tile as one integer
+        limit = 1 << 20
+        tileX = np.clip(np.floor(toolpath.x0 / ToolpathScene.TileSize),
+                        -limit, limit - 1).astype(np.int64) + limit
+        tileY = np.clip(np.floor(toolpath.y0 / ToolpathScene.TileSize),
+                        -limit, limit - 1).astype(np.int64) + limit
+        kind = np.minimum(toolpath.op, G2).astype(np.int64)
+        return ((tileY << 21) + tileX) * 3 + kind
+
+    @staticmethod
+    def _paths(toolpath: Toolpath, keys: np.ndarray,
+               skipped: np.ndarray) -> Dict[int, QPainterPath]:
+        """
+        Paths of the segments of toolpath by key, leaving out skipped rows.
+        """
+        # key -> [path, current x, current y]
+        paths = {}
+        columns = [column.tolist() for column in (
+            toolpath.op, toolpath.x0, toolpath.y0, toolpath.x1, toolpath.y1,
+            keys, skipped)]
+        arcs = zip(*(column.tolist() for column in toolpath.arcGeometry()))
+        for op, prevX, prevY, x, y, key, skip in zip(*columns):
+            if skip:
+                if op >= G2:
+                    next(arcs)
+                continue
+            entry = paths.get(key)
+            if entry is None:
+                entry = paths[key] = [QPainterPath(), None, None]
+            path = entry[0]
+            connected = entry[1] == prevX and entry[2] == prevY
+            if op < G2:
+                if not connected:
+                    path.moveTo(prevX, prevY)
+                path.lineTo(x, y)
+            else:
+                middleX, middleY, radius, alpha, delta = next(arcs)
+                # R form arcs over 180° have a negative R
+                radius = abs(radius)
+                rect = QRectF(middleX - radius, middleY - radius,
+                              2 * radius, 2 * radius)
+                if not connected:
+                    path.arcMoveTo(rect, -alpha)
+                path.arcTo(rect, -alpha, delta)
+            entry[1] = x
+            entry[2] = y
+        return {key: path for key, (path, _, _) in paths.items()}
+
+    def _addShapeItems(self, toolpath: Toolpath, first: int) -> np.ndarray:
+        """
+        Adds the shapes repeated in toolpath, whose first segment is row
+        first over all toolpaths, to the items drawing all their copies.
+        Returns the rows these took.
+        """
+        with profiler.stage('repeatedShapes'):
+            shapes = repeatedShapes(toolpath)
+        for shape in shapes.shapes:
+            item = self._shapeItems.get(shape.key)
+            if item is None:
+                template = toolpath[shape.start:shape.stop]
+                rows = len(template)
+                path = self._paths(template, np.zeros(rows, dtype=np.int64),
+                                   np.zeros(rows, dtype=bool))[0]
+                # around the start point, the offsets move it into place
+                path.translate(-template.x0[0], -template.y0[0])
+                item = QGraphicsInstancedPathItem(path, self.cutPen)
+                self.addItem(item)
+                self._shapeItems[shape.key] = item
+                self._shapeRuns[shape.key] = (
+                    shape.stop - shape.start, np.zeros(0, dtype=np.int64))
+            item.addOffsets(shape.offsets)
+            length, starts = self._shapeRuns[shape.key]
+            self._shapeRuns[shape.key] = (
+                length, np.concatenate((starts, shape.starts + first)))
+        return shapes.instanced
+
+    def _replaceShapeRuns(self, start: int, stop: int,
+                          added: Toolpath) -> np.ndarray:
+        """
+        Drops the runs of shapes overlapping rows start:stop, which added
+        replaces, moves the runs after them and adds the shapes repeated in
+        added. Returns the rows, counted after the change, the dropped runs
+        drew outside of it.
+        """
+        shift = len(added) - (stop - start)
+        instanced = self._instanced.copy()
+        freed = []
+        for key, item in list(self._shapeItems.items()):
+            length, starts = self._shapeRuns[key]
+            dropped = (starts < stop) & (starts + length > start)
+            for run in starts[dropped].tolist():
+                freed.append(np.arange(run, run + length))
+            starts = starts[~dropped]
+            if dropped.any():
+                item.setOffsets(item.offsets[~dropped])
+            if not len(starts):
+                self.removeItem(item)
+                del self._shapeItems[key]
+                del self._shapeRuns[key]
+                continue
+            self._shapeRuns[key] = (length,
+                                    np.where(starts >= stop, starts + shift,
+                                             starts))
+        freed = np.concatenate(freed) if freed else \
+            np.zeros(0, dtype=np.int64)
+        instanced[freed] = False
+        freed = freed[(freed < start) | (freed >= stop)]
+        freed[freed >= stop] += shift
+        taken = self._addShapeItems(added, start) \
+            if ToolpathScene.InstanceShapes else \
+            np.zeros(len(added), dtype=bool)
+        self._instanced = np.concatenate(
+            (instanced[:start], taken, instanced[stop:]))
+        return freed
+
+    def _addBatchedItems(self, toolpath: Toolpath) -> None:
+        first = len(self._instanced)
+        if ToolpathScene.InstanceShapes:
+            skipped = self._addShapeItems(toolpath, first)
+        else:
+            skipped = np.zeros(len(toolpath), dtype=bool)
+        self._instanced = np.concatenate((self._instanced, skipped))
+        self._addTileItems(toolpath, skipped)
+
+    def _addTileItems(self, toolpath: Toolpath,
+                      skipped: np.ndarray) -> None:
+        paths = self._paths(toolpath, self._tileKeys(toolpath), skipped)
+        for key, path in paths.items():
+            # all arcs are of one kind
+            if key % 3 == G0:
+                item = QGraphicsMovementPathItem(path, None,
+                                                 parent=self.movementLayer,
+                                                 pen=self.movePen)
+            else:
+                item = QGraphicsColoredPathItem(path, pen=self.cutPen)
+                self.addItem(item)
+            self._tileItems.setdefault(key, []).append(item)
+            if self.DetailTolerances and \
+                    path.elementCount() >= ToolpathScene.MinDetailElements:
+                item.setDetailTolerances(self.DetailTolerances)
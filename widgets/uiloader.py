@@ -0,0 +1,87 @@
+# QGVisualizer. Created on 17.10.2026
+# Copyright (c) 2015 Andreas Schulz
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import marshal
+import os
+import sys
+from types import CodeType
+
+from PyQt5.QtCore import PYQT_VERSION_STR
+from PyQt5.QtWidgets import QWidget
+
+from utilities import getCachePath
+
+
+def _cachedForm(uiFile: str) -> CodeType:
+    """
+    The form compiled to Python bytecode, by uic on first use and read back
+    from the cache afterwards. Entries depend on the .ui file's size and
+    mtime as well as the Python and PyQt versions.
+    """
+    stat = os.stat(uiFile)
+    directory = getCachePath('ui')
+    prefix = os.path.splitext(os.path.basename(uiFile))[0] + '-'
+    entry = os.path.join(directory, '%s%d-%d-py%d%d-%s.marshal' % (
+        prefix, stat.st_size, stat.st_mtime_ns, sys.version_info[0],
+        sys.version_info[1], PYQT_VERSION_STR))
+    try:
+        with open(entry, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    # uic takes longer to import than the compiled form takes to run
+    from PyQt5 import uic
+    source = io.StringIO()
+    uic.compileUi(uiFile, source)
+    code = compile(source.getvalue(), uiFile, 'exec')
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.startswith(prefix):
+            os.remove(os.path.join(directory, name))
+    temporary = '%s.%d.tmp' % (entry, os.getpid())
+    with open(temporary, 'wb') as f:
+        marshal.dump(code, f)
+    os.replace(temporary, entry)
+    return code
+
+
+def loadUi(uiFile: str, widget: QWidget) -> None:
+    """
+    Sets up widget from uiFile like uic.loadUi, the form's children become
+    attributes of widget.
+    """
+    try:
+        code = _cachedForm(uiFile)
+    except OSError:
+        # no writable cache, let uic do it every time
+        from PyQt5 import uic
+        uic.loadUi(uiFile, widget)
+        return
+    namespace = {}
+    exec(code, namespace)
+    form = next(value for name, value in namespace.items()
+                if name.startswith('Ui_') and isinstance(value, type))
+    ui = form()
+    ui.setupUi(widget)
+    widget.__dict__.update(ui.__dict__)